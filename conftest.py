@@ -0,0 +1,13 @@
+import pytest
+
+from pokerEvaluator import card_to_int
+
+SUIT_NAMES = {"h": "Hearts", "d": "Diamonds", "c": "Clubs", "s": "Spades"}
+
+# Int cards from text like "Ah Td 9c"
+def text_to_ints(text):
+    return [card_to_int((card[0].replace("T", "10"), SUIT_NAMES[card[1]])) for card in text.split()]
+
+@pytest.fixture
+def cards():
+    return text_to_ints
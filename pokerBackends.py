@@ -0,0 +1,317 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from pokerEvaluator import (
+    CATEGORY_SHIFT,
+    RANK_INDEX,
+    VARIANTS,
+    POPCOUNT_NP,
+    HIGH_RANK_NP,
+    TOP2_NP,
+    TOP3_NP,
+    TOP5_NP,
+    evaluate_strength,
+    evaluate_batch,
+    variant_ranks,
+    variant_deck,
+    combo_array,
+)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Interchangeable hand evaluators. Every backend scores an (N, k) int card array,
+# 5 <= k <= 7, as pokerEvaluator strengths:
+#   reference  the rules written out plainly, best of every 5-card subset
+#   table      per-hand lookup tables (evaluate_strength)
+#   numpy      vectorised lookup tables (evaluate_batch)
+#   jit        a loop kernel over the same tables, compiled with numba when it's
+#              installed and run as plain Python otherwise
+# A calibration checks each backend against the reference and times it on each
+# workload size; the fastest correct one is used for that size. POKER_EVALUATOR_BACKEND
+# overrides the choice ("numpy", or per size as "single=table,bulk=numpy") and
+# POKER_EVALUATOR_CALIBRATION names a file to reuse the calibration from.
+BACKEND_OVERRIDE = os.environ.get("POKER_EVALUATOR_BACKEND")
+CALIBRATION_FILE = os.environ.get("POKER_EVALUATOR_CALIBRATION")
+
+# Hands timed per workload, and the largest batch still counted as small
+WORKLOAD_SIZES = {"single": 1, "small": 64, "bulk": 4096}
+SMALL_BATCH_MAX = 512
+CALIBRATION_REPEATS = 3
+CALIBRATION_CHECK_HANDS = 200  # per variant and hand size
+CALIBRATION_BUDGET_SECONDS = 0.25  # backends projected to take longer on a workload aren't timed
+
+# Strength of five cards from the rules: no lookup tables, so it can check the others
+def reference_five(cards, variant="standard"):
+    ranks = sorted((c >> 2 for c in cards), reverse=True)
+    flush = len({c & 3 for c in cards}) == 1
+    # The variant's ranks in straight order, the ace also playing low
+    sequence = [12] + [RANK_INDEX[r] for r in variant_ranks(variant)]
+    straight_high = -1
+    for i in range(len(sequence) - 4):
+        if set(sequence[i:i + 5]) == set(ranks):
+            straight_high = sequence[i + 4]
+    counts = Counter(ranks)
+    shape = sorted(counts.values(), reverse=True)
+    kickers = sorted(counts, key=lambda r: (counts[r], r), reverse=True)
+
+    if straight_high >= 0:
+        category = (9 if straight_high == 12 else 8) if flush else 4
+        kickers = [straight_high]
+    elif shape[0] == 4:
+        category = 7
+    elif shape == [3, 2]:
+        category = 6
+    elif flush:
+        category = 5
+    elif shape[0] == 3:
+        category = 3
+    elif shape[:2] == [2, 2]:
+        category = 2
+    elif shape[0] == 2:
+        category = 1
+    else:
+        category = 0
+    strength = VARIANTS[variant]["category_order"].index(category) << CATEGORY_SHIFT
+    for i, r in enumerate(kickers):
+        strength |= r << (16 - 4 * i)
+    return strength
+
+def reference_batch(hands, variant="standard"):
+    return np.array([max(reference_five(five, variant) for five in combinations(hand, 5)) for hand in hands.tolist()],
+                    dtype=np.int64)
+
+def table_batch(hands, variant="standard"):
+    return np.array([evaluate_strength(hand, variant) for hand in hands.tolist()], dtype=np.int64)
+
+def numpy_batch(hands, variant="standard"):
+    return evaluate_batch(hands, variant)
+
+# strength_from_counts as a loop over plain arrays, so numba can compile it
+def _strength_kernel(hands, out, straight_high, values, popcount, high_rank, top2, top3, top5):
+    counts = np.zeros(13, dtype=np.int64)
+    suit_masks = np.zeros(4, dtype=np.int64)
+    for i in range(hands.shape[0]):
+        counts[:] = 0
+        suit_masks[:] = 0
+        for j in range(hands.shape[1]):
+            c = hands[i, j]
+            counts[c >> 2] += 1
+            suit_masks[c & 3] |= 1 << (c >> 2)
+        rank_mask = quads = trips = pairs = 0
+        for r in range(13):
+            if counts[r] > 0:
+                rank_mask |= 1 << r
+            if counts[r] == 2:
+                pairs |= 1 << r
+            elif counts[r] == 3:
+                trips |= 1 << r
+            elif counts[r] == 4:
+                quads |= 1 << r
+
+        flush_mask = 0
+        for s in range(4):
+            if popcount[suit_masks[s]] >= 5:
+                flush_mask = suit_masks[s]
+        high = straight_high[flush_mask] if flush_mask else -1
+        if high >= 0:
+            out[i] = values[9 if high == 12 else 8] | high << 16
+        elif quads:
+            q = high_rank[quads]
+            out[i] = values[7] | q << 16 | high_rank[rank_mask & ~(1 << q)] << 12
+        elif trips and (pairs or popcount[trips] >= 2):
+            t = high_rank[trips]
+            out[i] = values[6] | t << 16 | high_rank[(trips | pairs) & ~(1 << t)] << 12
+        elif flush_mask:
+            out[i] = values[5] | top5[flush_mask]
+        elif straight_high[rank_mask] >= 0:
+            out[i] = values[4] | straight_high[rank_mask] << 16
+        elif trips:
+            t = high_rank[trips]
+            out[i] = values[3] | t << 16 | top2[rank_mask & ~(1 << t)] << 8
+        elif popcount[pairs] >= 2:
+            p1 = high_rank[pairs]
+            p2 = high_rank[pairs & ~(1 << p1)]
+            out[i] = values[2] | p1 << 16 | p2 << 12 | high_rank[rank_mask & ~(1 << p1 | 1 << p2)] << 8
+        elif pairs:
+            p = high_rank[pairs]
+            out[i] = values[1] | p << 16 | top3[rank_mask & ~(1 << p)] << 4
+        else:
+            out[i] = values[0] | top5[rank_mask]
+
+strength_kernel = njit(cache=True)(_strength_kernel) if njit else _strength_kernel
+
+def jit_batch(hands, variant="standard"):
+    tables = VARIANTS[variant]
+    out = np.zeros(len(hands), dtype=np.int64)
+    strength_kernel(np.ascontiguousarray(hands, dtype=np.int64), out, tables["straight_high_np"], tables["category_values_np"],
+                    POPCOUNT_NP, HIGH_RANK_NP, TOP2_NP, TOP3_NP, TOP5_NP)
+    return out
+
+EVALUATOR_BACKENDS = {
+    "reference": reference_batch,
+    "table": table_batch,
+    "numpy": numpy_batch,
+    "jit": jit_batch,
+}
+
+# Workload size a batch of n hands counts as
+def workload(n):
+    if n <= 1:
+        return "single"
+    return "small" if n <= SMALL_BATCH_MAX else "bulk"
+
+# n random hands of `size` distinct cards from the variant's deck
+def random_hands(rng, n, size=7, variant="standard"):
+    decks = np.tile(np.array(variant_deck(variant), dtype=np.int64), (n, 1))
+    return rng.permuted(decks, axis=1)[:, :size]
+
+# Backends that agree with the reference on random 5, 6 and 7-card hands of every variant
+def correct_backends(seed=0):
+    rng = np.random.default_rng(seed)
+    correct = set(EVALUATOR_BACKENDS)
+    for variant in VARIANTS:
+        for size in (5, 6, 7):
+            hands = random_hands(rng, CALIBRATION_CHECK_HANDS, size, variant)
+            expected = reference_batch(hands, variant)
+            for name in list(correct):
+                if name != "reference" and not np.array_equal(EVALUATOR_BACKENDS[name](hands, variant), expected):
+                    correct.discard(name)
+    return correct
+
+# Time every correct backend on each workload size and pick the fastest.
+# Returns {"choices": {workload: backend}, "timings": {workload: {backend: microseconds per hand}}, ...}
+def calibrate(seed=0):
+    rng = np.random.default_rng(seed)
+    correct = correct_backends(seed)
+    timings = {}
+    per_hand = {}
+    for size_name, n in WORKLOAD_SIZES.items():
+        hands = random_hands(rng, n)
+        timings[size_name] = {}
+        for name in sorted(correct):
+            if per_hand.get(name, 0) * n > CALIBRATION_BUDGET_SECONDS:
+                continue
+            best = float("inf")
+            for _ in range(CALIBRATION_REPEATS):
+                started = time.perf_counter()
+                EVALUATOR_BACKENDS[name](hands, "standard")
+                best = min(best, time.perf_counter() - started)
+            per_hand[name] = best / n
+            timings[size_name][name] = per_hand[name] * 1e6
+    return {
+        "choices": {size_name: min(timed, key=timed.get) for size_name, timed in timings.items()},
+        "timings": timings,
+        "correct": sorted(correct),
+        "jit_compiled": njit is not None,
+    }
+
+# Parse an override like "numpy" or "single=table,bulk=numpy" into {workload: backend}
+def parse_override(text):
+    choices = {}
+    for part in text.split(","):
+        size_name, _, name = part.strip().rpartition("=")
+        for target in [size_name] if size_name else WORKLOAD_SIZES:
+            if target not in WORKLOAD_SIZES:
+                raise ValueError(f"Unknown workload {target!r}, expected one of {', '.join(WORKLOAD_SIZES)}")
+            if name not in EVALUATOR_BACKENDS:
+                raise ValueError(f"Unknown evaluator backend {name!r}, expected one of {', '.join(EVALUATOR_BACKENDS)}")
+            choices[target] = name
+    return choices
+
+def load_calibration(path):
+    try:
+        with open(path) as f:
+            calibration = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # A file from another setup (e.g. before numba was installed) is recalibrated
+    if calibration.get("jit_compiled") != (njit is not None) or set(calibration.get("choices", {})) != set(WORKLOAD_SIZES):
+        return None
+    return calibration
+
+def save_calibration(path, calibration):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(calibration, f, indent=2)
+    os.replace(tmp_path, path)
+
+_selection = None
+_selection_lock = threading.Lock()
+
+# The backend used for each workload, where each choice came from and the calibration timings.
+# Calibrates on first use unless a calibration file or a full override makes it unnecessary.
+def backend_selection():
+    global _selection
+    with _selection_lock:
+        if _selection is None:
+            override = parse_override(BACKEND_OVERRIDE) if BACKEND_OVERRIDE else {}
+            calibration, source = None, "calibrated"
+            if len(override) < len(WORKLOAD_SIZES):
+                if CALIBRATION_FILE:
+                    calibration = load_calibration(CALIBRATION_FILE)
+                    source = "calibration file"
+                if calibration is None:
+                    calibration, source = calibrate(), "calibrated"
+                    if CALIBRATION_FILE:
+                        save_calibration(CALIBRATION_FILE, calibration)
+            choices = dict(calibration["choices"]) if calibration else {}
+            choices.update(override)
+            _selection = {
+                "choices": choices,
+                "sources": {size_name: "override" if size_name in override else source for size_name in WORKLOAD_SIZES},
+                "timings": calibration["timings"] if calibration else {},
+            }
+        return _selection
+
+# One line per workload, e.g. "bulk: numpy (calibrated, 0.6 us/hand)"
+def describe_selection():
+    selection = backend_selection()
+    lines = []
+    for size_name in WORKLOAD_SIZES:
+        name = selection["choices"][size_name]
+        timing = selection["timings"].get(size_name, {}).get(name)
+        detail = selection["sources"][size_name] + (f", {timing:.1f} us/hand" if timing is not None else "")
+        lines.append(f"{size_name}: {name} ({detail})")
+    return lines
+
+# Strengths of an (N, k) int card array with the backend chosen for its size
+def evaluate_hands(hands, variant="standard"):
+    hands = np.asarray(hands, dtype=np.int64)
+    if hands.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+    return EVALUATOR_BACKENDS[backend_selection()["choices"][workload(len(hands))]](hands, variant)
+
+# Best five of 5-7 int cards: (strength, the five cards), all subsets scored in one batch
+def best_five(cards, variant="standard"):
+    fives = combo_array(cards, 5)
+    strengths = evaluate_hands(fives, variant)
+    best = int(strengths.argmax())
+    return int(strengths[best]), fives[best].tolist()
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the evaluator backends and show which one each workload uses.")
+    parser.add_argument("--output", default=CALIBRATION_FILE, help="calibration file to write")
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    print(f"Backends agreeing with the reference: {', '.join(calibration['correct'])}"
+          f"{'' if calibration['jit_compiled'] else ' (jit runs uncompiled: numba is not installed)'}")
+    for size_name, timed in calibration["timings"].items():
+        results = ", ".join(f"{name} {us:.1f}" for name, us in sorted(timed.items(), key=lambda item: item[1]))
+        print(f"  {size_name:<6} ({WORKLOAD_SIZES[size_name]} hands): {calibration['choices'][size_name]}  [us/hand: {results}]")
+    if args.output:
+        save_calibration(args.output, calibration)
+        print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import streamlit as st
+import atexit
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from itertools import permutations
+
+# Session-scoped memo layer so reruns that don't change the cards reuse earlier work
+SESSION_CACHE_SIZE = 32
+
+# Size-bounded store that evicts the least recently used entry
+class BoundedCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+# Hash of everything that decides a tool's output
+def card_state_key(tool, player_cards, community_cards, num_players, *extra):
+    state = (tool, tuple(player_cards), tuple(community_cards), num_players, extra)
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+def get_session_cache():
+    if 'memo_cache' not in st.session_state:
+        st.session_state.memo_cache = BoundedCache(SESSION_CACHE_SIZE)
+    return st.session_state.memo_cache
+
+# Return the cached value for (name, key), computing and storing it on a miss
+def session_memo(name, key, compute):
+    cache = get_session_cache()
+    if (name, key) not in cache:
+        cache.put((name, key), compute())
+    return cache.get((name, key))
+
+# Process-wide cache shared by every Streamlit session. Entries are keyed by a
+# suit-canonical configuration so suit-isomorphic spots share one entry.
+SHARED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SHARED_CACHE_POLICY = os.environ.get("POKER_CACHE_POLICY", "lru")
+SHARED_CACHE_FILE = os.environ.get("POKER_CACHE_FILE")
+SHARED_CACHE_SAVE_EVERY = 100
+
+# Thread-safe, memory-bounded cache with LRU or LFU eviction and optional pickle persistence
+class SharedCache:
+    def __init__(self, max_bytes, policy="lru", path=None):
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.path = path
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.uses = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.unsaved = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.uses[key] += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries[key][1]
+            self.entries[key] = (value, size)
+            self.entries.move_to_end(key)
+            self.uses[key] = self.uses.get(key, 0)
+            self.total_bytes += size
+            self.evict()
+            self.unsaved += 1
+            if self.path and self.unsaved >= SHARED_CACHE_SAVE_EVERY:
+                self.save()
+
+    # Look up without counting a hit or miss or refreshing the entry, for polling
+    def peek(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            return default if entry is None else entry[0]
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            # Compute outside the lock so other sessions aren't blocked
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            if self.policy == "lfu":
+                # Least used entry, oldest first among ties
+                victim = min(self.entries, key=lambda k: self.uses[k])
+            else:
+                victim = next(iter(self.entries))
+            self.total_bytes -= self.entries.pop(victim)[1]
+            del self.uses[victim]
+            self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            data = {key: value for key, (value, size) in self.entries.items()}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self.unsaved = 0
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        with self.lock:
+            for key, value in data.items():
+                self.entries[key] = (value, len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+                self.uses[key] = 0
+                self.total_bytes += self.entries[key][1]
+            self.evict()
+
+SHARED_CACHE = SharedCache(SHARED_CACHE_MAX_BYTES, SHARED_CACHE_POLICY, SHARED_CACHE_FILE)
+atexit.register(SHARED_CACHE.save)
+
+SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+# Relabel suits so suit-isomorphic spots map to the same key.
+# Cards are ints (rank * 4 + suit); player order is kept, order within a hand is not.
+# The flop stays ahead of the turn and river, so runout caches keyed by flop keep hitting.
+def canonicalize(holes, board):
+    best_key, best_perm = None, None
+    for perm in SUIT_PERMUTATIONS:
+        mapped = [c & ~3 | perm[c & 3] for c in board]
+        key = (tuple(sorted(mapped[:3])) + tuple(sorted(mapped[3:])),
+               tuple(tuple(sorted(c & ~3 | perm[c & 3] for c in hole)) for hole in holes))
+        if best_key is None or key < best_key:
+            best_key, best_perm = key, perm
+    return best_key, best_perm
+
+# Map a card from canonical suits back to the caller's suits
+def restore_card(c, perm):
+    return c & ~3 | perm.index(c & 3)
+
+# Map a card from the caller's suits into canonical suits
+def canonical_card(c, perm):
+    return c & ~3 | perm[c & 3]
+
+# Cached result of compute(canonical_holes, canonical_board) shared across sessions.
+# Returns the value and the suit permutation needed to restore any cards in it.
+def shared_memo(kind, holes, board, compute):
+    key, perm = canonicalize(holes, board)
+    value = SHARED_CACHE.get_or_compute((kind, key), lambda: compute([list(hole) for hole in key[1]], list(key[0])))
+    return value, perm
@@ -1,5 +1,11 @@
 import streamlit as st
 import importlib
+import os
+import threading
+from pokerCache import SHARED_CACHE
+from pokerBackends import describe_selection
+from pokerMemory import (GROWTH_RERUNS, HISTORY_KEY, MEMORY_TOGGLE_KEY, MEMORY_TRACE, PROCESS_SAMPLE_SECONDS,
+                         memory_report, start_tracing)
 
 st.title("Poker Hands Analysis")
 
@@ -32,9 +38,10 @@ module_map = {
     "Poker Hands - Who Wins": "pokerHandWhoWinsDealer"
 }
 
-# Reset function to clear only selected cards, preserving player names
+# Reset function to clear only selected cards, preserving player names.
+# The memory history and panel switch are kept too, so growth that survives a refresh still shows up.
 def reset_state():
-    keys_to_keep = {"num_players", "player_names"}  # Keys to preserve
+    keys_to_keep = {"num_players", "player_names", HISTORY_KEY, MEMORY_TOGGLE_KEY}  # Keys to preserve
     keys_to_delete = [key for key in st.session_state.keys() if key not in keys_to_keep]
     
     for key in keys_to_delete:
@@ -56,17 +63,61 @@ for i in range(st.session_state.num_players):
     # Update the name in session state
     st.session_state.player_names[i] = player_name
 
+# One lock for every session: reload() skips a module another thread is already
+# reloading, which would leave that session without the module's state setup
+@st.cache_resource
+def module_reload_lock():
+    return threading.Lock()
+
 # Dynamically import and run the selected module
 if option in module_map:
     module_name = module_map[option]
-    loaded_module = importlib.import_module(module_name)
-    importlib.reload(loaded_module)
+    with module_reload_lock():
+        loaded_module = importlib.import_module(module_name)
+        importlib.reload(loaded_module)
     loaded_module.run()
 # Add a refresh button to reset selected cards but keep player names
 if st.sidebar.button("Refresh"):
     reset_state()
     st.rerun()  # Refresh the Streamlit app
 
+# Hit-rate statistics for the cache shared by all sessions
+with st.sidebar.expander("Shared Cache"):
+    cache_stats = SHARED_CACHE.stats()
+    st.write(f"**Hit rate:** {cache_stats['hit_rate']*100:.1f}% ({cache_stats['hits']} hits, {cache_stats['misses']} misses)")
+    st.write(f"**Entries:** {cache_stats['entries']} ({cache_stats['bytes'] / 1024:.0f} KB), {cache_stats['evictions']} evicted")
+
+# Evaluator backend picked for each workload size, and why
+with st.sidebar.expander("Evaluator Backends"):
+    for line in describe_selection():
+        st.write(line)
+
+# Memory held by this session and by the process, with anything that keeps growing flagged.
+# Measuring walks the session state and the module tables, so it only runs while switched on.
+with st.sidebar.expander("Memory"):
+    if st.toggle("Measure memory", key=MEMORY_TOGGLE_KEY):
+        memory = memory_report(st.session_state)
+        st.write(f"**This session:** {memory['session_bytes'] / 1024:.1f} KB")
+        for key, size in list(memory["session"].items())[:5]:
+            st.write(f"`{key}`: {size / 1024:.1f} KB")
+        process = memory["process"]
+        if process["peak_rss"] is not None:
+            st.write(f"**Process peak RSS:** {process['peak_rss'] / 2**20:.0f} MB")
+        st.write(f"**Lookup tables:** {sum(process['tables'].values()) / 2**20:.1f} MB in {len(process['tables'])}")
+        st.write(f"**Shared cache:** {process['shared_cache']['bytes'] / 1024:.0f} KB in {process['shared_cache']['entries']} entries")
+        cached = sum(entries for entries, _ in process["function_caches"].values())
+        st.write(f"**Function caches:** {cached} entries in {len(process['function_caches'])} caches")
+        if process["traced"] is not None:
+            st.write(f"**Traced:** {process['traced'][0] / 2**20:.1f} MB now, {process['traced'][1] / 2**20:.1f} MB peak")
+            for filename, size in list(process["files"].items())[:5]:
+                st.write(f"`{os.path.basename(filename)}`: {size / 1024:.0f} KB")
+        elif not MEMORY_TRACE and st.button("Trace allocations"):
+            start_tracing()
+        for name, (before, after) in {**memory["session_growth"], **memory["process_growth"]}.items():
+            st.warning(f"`{name}` grew on each of the last {GROWTH_RERUNS} checks: {before / 1024:.1f} KB to {after / 1024:.1f} KB")
+    else:
+        st.caption(f"Measures this session on each rerun and the process every {PROCESS_SAMPLE_SECONDS:.0f} s, and flags anything that keeps growing.")
+
 st.markdown("---")
 st.markdown("*Developed with ❤️ for ~~poker enthusiasts~~ ganjhedis who still can't calculate their hands.*")
 st.markdown("*Sharam karo, khelne se pehle seekh lo.*")
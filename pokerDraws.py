@@ -0,0 +1,145 @@
+import numpy as np
+
+from pokerEvaluator import RANK_INDEX, VARIANTS, POPCOUNT, POPCOUNT_NP, variant_ranks, batch_counts
+
+# Draw classifier for two hole cards on a flop or turn.
+# Hands are reduced to 13-bit rank masks and per-suit rank masks; straight draws are
+# read off each variant's precomputed straight windows (the 5-rank masks that make a
+# straight), flush draws off the suit masks. A draw must use at least one hole card.
+# Draws are bit flags, so one small int labels a hand and whole columns can be stored.
+FLUSH_DRAW = 1
+OPEN_ENDED_STRAIGHT_DRAW = 2  # two ranks complete a straight, including double gutshots
+GUTSHOT_STRAIGHT_DRAW = 4
+BACKDOOR_FLUSH_DRAW = 8
+BACKDOOR_STRAIGHT_DRAW = 16
+TWO_OVERCARDS = 32
+ONE_OVERCARD = 64
+COMBO_DRAW = 128  # a flush draw and a straight draw together
+
+# Labels, strongest draw first
+DRAW_NAMES = {
+    COMBO_DRAW: "Combo draw",
+    FLUSH_DRAW: "Flush draw",
+    OPEN_ENDED_STRAIGHT_DRAW: "Open-ended straight draw",
+    GUTSHOT_STRAIGHT_DRAW: "Gutshot straight draw",
+    BACKDOOR_FLUSH_DRAW: "Backdoor flush draw",
+    BACKDOOR_STRAIGHT_DRAW: "Backdoor straight draw",
+    TWO_OVERCARDS: "Two overcards",
+    ONE_OVERCARD: "One overcard",
+}
+
+# Rank masks of every straight in a variant, the ace also playing low
+def _straight_windows(variant):
+    sequence = [12] + [RANK_INDEX[r] for r in variant_ranks(variant)]
+    return [sum(1 << r for r in sequence[i:i + 5]) for i in range(len(sequence) - 4)]
+
+STRAIGHT_WINDOWS = {variant: _straight_windows(variant) for variant in VARIANTS}
+STRAIGHT_WINDOWS_NP = {variant: np.array(windows, dtype=np.int64) for variant, windows in STRAIGHT_WINDOWS.items()}
+
+# Draw flags of one hand: hole and board are int cards, the board 3 or 4 of them.
+# On the river (or before the flop) there is nothing to draw to.
+def classify_draws(hole, board, variant="standard"):
+    if len(board) not in (3, 4):
+        return 0
+    hole_mask = rank_mask = 0
+    suit_masks = [0, 0, 0, 0]
+    hole_suits = [0, 0, 0, 0]
+    for c in hole:
+        hole_mask |= 1 << (c >> 2)
+        hole_suits[c & 3] = 1
+    board_high = -1
+    board_mask = 0
+    for c in list(hole) + list(board):
+        bit = 1 << (c >> 2)
+        rank_mask |= bit
+        suit_masks[c & 3] |= bit
+    for c in board:
+        board_high = max(board_high, c >> 2)
+        board_mask |= 1 << (c >> 2)
+    # A pocket pair or a hole card pairing the board is a made hand; a pair on the board alone isn't
+    paired = POPCOUNT[hole_mask] < len(hole) or bool(hole_mask & board_mask)
+
+    flags = 0
+    made_flush = any(POPCOUNT[m] >= 5 for m in suit_masks)
+    if not made_flush:
+        for suit, m in enumerate(suit_masks):
+            if hole_suits[suit] and POPCOUNT[m] == 4:
+                flags |= FLUSH_DRAW
+            elif hole_suits[suit] and POPCOUNT[m] == 3 and len(board) == 3:
+                flags |= BACKDOOR_FLUSH_DRAW
+
+    windows = STRAIGHT_WINDOWS[variant]
+    made_straight = any(rank_mask & w == w for w in windows)
+    if not made_straight:
+        outs = 0
+        backdoor = False
+        for w in windows:
+            if w & hole_mask:
+                missing = w & ~rank_mask
+                if POPCOUNT[missing] == 1:
+                    outs |= missing
+                elif POPCOUNT[missing] == 2:
+                    backdoor = True
+        if POPCOUNT[outs] >= 2:
+            flags |= OPEN_ENDED_STRAIGHT_DRAW
+        elif outs:
+            flags |= GUTSHOT_STRAIGHT_DRAW
+        elif backdoor and len(board) == 3:
+            flags |= BACKDOOR_STRAIGHT_DRAW
+
+    if flags & FLUSH_DRAW and flags & (OPEN_ENDED_STRAIGHT_DRAW | GUTSHOT_STRAIGHT_DRAW):
+        flags |= COMBO_DRAW
+    if not (paired or made_flush or made_straight):
+        overcards = sum((c >> 2) > board_high for c in hole)
+        flags |= TWO_OVERCARDS if overcards == 2 else ONE_OVERCARD if overcards == 1 else 0
+    return flags
+
+# classify_draws for N hands at once: holes is (N, 2), boards (N, k) with k = 3 or 4
+def classify_draws_batch(holes, boards, variant="standard"):
+    holes = np.asarray(holes, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    n = len(holes)
+    if n == 0 or boards.shape[1] not in (3, 4):
+        return np.zeros(n, dtype=np.int64)
+    counts, suit_masks = batch_counts(np.hstack([holes, boards]))
+    rank_bits = np.int64(1) << np.arange(13, dtype=np.int64)
+    rank_mask = (counts > 0).astype(np.int64) @ rank_bits
+    hole_mask = (np.int64(1) << (holes[:, 0] >> 2)) | (np.int64(1) << (holes[:, 1] >> 2))
+    hole_suits = np.zeros((n, 4), dtype=bool)
+    hole_suits[np.arange(n)[:, None], holes & 3] = True
+    flags = np.zeros(n, dtype=np.int64)
+
+    suit_count = POPCOUNT_NP[suit_masks]
+    made_flush = (suit_count >= 5).any(axis=1)
+    flush_draw = ~made_flush & (hole_suits & (suit_count == 4)).any(axis=1)
+    backdoor_flush = ~made_flush & ~flush_draw & (hole_suits & (suit_count == 3)).any(axis=1)
+    flags |= np.where(flush_draw, FLUSH_DRAW, 0)
+    if boards.shape[1] == 3:
+        flags |= np.where(backdoor_flush, BACKDOOR_FLUSH_DRAW, 0)
+
+    windows = STRAIGHT_WINDOWS_NP[variant]
+    made_straight = ((rank_mask[:, None] & windows) == windows).any(axis=1)
+    missing = windows & ~rank_mask[:, None]
+    uses_hole = (windows & hole_mask[:, None]) != 0
+    missing_count = POPCOUNT_NP[missing]
+    outs = np.bitwise_or.reduce(np.where(uses_hole & (missing_count == 1), missing, 0), axis=1)
+    backdoor = (uses_hole & (missing_count == 2)).any(axis=1)
+    out_ranks = POPCOUNT_NP[outs]
+    flags |= np.where(~made_straight & (out_ranks >= 2), OPEN_ENDED_STRAIGHT_DRAW, 0)
+    flags |= np.where(~made_straight & (out_ranks == 1), GUTSHOT_STRAIGHT_DRAW, 0)
+    if boards.shape[1] == 3:
+        flags |= np.where(~made_straight & (out_ranks == 0) & backdoor, BACKDOOR_STRAIGHT_DRAW, 0)
+
+    straight_draw = (flags & (OPEN_ENDED_STRAIGHT_DRAW | GUTSHOT_STRAIGHT_DRAW)) != 0
+    flags |= np.where(flush_draw & straight_draw, COMBO_DRAW, 0)
+    board_mask = np.bitwise_or.reduce(np.int64(1) << (boards >> 2), axis=1)
+    paired = (POPCOUNT_NP[hole_mask] < 2) | ((hole_mask & board_mask) != 0)
+    unpaired = ~paired & ~made_flush & ~made_straight
+    overcards = ((holes >> 2) > (boards >> 2).max(axis=1)[:, None]).sum(axis=1)
+    flags |= np.where(unpaired & (overcards == 2), TWO_OVERCARDS, 0)
+    flags |= np.where(unpaired & (overcards == 1), ONE_OVERCARD, 0)
+    return flags
+
+# Labels of a set of draw flags, strongest first
+def draw_names(flags):
+    return [name for flag, name in DRAW_NAMES.items() if flags & flag]
@@ -0,0 +1,397 @@
+import time
+
+import numpy as np
+from functools import lru_cache
+from math import comb
+
+from pokerEvaluator import (
+    CATEGORY_SHIFT,
+    evaluate_batch,
+    BOARD_EVALUATORS,
+    GAME_VARIANTS,
+    variant_deck,
+    combo_array,
+)
+from pokerParallel import PARALLEL_WORKERS, SharedArrays, attached_arrays, get_executor, run_tasks, row_blocks
+
+# Outs and equity engines for multi-player spots, built on the integer card core.
+# Players are given as lists of int hole cards, the board as a list of int cards.
+# game selects the rules from BOARD_EVALUATORS ("holdem", "omaha" or "shortdeck").
+
+# Cards of the game's deck not held by any player or on the board
+def remaining_deck(holes, board, dead=(), game="holdem"):
+    used = set(board) | set(dead)
+    for hole in holes:
+        used.update(hole)
+    return [c for c in variant_deck(GAME_VARIANTS[game]) if c not in used]
+
+# Boolean (P, B) array: True where a player holds the single best hand on a board
+def sole_winners(strengths):
+    best = strengths.max(axis=0)
+    at_best = strengths == best
+    return at_best & (at_best.sum(axis=0) == 1)
+
+# Fraction of the pot each player wins on each board, ties split evenly: (P, B)
+def showdown_shares(strengths):
+    at_best = strengths == strengths.max(axis=0)
+    return at_best / at_best.sum(axis=0)
+
+# Per-runout strengths are kept between calls, keyed by flop and hole cards.
+# Editing one player's hole cards recomputes only that player's row; editing the
+# turn or river only selects other columns of the same rows. A new flop starts over.
+FLOP_RUNOUT_CACHE_SIZE = 4
+STRENGTH_ROW_CACHE_SIZE = 512
+FLOP_MATRIX_CACHE_SIZE = 2
+
+# Every turn/river pair after a flop and the full boards they make: (R, 2) and (R, 5).
+# flop is a sorted tuple; pairs touching a player's cards are dropped by the caller.
+@lru_cache(maxsize=FLOP_RUNOUT_CACHE_SIZE)
+def flop_runouts(flop, game="holdem"):
+    pairs = combo_array([c for c in variant_deck(GAME_VARIANTS[game]) if c not in flop], 2)
+    full_boards = np.hstack([np.broadcast_to(np.array(flop, dtype=np.int64), (len(pairs), 3)), pairs])
+    pairs.flags.writeable = False
+    full_boards.flags.writeable = False
+    return pairs, full_boards
+
+# One hand's strength on every runout of a flop, -1 where the runout uses one of its cards
+@lru_cache(maxsize=STRENGTH_ROW_CACHE_SIZE)
+def strength_row(hole, flop, game="holdem"):
+    pairs, full_boards = flop_runouts(flop, game)
+    live = ~np.isin(pairs, hole).any(axis=1)
+    row = np.full(len(pairs), -1, dtype=np.int64)
+    row[live] = BOARD_EVALUATORS[game]([list(hole)], full_boards[live])[0]
+    row.flags.writeable = False
+    return row
+
+# Strength of every two-card holding on every runout of a flop: (R, R), -1 where they
+# share a card. Rows and columns both follow flop_runouts' pairs, so any hole cards,
+# opponent or turn/river on this flop is a row or column lookup. With several CPUs the
+# rows are filled by the worker pool, straight into a shared-memory table.
+@lru_cache(maxsize=FLOP_MATRIX_CACHE_SIZE)
+def flop_strength_matrix(flop, game="holdem"):
+    pairs, full_boards = flop_runouts(flop, game)
+    if PARALLEL_WORKERS > 1:
+        with SharedArrays() as shared:
+            shared.share("pairs", pairs)
+            shared.share("boards", full_boards)
+            shared.create("strengths", (len(pairs), len(pairs)), np.int64)
+            blocks = row_blocks(len(pairs), PARALLEL_WORKERS, HS_OPPONENT_CHUNK)
+            run_tasks(get_executor(), fill_strength_rows, shared.spec(), [(start, stop, game) for start, stop in blocks])
+            matrix = shared["strengths"].copy()
+    else:
+        matrix = np.empty((len(pairs), len(pairs)), dtype=np.int64)
+        strength_rows(pairs, full_boards, matrix, 0, len(pairs), game)
+    overlap = (pairs[:, None, :, None] == pairs[None, :, None, :]).any(axis=(2, 3))
+    matrix[overlap] = -1
+    matrix.flags.writeable = False
+    return matrix
+
+# Strengths of pairs[start:stop] on every board, written into the same rows of out
+def strength_rows(pairs, full_boards, out, start, stop, game="holdem"):
+    for block_start in range(start, stop, HS_OPPONENT_CHUNK):
+        block = pairs[block_start:min(block_start + HS_OPPONENT_CHUNK, stop)]
+        out[block_start:block_start + len(block)] = BOARD_EVALUATORS[game](block.tolist(), full_boards)
+
+# Worker task for flop_strength_matrix: fill rows [start, stop) of the shared table
+def fill_strength_rows(spec, start, stop, game):
+    with attached_arrays(spec) as arrays:
+        strength_rows(arrays["pairs"], arrays["boards"], arrays["strengths"], start, stop, game)
+
+# Every player's strength on every remaining runout: (P, R) strengths and the (R, 5 - len(board))
+# cards each runout adds. From the flop on, rows come from the strength_row cache.
+def runout_strengths(holes, board, dead=(), game="holdem"):
+    if len(board) < 3:
+        runouts = combo_array(remaining_deck(holes, board, dead, game), 5 - len(board))
+        full_boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(runouts), len(board))), runouts])
+        return BOARD_EVALUATORS[game](holes, full_boards), runouts
+
+    flop = tuple(sorted(board[:3]))
+    pairs, _ = flop_runouts(flop, game)
+    used = set(dead).union(*holes)
+    keep = ~np.isin(pairs, list(used)).any(axis=1)
+    for card in board[3:]:
+        keep &= (pairs == card).any(axis=1)
+    strengths = np.array([strength_row(tuple(sorted(hole)), flop, game) for hole in holes]).reshape(len(holes), -1)[:, keep]
+    runouts = pairs[keep]
+    if len(board) > 3:
+        runouts = runouts[~np.isin(runouts, board[3:])].reshape(len(runouts), 5 - len(board))
+    return strengths, runouts
+
+# Exact equity of each player over every remaining runout
+def exact_equity(holes, board, dead=(), game="holdem"):
+    strengths, _ = runout_strengths(holes, board, dead, game)
+    return showdown_shares(strengths).mean(axis=1)
+
+# Each player's exact equity after every possible next card.
+# Every complete runout is evaluated once and shared by all next cards it contains,
+# so the flop costs one pass over the ~990 turn/river boards instead of 45 enumerations.
+# Returns the candidate cards and a (P, R) equity array.
+def next_card_equity(holes, board, game="holdem"):
+    remaining = remaining_deck(holes, board, game=game)
+    strengths, runouts = runout_strengths(holes, board, game=game)
+    shares = showdown_shares(strengths)
+    contains = (runouts[:, :, None] == np.array(remaining, dtype=np.int64)).any(axis=1)
+    return remaining, (shares @ contains) / contains.sum(axis=0)
+
+# Opponent-aware outs: which next cards (and turn/river pairs on the flop)
+# take each player from not winning to winning outright
+def find_outs(holes, board, game="holdem"):
+    evaluate_boards = BOARD_EVALUATORS[game]
+    current = evaluate_boards(holes, np.array([board], dtype=np.int64))[:, 0]
+    was_winning = sole_winners(current[:, None])[:, 0]
+    remaining = remaining_deck(holes, board, game=game)
+
+    # One more card on every board, all players evaluated in one batch
+    next_boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(remaining), len(board))),
+                             np.array(remaining, dtype=np.int64)[:, None]])
+    strengths = evaluate_boards(holes, next_boards)
+    winning = sole_winners(strengths)
+    card_turnaround = winning & ~was_winning[:, None]
+    improved = (strengths >> CATEGORY_SHIFT) > (current >> CATEGORY_SHIFT)[:, None]
+
+    outs = {
+        "remaining": remaining,
+        "current": current,
+        "was_winning": was_winning,
+        "card_turnaround": card_turnaround,
+        "clean": [[remaining[i] for i in np.flatnonzero(card_turnaround[p])] for p in range(len(holes))],
+        "tainted": [[remaining[i] for i in np.flatnonzero(improved[p] & ~winning[p])] for p in range(len(holes))],
+        "runouts": None,
+        "runout_turnaround": None,
+    }
+
+    # On the flop also look at every turn/river pair
+    if len(board) == 3:
+        runout_strength, pairs = runout_strengths(holes, board, game=game)
+        outs["runouts"] = pairs
+        outs["runout_turnaround"] = sole_winners(runout_strength) & ~was_winning[:, None]
+
+    return outs
+
+# Main and side pots from each live player's total contribution to the hand.
+# Chips put in by folded players are dead money in the pots they reached.
+# Returns a list of (amount, eligible live player indexes), main pot first.
+def build_pots(contributions, folded=()):
+    levels = sorted(set(c for c in contributions if c > 0))
+    all_chips = list(contributions) + list(folded)
+    pots = []
+    previous = 0
+    for level in levels:
+        amount = sum(min(c, level) - min(c, previous) for c in all_chips)
+        eligible = [p for p, c in enumerate(contributions) if c >= level]
+        pots.append((amount, eligible))
+        previous = level
+    # Folded chips above every live contribution go to the last pot
+    if pots:
+        extra = sum(max(c - previous, 0) for c in folded)
+        pots[-1] = (pots[-1][0] + extra, pots[-1][1])
+    return pots
+
+# Chips each player wins from one pot on every board as a (P, B) int array.
+# Ties split evenly; the odd chips go one each to the tied winners earliest in odd_chip_order.
+def pot_payouts(strengths, amount, eligible, odd_chip_order=None):
+    num_players = strengths.shape[0]
+    order = list(range(num_players)) if odd_chip_order is None else list(odd_chip_order)
+    live = np.zeros(num_players, dtype=bool)
+    live[eligible] = True
+    masked = np.where(live[:, None], strengths, -1)
+    winners = masked == masked.max(axis=0)
+    num_winners = winners.sum(axis=0)
+    payout = winners * (amount // num_winners)
+    odd_chips = amount % num_winners
+    extra = np.zeros_like(winners)
+    extra[order] = winners[order] & (np.cumsum(winners[order], axis=0) <= odd_chips)
+    return payout + extra
+
+# Expected chips each player collects from each pot over every remaining runout.
+# Strengths are evaluated once per board and shared by all pots; a pot only masks
+# out the players not eligible for it. On the river this is the exact payout.
+# Returns the pots and a (pots, P) array of expected chips.
+def all_in_ev(holes, board, contributions, folded=(), odd_chip_order=None, dead=(), game="holdem"):
+    strengths, _ = runout_strengths(holes, board, dead, game)
+    pots = build_pots(contributions, folded)
+    pot_ev = np.zeros((len(pots), len(holes)))
+    for i, (amount, eligible) in enumerate(pots):
+        pot_ev[i] = pot_payouts(strengths, amount, eligible, odd_chip_order).mean(axis=1)
+    return pots, pot_ev
+
+# Run it N times: after an all-in the remaining board is dealt num_boards times from
+# the same deck, without replacement, and each board pays its share of the pot.
+# Deals with at most this many runout combinations are enumerated exactly,
+# larger ones are sampled in batches until every player's 95% error bound is within
+# MULTI_BOARD_TARGET_ERROR, MULTI_BOARD_SAMPLES deals are reached or the time budget
+# runs out (a deal costs far more in Omaha, and with more players and boards).
+MULTI_BOARD_EXACT_LIMIT = 1000000
+MULTI_BOARD_SAMPLES = 20000
+MULTI_BOARD_BATCH = 1000
+MULTI_BOARD_TARGET_ERROR = 0.01
+MULTI_BOARD_TIME_BUDGET = 1.0  # seconds
+
+# Each player's equity per board, combined pot share and chance of winning every board.
+# Exact mode enumerates every set of disjoint runouts; sampled mode deals random
+# shuffles (exactly `samples` of them when given) and reports a 95% error bound on the
+# combined share.
+def multi_board_equity(holes, board, num_boards, samples=None, dead=(), game="holdem", seed=0):
+    evaluate_boards = BOARD_EVALUATORS[game]
+    remaining = remaining_deck(holes, board, dead, game)
+    to_come = 5 - len(board)
+    if len(remaining) < to_come * num_boards:
+        raise ValueError(f"Not enough cards left to run the board {num_boards} times")
+    board_cards = np.array(board, dtype=np.int64)
+    exact = samples is None and comb(comb(len(remaining), to_come), num_boards) <= MULTI_BOARD_EXACT_LIMIT
+
+    if exact:
+        # Every runout is evaluated once; deals pick num_boards runouts with no card in common
+        strengths, runouts = runout_strengths(holes, board, dead, game)
+        shares = showdown_shares(strengths)
+        wins = sole_winners(strengths)
+        deals = combo_array(range(len(runouts)), num_boards)
+        dealt = np.sort(runouts[deals].reshape(len(deals), -1), axis=1)
+        deals = deals[~(dealt[:, 1:] == dealt[:, :-1]).any(axis=1)]
+        deal_shares = shares[:, deals]
+        deal_wins = wins[:, deals]
+        # Boards are interchangeable, so every board has the same exact equity
+        board_equity = np.repeat(deal_shares.mean(axis=(1, 2))[None], num_boards, axis=0)
+    else:
+        rng = np.random.default_rng(seed)
+        adaptive = samples is None
+        samples = samples or MULTI_BOARD_SAMPLES
+        remaining_cards = np.array(remaining, dtype=np.int64)
+        share_batches, win_batches = [], []
+        dealt_so_far = 0
+        started = time.perf_counter()
+        while dealt_so_far < samples:
+            n = min(MULTI_BOARD_BATCH, samples - dealt_so_far)
+            order = rng.random((n, len(remaining))).argsort(axis=1)[:, :to_come * num_boards]
+            dealt = remaining_cards[order].reshape(n * num_boards, to_come)
+            full_boards = np.hstack([np.broadcast_to(board_cards, (len(dealt), len(board))), dealt])
+            strengths = evaluate_boards(holes, full_boards)
+            share_batches.append(showdown_shares(strengths).reshape(len(holes), n, num_boards))
+            win_batches.append(sole_winners(strengths).reshape(len(holes), n, num_boards))
+            dealt_so_far += n
+            if adaptive and dealt_so_far < samples:
+                combined = np.concatenate(share_batches, axis=1).mean(axis=2)
+                error = 1.96 * combined.std(axis=1) / np.sqrt(dealt_so_far)
+                if error.max() <= MULTI_BOARD_TARGET_ERROR or time.perf_counter() - started >= MULTI_BOARD_TIME_BUDGET:
+                    break
+        deal_shares = np.concatenate(share_batches, axis=1)
+        deal_wins = np.concatenate(win_batches, axis=1)
+        board_equity = deal_shares.mean(axis=1).T
+
+    combined = deal_shares.mean(axis=2)
+    error = None
+    if not exact:
+        error = 1.96 * combined.std(axis=1) / np.sqrt(combined.shape[1])
+    return {
+        "exact": exact,
+        "deals": combined.shape[1],
+        "board_equity": board_equity,
+        "share": combined.mean(axis=1),
+        "scoop": deal_wins.all(axis=2).mean(axis=1),
+        "error": error,
+    }
+
+# Opponent hands per evaluation block in flop_strength_matrix, to bound memory
+HS_OPPONENT_CHUNK = 256
+
+# Hand strength and potential of one hand against every possible opponent holding.
+# HS is the share of opponent hands we beat now (ties count half). PPOT is the chance
+# of ending ahead when behind now, NPOT the chance of falling behind when ahead now,
+# both over every remaining runout to the river. Runout strengths are read from the
+# flop's cached strength matrix, so new hole cards or a new turn cost no evaluation.
+def hand_strength_potential(hole, board, game="holdem"):
+    evaluate_boards = BOARD_EVALUATORS[game]
+    remaining = remaining_deck([hole], board, game=game)
+    opponents = combo_array(remaining, 2)
+    board_now = np.array([board], dtype=np.int64)
+    ours_now = evaluate_boards([hole], board_now)[0, 0]
+    theirs_now = evaluate_boards(opponents.tolist(), board_now)[:, 0]
+    # 0 behind, 1 tied, 2 ahead
+    now = np.sign(ours_now - theirs_now) + 1
+    counts_now = np.bincount(now, minlength=3)
+    strength = (counts_now[2] + counts_now[1] / 2) / len(opponents)
+
+    ppot = npot = 0.0
+    if len(board) < 5:
+        flop = tuple(sorted(board[:3]))
+        pairs, _ = flop_runouts(flop, game)
+        # Runouts that fit our hand and the board so far; opponents are the pairs that
+        # fit them too, in the same order as `opponents`
+        fits = ~np.isin(pairs, hole).any(axis=1)
+        keep = fits.copy()
+        for card in board[3:]:
+            keep &= (pairs == card).any(axis=1)
+        fits &= ~np.isin(pairs, board[3:]).any(axis=1)
+        ours_final = strength_row(tuple(sorted(hole)), flop, game)[keep]
+        theirs_final = flop_strength_matrix(flop, game)[np.ix_(fits, keep)]
+        # transitions[now, final]: (opponent, runout) pairs that share no card
+        disjoint = theirs_final >= 0
+        final = np.sign(ours_final[None] - theirs_final) + 1
+        transitions = np.zeros((3, 3))
+        for state in range(3):
+            transitions[:, state] = np.bincount(now, weights=(disjoint & (final == state)).sum(axis=1), minlength=3)
+        totals = transitions.sum(axis=1)
+        behind, tied, ahead = 0, 1, 2
+        if totals[behind] + totals[tied]:
+            ppot = ((transitions[behind, ahead] + transitions[behind, tied] / 2 + transitions[tied, ahead] / 2)
+                    / (totals[behind] + totals[tied] / 2))
+        if totals[ahead] + totals[tied]:
+            npot = ((transitions[ahead, behind] + transitions[tied, behind] / 2 + transitions[ahead, tied] / 2)
+                    / (totals[ahead] + totals[tied] / 2))
+
+    return {
+        "ahead": int(counts_now[2]),
+        "tied": int(counts_now[1]),
+        "behind": int(counts_now[0]),
+        "hs": float(strength),
+        "ppot": float(ppot),
+        "npot": float(npot),
+    }
+
+# Effective hand strength against num_opponents random hands:
+# HS^n, improved by the positive potential and reduced by the negative potential
+def effective_hand_strength(potential, num_opponents=1):
+    strength = potential["hs"] ** num_opponents
+    return strength * (1 - potential["npot"]) + (1 - strength) * potential["ppot"]
+
+# Every two-card holding on a board, sorted by strength: (combos (M, 2), strengths (M,)).
+# Built once per board; any hole cards can then be ranked against it by binary search.
+def board_index(board, game="holdem"):
+    combos = combo_array(remaining_deck([], board, game=game), 2)
+    strengths = BOARD_EVALUATORS[game](combos.tolist(), np.array([board], dtype=np.int64))[:, 0]
+    order = np.argsort(strengths, kind="stable")
+    return combos[order], strengths[order]
+
+# How many opponent holdings beat, tie and lose to hole on the indexed board.
+# Holdings that use one of our hole cards are impossible and are left out.
+# Returns the counts and the beating combos with their strengths, strongest first.
+def rank_against_board(index, hole, board, game="holdem"):
+    combos, strengths = index
+    ours = BOARD_EVALUATORS[game]([list(hole)], np.array([board], dtype=np.int64))[0, 0]
+    low = np.searchsorted(strengths, ours, side="left")
+    high = np.searchsorted(strengths, ours, side="right")
+    blocked = np.isin(combos, hole).any(axis=1)
+    beating = np.flatnonzero(~blocked[high:]) + high
+    return {
+        "strength": int(ours),
+        "beats_me": len(beating),
+        "ties": int((~blocked[low:high]).sum()),
+        "i_beat": int((~blocked[:low]).sum()),
+        "beating_combos": combos[beating[::-1]],
+        "beating_strengths": strengths[beating[::-1]],
+    }
+
+# Monte Carlo all-in equity of one hole-card pair preflop against num_opponents random hands.
+# All samples are dealt with one vectorised shuffle and evaluated in one batch.
+PREFLOP_SAMPLES = 20000
+
+def starting_hand_equity(hole, num_opponents, samples=PREFLOP_SAMPLES, game="holdem", seed=0):
+    remaining = np.array(remaining_deck([hole], [], game=game), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    dealt = rng.permuted(np.tile(remaining, (samples, 1)), axis=1)[:, :2 * num_opponents + 5]
+    holes = np.concatenate([np.broadcast_to(np.array(hole, dtype=np.int64), (samples, 1, 2)),
+                            dealt[:, :2 * num_opponents].reshape(samples, num_opponents, 2)], axis=1)
+    boards = np.broadcast_to(dealt[:, None, 2 * num_opponents:], (samples, num_opponents + 1, 5))
+    hands = np.concatenate([holes, boards], axis=2).reshape(-1, 7)
+    strengths = evaluate_batch(hands, GAME_VARIANTS[game]).reshape(samples, num_opponents + 1)
+    return float(showdown_shares(strengths.T)[0].mean())
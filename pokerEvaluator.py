@@ -0,0 +1,386 @@
+import numpy as np
+from functools import partial
+from itertools import combinations
+
+# Integer card core shared by both tools.
+# A card is an int 0-51: rank_index * 4 + suit_index, using the same RANKS/SUITS
+# ordering as the Streamlit tools so (rank, suit) tuples convert both ways.
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+DECK_INTS = list(range(52))
+
+# Hand categories, same numbering as HAND_RANKINGS / HAND_RANKS in the tools
+HAND_CATEGORIES = {
+    9: "Royal Flush",
+    8: "Straight Flush",
+    7: "Four of a Kind",
+    6: "Full House",
+    5: "Flush",
+    4: "Straight",
+    3: "Three of a Kind",
+    2: "Two Pair",
+    1: "One Pair",
+    0: "High Card"
+}
+
+# A strength is a single int: the category's place in the variant's ranking << 20,
+# followed by up to five 4-bit rank nibbles (most significant first).
+# Higher strength always wins, equal strength chops.
+CATEGORY_SHIFT = 20
+
+# Convert between (rank, suit) tuples and ints
+def card_to_int(card):
+    return RANK_INDEX[card[0]] * 4 + SUIT_INDEX[card[1]]
+
+def int_to_card(c):
+    return (RANKS[c >> 2], SUITS[c & 3])
+
+def cards_to_ints(cards):
+    return [card_to_int(c) for c in cards]
+
+# Lookup tables indexed by a 13-bit rank mask
+def _build_tables():
+    popcount = [0] * 8192
+    high = [0] * 8192
+    top = {n: [0] * 8192 for n in (1, 2, 3, 5)}
+    for mask in range(8192):
+        ranks = [r for r in range(12, -1, -1) if mask >> r & 1]
+        popcount[mask] = len(ranks)
+        high[mask] = ranks[0] if ranks else 0
+        for n in top:
+            value = 0
+            for i, r in enumerate(ranks[:n]):
+                value |= r << (4 * (n - 1 - i))
+            top[n][mask] = value
+    return popcount, high, top
+
+# High rank of the best straight in each rank mask (-1 if none), given the
+# variant's ace-low straight and the rank that tops it
+def _build_straight_table(wheel_ranks, wheel_high):
+    straight_high = [-1] * 8192
+    wheel = sum(1 << r for r in wheel_ranks)
+    for mask in range(8192):
+        for h in range(12, 3, -1):
+            window = 0b11111 << (h - 4)
+            if mask & window == window:
+                straight_high[mask] = h
+                break
+        else:
+            if mask & wheel == wheel:
+                straight_high[mask] = wheel_high
+    return straight_high
+
+POPCOUNT, HIGH_RANK, TOP_RANKS = _build_tables()
+TOP1, TOP2, TOP3, TOP5 = TOP_RANKS[1], TOP_RANKS[2], TOP_RANKS[3], TOP_RANKS[5]
+STRAIGHT_HIGH = _build_straight_table([12, 0, 1, 2, 3], 3)  # A-2-3-4-5
+SHORT_DECK_STRAIGHT_HIGH = _build_straight_table([12, 4, 5, 6, 7], 7)  # A-6-7-8-9
+
+POPCOUNT_NP = np.array(POPCOUNT, dtype=np.int64)
+HIGH_RANK_NP = np.array(HIGH_RANK, dtype=np.int64)
+STRAIGHT_HIGH_NP = np.array(STRAIGHT_HIGH, dtype=np.int64)
+TOP1_NP = np.array(TOP1, dtype=np.int64)
+TOP2_NP = np.array(TOP2, dtype=np.int64)
+TOP3_NP = np.array(TOP3, dtype=np.int64)
+TOP5_NP = np.array(TOP5, dtype=np.int64)
+RANK_BITS_NP = np.array([1 << r for r in range(13)], dtype=np.int64)
+
+# Rule variants. Each one is a set of generated tables rather than separate code:
+# its ranks and deck, its straight table, and where each category sits in its ranking.
+def _make_variant(ranks, straight_high, category_order):
+    category_values = [category_order.index(c) << CATEGORY_SHIFT for c in range(10)]
+    return {
+        "ranks": ranks,
+        "deck": [c for c in DECK_INTS if RANKS[c >> 2] in ranks],
+        "straight_high": straight_high,
+        "straight_high_np": np.array(straight_high, dtype=np.int64),
+        "category_order": category_order,  # categories from worst to best
+        "category_values": category_values,
+        "category_values_np": np.array(category_values, dtype=np.int64),
+    }
+
+VARIANTS = {
+    "standard": _make_variant(RANKS, STRAIGHT_HIGH, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+    # Short deck (6+): 36 cards, A-6-7-8-9 is the low straight and a flush beats a full house
+    "shortdeck": _make_variant(RANKS[4:], SHORT_DECK_STRAIGHT_HIGH, [0, 1, 2, 3, 4, 6, 5, 7, 8, 9]),
+}
+
+def variant_ranks(variant="standard"):
+    return VARIANTS[variant]["ranks"]
+
+def variant_deck(variant="standard"):
+    return VARIANTS[variant]["deck"]
+
+# HAND_CATEGORIES key of a strength
+def strength_category(strength, variant="standard"):
+    return VARIANTS[variant]["category_order"][int(strength) >> CATEGORY_SHIFT]
+
+# Position of a category in the variant's ranking, for comparing categories
+def category_rank(category, variant="standard"):
+    return VARIANTS[variant]["category_order"].index(category)
+
+# Strength from per-rank counts and per-suit rank masks (5 to 7 cards)
+def strength_from_counts(counts, suit_masks, variant="standard"):
+    tables = VARIANTS[variant]
+    straight_high = tables["straight_high"]
+    values = tables["category_values"]
+    rank_mask = quads = trips = pairs = 0
+    for r in range(13):
+        n = counts[r]
+        if n:
+            bit = 1 << r
+            rank_mask |= bit
+            if n == 2:
+                pairs |= bit
+            elif n == 3:
+                trips |= bit
+            elif n == 4:
+                quads |= bit
+
+    flush_mask = 0
+    for m in suit_masks:
+        if POPCOUNT[m] >= 5:
+            flush_mask = m
+            high = straight_high[m]
+            if high >= 0:
+                return values[9 if high == 12 else 8] | high << 16
+            break
+
+    if quads:
+        q = HIGH_RANK[quads]
+        return values[7] | q << 16 | HIGH_RANK[rank_mask & ~(1 << q)] << 12
+    if trips and (pairs or POPCOUNT[trips] >= 2):
+        t = HIGH_RANK[trips]
+        return values[6] | t << 16 | HIGH_RANK[(trips | pairs) & ~(1 << t)] << 12
+    if flush_mask:
+        return values[5] | TOP5[flush_mask]
+    high = straight_high[rank_mask]
+    if high >= 0:
+        return values[4] | high << 16
+    if trips:
+        t = HIGH_RANK[trips]
+        return values[3] | t << 16 | TOP2[rank_mask & ~(1 << t)] << 8
+    if POPCOUNT[pairs] >= 2:
+        p1 = HIGH_RANK[pairs]
+        p2 = HIGH_RANK[pairs & ~(1 << p1)]
+        return values[2] | p1 << 16 | p2 << 12 | HIGH_RANK[rank_mask & ~(1 << p1 | 1 << p2)] << 8
+    if pairs:
+        p = HIGH_RANK[pairs]
+        return values[1] | p << 16 | TOP3[rank_mask & ~(1 << p)] << 4
+    return values[0] | TOP5[rank_mask]
+
+# Evaluate 5-7 int cards to a strength
+def evaluate_strength(cards, variant="standard"):
+    counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    for c in cards:
+        counts[c >> 2] += 1
+        suit_masks[c & 3] |= 1 << (c >> 2)
+    return strength_from_counts(counts, suit_masks, variant)
+
+# Incremental evaluation: summarise the board once, then add each player's hole cards
+def board_state(board):
+    counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    for c in board:
+        counts[c >> 2] += 1
+        suit_masks[c & 3] |= 1 << (c >> 2)
+    return counts, suit_masks
+
+def evaluate_with_board(state, hole, variant="standard"):
+    counts = state[0][:]
+    suit_masks = state[1][:]
+    for c in hole:
+        counts[c >> 2] += 1
+        suit_masks[c & 3] |= 1 << (c >> 2)
+    return strength_from_counts(counts, suit_masks, variant)
+
+# Per-rank counts (N, 13) and per-suit rank masks (N, 4) of an (N, k) int card array
+def batch_counts(cards):
+    cards = np.asarray(cards, dtype=np.int64)
+    n, k = cards.shape
+    ranks = cards >> 2
+    rows = np.repeat(np.arange(n, dtype=np.int64), k)
+    counts = np.bincount(rows * 13 + ranks.ravel(), minlength=n * 13).reshape(n, 13)
+    suit_masks = np.bincount(rows * 4 + (cards & 3).ravel(), weights=(1 << ranks).ravel(),
+                             minlength=n * 4).reshape(n, 4).astype(np.int64)
+    return counts, suit_masks
+
+# Batched evaluation: hands is an (N, k) int array with 5 <= k <= 7
+def evaluate_batch(hands, variant="standard"):
+    hands = np.asarray(hands, dtype=np.int64)
+    if hands.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+    return strengths_from_counts_batch(*batch_counts(hands), variant)
+
+# Vectorised strength_from_counts
+def strengths_from_counts_batch(counts, suit_masks, variant="standard"):
+    tables = VARIANTS[variant]
+    straight_high = tables["straight_high_np"]
+    values = tables["category_values_np"]
+    n = counts.shape[0]
+    rank_mask = (counts > 0).astype(np.int64) @ RANK_BITS_NP
+    quads = (counts == 4).astype(np.int64) @ RANK_BITS_NP
+    trips = (counts == 3).astype(np.int64) @ RANK_BITS_NP
+    pairs = (counts == 2).astype(np.int64) @ RANK_BITS_NP
+
+    suit_pop = POPCOUNT_NP[suit_masks]
+    flush_suit = suit_pop.argmax(axis=1)
+    has_flush = suit_pop.max(axis=1) >= 5
+    flush_mask = np.where(has_flush, suit_masks[np.arange(n), flush_suit], 0)
+    sf_high = straight_high[flush_mask]
+    is_sf = has_flush & (sf_high >= 0)
+
+    q = HIGH_RANK_NP[quads]
+    t = HIGH_RANK_NP[trips]
+    p1 = HIGH_RANK_NP[pairs]
+    p2 = HIGH_RANK_NP[pairs & ~(1 << p1)]
+    st_high = straight_high[rank_mask]
+    one = np.int64(1)
+
+    # A flush and a full house can't both be made from 7 cards, so checking them in
+    # standard order is right for every variant; only their category values differ
+    conditions = [
+        is_sf,
+        quads > 0,
+        (trips > 0) & ((pairs > 0) | (POPCOUNT_NP[trips] >= 2)),
+        has_flush,
+        st_high >= 0,
+        trips > 0,
+        POPCOUNT_NP[pairs] >= 2,
+        pairs > 0,
+    ]
+    hand_values = [
+        np.where(sf_high == 12, values[9], values[8]) | sf_high << 16,
+        values[7] | q << 16 | HIGH_RANK_NP[rank_mask & ~(one << q)] << 12,
+        values[6] | t << 16 | HIGH_RANK_NP[(trips | pairs) & ~(one << t)] << 12,
+        values[5] | TOP5_NP[flush_mask],
+        values[4] | st_high << 16,
+        values[3] | t << 16 | TOP2_NP[rank_mask & ~(one << t)] << 8,
+        values[2] | p1 << 16 | p2 << 12 | HIGH_RANK_NP[rank_mask & ~((one << p1) | (one << p2))] << 8,
+        values[1] | p1 << 16 | TOP3_NP[rank_mask & ~(one << p1)] << 4,
+    ]
+    return np.select(conditions, hand_values, default=values[0] | TOP5_NP[rank_mask]).astype(np.int64)
+
+# All k-card combinations of the given int cards as an (M, k) array
+def combo_array(cards, k):
+    if k == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    combos = np.array(list(combinations(cards, k)), dtype=np.int64)
+    return combos.reshape(-1, k)
+
+# Boards per chunk in evaluate_boards, to bound memory on preflop enumerations
+BOARD_CHUNK = 200000
+
+# Strength of every player on every board: holes is a list of hole-card int lists,
+# boards an (B, k) array of complete 5-card boards. Returns a (P, B) array.
+# Each board is summarised once; players only add their hole cards to the shared counts.
+def evaluate_boards(holes, boards, variant="standard"):
+    boards = np.asarray(boards, dtype=np.int64)
+    num_boards = boards.shape[0]
+    strengths = np.zeros((len(holes), num_boards), dtype=np.int64)
+    if not holes or num_boards == 0:
+        return strengths
+    for start in range(0, num_boards, BOARD_CHUNK):
+        board_counts, board_masks = batch_counts(boards[start:start + BOARD_CHUNK])
+        chunk = board_counts.shape[0]
+        counts = np.repeat(board_counts[None], len(holes), axis=0)
+        suit_masks = np.repeat(board_masks[None], len(holes), axis=0)
+        for p, hole in enumerate(holes):
+            for c in hole:
+                counts[p, :, c >> 2] += 1
+                suit_masks[p, :, c & 3] |= 1 << (c >> 2)
+        strengths[:, start:start + chunk] = strengths_from_counts_batch(
+            counts.reshape(-1, 13), suit_masks.reshape(-1, 4), variant).reshape(len(holes), chunk)
+    return strengths
+
+# Pot-Limit Omaha: each player must use exactly two of four hole cards and exactly
+# three board cards. The best of the 6 hole pairs x up to 10 board triples wins.
+OMAHA_HOLE_PAIRS = list(combinations(range(4), 2))
+OMAHA_BOARD_CHUNK = 4000
+
+# Scalar Omaha strength: each board triple is summarised once and reused for every hole pair
+def evaluate_omaha(hole, board, variant="standard"):
+    best = -1
+    pairs = list(combinations(hole, 2))
+    for triple in combinations(board, 3):
+        state = board_state(triple)
+        for pair in pairs:
+            strength = evaluate_with_board(state, pair, variant)
+            if strength > best:
+                best = strength
+    return best
+
+# Batched Omaha: boards is a (B, k) array with 3 <= k <= 5, returns a (P, B) array.
+# Counts of every board triple and every hole pair are looked up once and combined
+# by broadcasting, so all 60 combinations of a player finish in one vectorised call.
+def evaluate_boards_omaha(holes, boards, variant="standard"):
+    boards = np.asarray(boards, dtype=np.int64)
+    num_boards, board_size = boards.shape
+    strengths = np.zeros((len(holes), num_boards), dtype=np.int64)
+    if not holes or num_boards == 0:
+        return strengths
+    triples = list(combinations(range(board_size), 3))
+    for start in range(0, num_boards, OMAHA_BOARD_CHUNK):
+        chunk_boards = boards[start:start + OMAHA_BOARD_CHUNK]
+        chunk = chunk_boards.shape[0]
+        triple_counts, triple_masks = batch_counts(chunk_boards[:, triples].reshape(-1, 3))
+        triple_counts = triple_counts.reshape(chunk, len(triples), 1, 13)
+        triple_masks = triple_masks.reshape(chunk, len(triples), 1, 4)
+        for p, hole in enumerate(holes):
+            pair_counts, pair_masks = batch_counts(np.asarray(hole, dtype=np.int64)[OMAHA_HOLE_PAIRS])
+            counts = (triple_counts + pair_counts).reshape(-1, 13)
+            suit_masks = (triple_masks | pair_masks).reshape(-1, 4)
+            combo_strengths = strengths_from_counts_batch(counts, suit_masks, variant).reshape(chunk, -1)
+            strengths[p, start:start + chunk] = combo_strengths.max(axis=1)
+    return strengths
+
+# Omaha strengths of paired rows: holes is (M, 4), boards is (M, 5); row i plays holes[i] on boards[i].
+# All 60 two-plus-three combinations of every row are evaluated in one vectorised call per chunk.
+def evaluate_omaha_batch(holes, boards, variant="standard"):
+    holes = np.asarray(holes, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    triples = list(combinations(range(boards.shape[1]), 3))
+    strengths = np.zeros(holes.shape[0], dtype=np.int64)
+    for start in range(0, holes.shape[0], OMAHA_BOARD_CHUNK):
+        pairs = holes[start:start + OMAHA_BOARD_CHUNK][:, OMAHA_HOLE_PAIRS]
+        board_triples = boards[start:start + OMAHA_BOARD_CHUNK][:, triples]
+        chunk = pairs.shape[0]
+        hands = np.concatenate([
+            np.broadcast_to(pairs[:, :, None], (chunk, len(OMAHA_HOLE_PAIRS), len(triples), 2)),
+            np.broadcast_to(board_triples[:, None], (chunk, len(OMAHA_HOLE_PAIRS), len(triples), 3)),
+        ], axis=3).reshape(-1, 5)
+        strengths[start:start + chunk] = evaluate_batch(hands, variant).reshape(chunk, -1).max(axis=1)
+    return strengths
+
+# Best five of 5-7 int cards under a variant's rules: (strength, five cards)
+def best_five(cards, variant="standard"):
+    if len(cards) == 5:
+        return evaluate_strength(cards, variant), list(cards)
+    return max(((evaluate_strength(five, variant), list(five)) for five in combinations(cards, 5)), key=lambda x: x[0])
+
+# Hand name in the same style as the single-player tool, e.g. "Full House (Ks over 7s)"
+def describe_strength(strength, variant="standard"):
+    category = strength_category(strength, variant)
+    nibbles = [RANKS[(int(strength) >> shift) & 15] for shift in (16, 12, 8, 4, 0)]
+    if category == 9:
+        return "Royal Flush"
+    if category in (8, 5, 4):
+        return f"{HAND_CATEGORIES[category]} ({nibbles[0]} high)"
+    if category in (7, 3, 1):
+        return f"{HAND_CATEGORIES[category]} ({nibbles[0]}s)"
+    if category == 6:
+        return f"Full House ({nibbles[0]}s over {nibbles[1]}s)"
+    if category == 2:
+        return f"Two Pair ({nibbles[0]}s and {nibbles[1]}s)"
+    return f"High Card ({nibbles[0]})"
+
+# Games: hole card count, rule variant and board evaluator
+GAME_HOLE_CARDS = {"holdem": 2, "omaha": 4, "shortdeck": 2}
+GAME_VARIANTS = {"holdem": "standard", "omaha": "standard", "shortdeck": "shortdeck"}
+BOARD_EVALUATORS = {
+    "holdem": evaluate_boards,
+    "omaha": evaluate_boards_omaha,
+    "shortdeck": partial(evaluate_boards, variant="shortdeck"),
+}
@@ -0,0 +1,95 @@
+import json
+import os
+
+import numpy as np
+
+# Columnar bulk export for batch and simulation results.
+# A dataset is a directory holding one .npy file per column per chunk of rows
+# (e.g. "strength.00003.npy") and a columns.json manifest. Chunks are plain .npy
+# files, so they can be memory-mapped back without parsing or copying.
+EXPORT_CHUNK_ROWS = 1000000
+MANIFEST_FILE = "columns.json"
+
+# Buffers appended rows and writes every column in chunks of chunk_rows rows
+class ColumnWriter:
+    def __init__(self, path, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.columns = None  # name -> (dtype, shape of one row)
+        self.buffers = {}
+        self.buffered_rows = 0
+        self.rows = 0
+        self.chunks = 0
+        os.makedirs(path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Add rows: every column is an array with the same number of rows
+    def append(self, **columns):
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same number of rows")
+        if self.columns is None:
+            self.columns = {name: (array.dtype, array.shape[1:]) for name, array in arrays.items()}
+            self.buffers = {name: [] for name in arrays}
+        elif set(arrays) != set(self.columns):
+            raise ValueError(f"Expected columns {sorted(self.columns)}, got {sorted(arrays)}")
+        for name, array in arrays.items():
+            dtype, shape = self.columns[name]
+            if array.shape[1:] != shape:
+                raise ValueError(f"Column {name} rows have shape {array.shape[1:]}, expected {shape}")
+            self.buffers[name].append(array.astype(dtype, copy=False))
+        self.buffered_rows += lengths.pop()
+        while self.buffered_rows >= self.chunk_rows:
+            self.write_chunk(self.chunk_rows)
+
+    # Write the first `rows` buffered rows of every column as the next chunk
+    def write_chunk(self, rows):
+        for name, parts in self.buffers.items():
+            data = np.concatenate(parts) if len(parts) > 1 else parts[0]
+            np.save(os.path.join(self.path, f"{name}.{self.chunks:05d}.npy"), data[:rows])
+            self.buffers[name] = [data[rows:]]
+        self.buffered_rows -= rows
+        self.rows += rows
+        self.chunks += 1
+
+    # Write the last, possibly shorter, chunk and the manifest
+    def close(self):
+        if self.buffered_rows:
+            self.write_chunk(self.buffered_rows)
+        manifest = {
+            "rows": self.rows,
+            "chunk_rows": self.chunk_rows,
+            "chunks": self.chunks,
+            "columns": {name: {"dtype": dtype.str, "shape": list(shape)}
+                        for name, (dtype, shape) in (self.columns or {}).items()},
+        }
+        tmp_path = os.path.join(self.path, f"{MANIFEST_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+# Memory-mapped chunks of every column: name -> list of read-only arrays
+def open_columns(path):
+    manifest = read_manifest(path)
+    return {
+        name: [np.load(os.path.join(path, f"{name}.{chunk:05d}.npy"), mmap_mode="r") for chunk in range(manifest["chunks"])]
+        for name in manifest["columns"]
+    }
+
+# One whole column as a single in-memory array
+def read_column(path, name):
+    chunks = open_columns(path)[name]
+    if not chunks:
+        column = read_manifest(path)["columns"][name]
+        return np.zeros([0] + column["shape"], dtype=column["dtype"])
+    return np.concatenate(chunks)
@@ -0,0 +1,152 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import comb
+
+import numpy as np
+
+from pokerEvaluator import evaluate_batch
+from pokerParallel import SharedArrays, attached_arrays, run_tasks
+from pokerSimulator import STARTING_HANDS, starting_hand_index
+
+# Flop-texture equity database: for each of the 1,755 suit-canonical Hold'em flops,
+# the equity of each of the 169 starting hands against one random hand, averaged
+# over the hand's combos that fit the flop. Built offline by Monte Carlo.
+# A cell describes a starting hand class, not the exact combo held, so the tools still
+# enumerate the equity of specific hands (about a millisecond heads-up on the flop);
+# the single-player analyzer shows the class average beside its flop analysis.
+#
+# File layout (little-endian):
+#   header  8-byte magic, then uint32 flops, uint32 starting hands, uint32 samples per cell
+#   index   int16[22100]: flop id of every raw flop, by its colex rank (a perfect hash)
+#   equity  uint16[flops, 169]: equity * 65534, 65535 where the flop blocks every combo (e.g. 22 on 222)
+FLOP_DB_MAGIC = b"PKFLOP1\0"
+FLOP_DB_PATH = os.environ.get("POKER_FLOP_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "flopEquity.bin"))
+FLOP_DB_SAMPLES = 2000
+FLOP_DB_TASK_FLOPS = 8  # flops per worker task
+EQUITY_SCALE = 65534
+NO_EQUITY = 65535
+RAW_FLOPS = comb(52, 3)
+
+# Colex rank of three distinct cards: a dense, collision-free slot in [0, 22100)
+def flop_slot(flop):
+    a, b, c = sorted(flop)
+    return comb(a, 1) + comb(b, 2) + comb(c, 3)
+
+# Smallest suit relabelling of a flop, the representative of its isomorphism class
+def canonical_flop(flop):
+    return min(tuple(sorted(c & ~3 | perm[c & 3] for c in flop)) for perm in permutations(range(4)))
+
+# The 1,755 canonical flops and the flop id of every raw flop
+def build_flop_index():
+    flops = sorted({canonical_flop(flop) for flop in combinations(range(52), 3)})
+    flop_ids = {flop: i for i, flop in enumerate(flops)}
+    slots = np.zeros(RAW_FLOPS, dtype=np.int16)
+    for flop in combinations(range(52), 3):
+        slots[flop_slot(flop)] = flop_ids[canonical_flop(flop)]
+    return flops, slots
+
+# Every two-card combo of each starting hand that doesn't touch the flop: {grid index: (M, 2)}
+def class_combos(flop):
+    combos = np.array([combo for combo in combinations(range(52), 2) if not set(combo) & set(flop)], dtype=np.int64)
+    classes = starting_hand_index(combos[:, 0], combos[:, 1])
+    return {index: combos[classes == index] for index in range(STARTING_HANDS)}
+
+# Equity of all 169 starting hands on one flop against a random hand, by sampling.
+# Hands with no combo left on the flop get NaN.
+def flop_equities(flop, samples=FLOP_DB_SAMPLES, seed=0):
+    rng = np.random.default_rng([seed, *flop])
+    deck = np.array([c for c in range(52) if c not in flop], dtype=np.int64)
+    combos = class_combos(flop)
+    possible = [index for index in range(STARTING_HANDS) if len(combos[index])]
+
+    # A random combo of each hand per sample, then opponent, turn and river from the rest
+    heroes = np.concatenate([combos[index][rng.integers(len(combos[index]), size=samples)] for index in possible])
+    shuffled = rng.permuted(np.tile(deck, (len(heroes), 1)), axis=1)[:, :6]
+    used = (shuffled[:, :, None] == heroes[:, None, :]).any(axis=2)
+    dealt = np.take_along_axis(shuffled, np.argsort(used, axis=1, kind="stable")[:, :4], axis=1)
+
+    board = np.hstack([np.broadcast_to(np.array(flop, dtype=np.int64), (len(heroes), 3)), dealt[:, 2:]])
+    ours = evaluate_batch(np.hstack([heroes, board]))
+    theirs = evaluate_batch(np.hstack([dealt[:, :2], board]))
+    shares = (ours > theirs) + (ours == theirs) / 2
+    equity = np.full(STARTING_HANDS, np.nan)
+    equity[possible] = shares.reshape(len(possible), samples).mean(axis=1)
+    return equity
+
+# Worker task for the builder: equities of flops [start, stop), written into the shared table
+def fill_flop_equities(spec, start, stop, samples, seed):
+    with attached_arrays(spec) as arrays:
+        for i in range(start, stop):
+            arrays["equity"][i] = flop_equities(tuple(int(c) for c in arrays["flops"][i]), samples, seed)
+    return stop - start
+
+def write_flop_db(path, slots, equity, samples):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(FLOP_DB_MAGIC)
+        f.write(np.array([equity.shape[0], equity.shape[1], samples], dtype="<u4").tobytes())
+        f.write(slots.astype("<i2").tobytes())
+        f.write(np.where(np.isnan(equity), NO_EQUITY, np.round(np.nan_to_num(equity) * EQUITY_SCALE)).astype("<u2").tobytes())
+    os.replace(tmp_path, path)
+
+# Memory-mapped index and equity table, or None when the database hasn't been built
+@lru_cache(maxsize=4)
+def load_flop_db(path=FLOP_DB_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        if f.read(len(FLOP_DB_MAGIC)) != FLOP_DB_MAGIC:
+            raise ValueError(f"{path} is not a flop equity database")
+        num_flops, num_hands, samples = np.frombuffer(f.read(12), dtype="<u4")
+    offset = len(FLOP_DB_MAGIC) + 12
+    slots = np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(RAW_FLOPS,))
+    equity = np.memmap(path, dtype="<u2", mode="r", offset=offset + RAW_FLOPS * 2, shape=(int(num_flops), int(num_hands)))
+    return {"slots": slots, "equity": equity, "samples": int(samples)}
+
+# Average equity of the starting hand of `hole` on this flop against a random hand,
+# or None without a database. Two table reads, no enumeration.
+def flop_equity(hole, flop, path=FLOP_DB_PATH):
+    db = load_flop_db(path)
+    if db is None:
+        return None
+    flop_id = db["slots"][flop_slot(flop)]
+    hand = int(starting_hand_index(np.int64(hole[0]), np.int64(hole[1])))
+    value = db["equity"][flop_id, hand]
+    return None if value == NO_EQUITY else value / EQUITY_SCALE
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the flop-texture equity database.")
+    parser.add_argument("--output", default=FLOP_DB_PATH)
+    parser.add_argument("--samples", type=int, default=FLOP_DB_SAMPLES, help="samples per starting hand per flop")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    flops, slots = build_flop_index()
+    started = time.perf_counter()
+    done = [0]
+
+    def report(flops_done):
+        done[0] += flops_done
+        if done[0] % 100 < flops_done:
+            print(f"{done[0]}/{len(flops)} flops, {done[0] / (time.perf_counter() - started):.1f} flops/s")
+
+    # Workers read the flops from and write their equity rows into shared memory.
+    # The segments are created before the pool so forked workers share their tracker.
+    with SharedArrays() as shared:
+        shared.share("flops", np.array(flops, dtype=np.int64))
+        equity = shared.create("equity", (len(flops), STARTING_HANDS), np.float64)
+        tasks = [(start, min(start + FLOP_DB_TASK_FLOPS, len(flops)), args.samples, args.seed)
+                 for start in range(0, len(flops), FLOP_DB_TASK_FLOPS)]
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            run_tasks(pool, fill_flop_equities, shared.spec(), tasks, report)
+        write_flop_db(args.output, slots, equity, args.samples)
+        del equity
+    print(f"Wrote {args.output}: {len(flops)} flops x {STARTING_HANDS} hands, {args.samples} samples per cell")
+
+if __name__ == "__main__":
+    main()
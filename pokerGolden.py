@@ -0,0 +1,457 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+from pokerBackends import EVALUATOR_BACKENDS, best_five
+from pokerEvaluator import RANK_INDEX, VARIANTS, variant_ranks, int_to_card, describe_strength
+from pokerParallel import SharedArrays, attached_arrays, run_tasks
+
+# Golden showdown corpus: generated showdowns with the expected strength, best five
+# cards and winners of every seat. The expected values come from golden_hand below:
+# the category and kicker rules written out again over all seven cards, sharing no
+# code with the backends it checks (not even the reference, which scores 5-card
+# subsets), so a bug in any backend shows up as a disagreement. Half the showdowns
+# are random, half built around edge cases the faster evaluators could get wrong.
+# The differential runner scores the whole corpus with each backend in large
+# batches and reports every disagreement.
+#
+# File (compressed .npz, NO_CARD / -1 for empty seats):
+#   version          [GOLDEN_VERSION, seed]
+#   expected_source  what worked out the expected values (GOLDEN_SOURCE)
+#   variant_names
+#   variants   uint8[N]            index into variant_names
+#   boards     uint8[N, 5]
+#   holes      uint8[N, seats, 2]
+#   strengths  int32[N, seats]     expected strength of each seat
+#   best_five  uint8[N, seats, 5]  expected best five cards, sorted
+#   winners    uint8[N]            bit per winning seat
+#   tags       uint16[N]           edge-case flags, 0 for random showdowns
+GOLDEN_PATH = os.environ.get("POKER_GOLDEN_CORPUS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldenShowdowns.npz"))
+GOLDEN_VERSION = 2
+GOLDEN_SOURCE = "pokerGolden.golden_hand: 7-card category and kicker rules, independent of pokerBackends"
+GOLDEN_SHOWDOWNS = 100000
+GOLDEN_SEATS = 6
+GOLDEN_EDGE_SHARE = 0.5
+GOLDEN_SHORTDECK_SHARE = 0.25
+GOLDEN_TASK_SHOWDOWNS = 500  # showdowns per worker task
+CHECK_CHUNK = 200000  # hands per backend call when checking
+MISMATCH_EXAMPLES = 5
+NO_CARD = 255
+VARIANT_NAMES = list(VARIANTS)
+FIVE_OF_SEVEN = np.array(list(combinations(range(7), 5)), dtype=np.int64)
+
+# Edge cases, as bit flags so one showdown can be looked up by what it tests
+WHEEL = 1  # ace-low straight (A-6-7-8-9 in short deck)
+STRAIGHT_OVER_WHEEL = 2  # wheel cards plus the next rank: the higher straight plays
+COUNTERFEITED_TWO_PAIR = 4  # both hole cards pair the board, which holds a higher pair
+TRIPS_TWO_PAIR = 8  # full house from trips and the higher of two pairs
+TWO_TRIPS = 16  # full house from two sets of trips
+QUADS_KICKER = 32  # quads beside trips or a pair: the best other rank kicks
+BIG_FLUSH = 64  # six or seven suited cards: only the top five play
+STRAIGHT_FLUSH_OVER_FLUSH = 128  # straight flush plus a higher card of its suit
+FLUSH_AND_STRAIGHT = 256  # a flush and a straight in different cards
+BOARD_PLAYS = 512  # a broadway board nobody can beat without a flush: split pots
+
+TAG_NAMES = {
+    WHEEL: "Wheel",
+    STRAIGHT_OVER_WHEEL: "Straight over wheel",
+    COUNTERFEITED_TWO_PAIR: "Counterfeited two pair",
+    TRIPS_TWO_PAIR: "Trips plus two pair",
+    TWO_TRIPS: "Two trips",
+    QUADS_KICKER: "Quads kicker",
+    BIG_FLUSH: "Six or seven card flush",
+    STRAIGHT_FLUSH_OVER_FLUSH: "Straight flush over flush",
+    FLUSH_AND_STRAIGHT: "Flush and straight",
+    BOARD_PLAYS: "Board plays",
+}
+
+# Each edge case gives seven (rank, suit or None) specs: hero's two hole cards, then the board.
+# `ranks` are the variant's rank indices, lowest first.
+def _shuffled(rng, specs):
+    specs = list(specs)
+    rng.shuffle(specs)
+    return specs
+
+def _distinct(rng, ranks, k, exclude=()):
+    return rng.sample([r for r in ranks if r not in exclude], k)
+
+def wheel_specs(rng, ranks):
+    wheel = [12] + ranks[:4]
+    return _shuffled(rng, [(r, None) for r in wheel + [rng.choice(ranks[5:]) for _ in range(2)]])
+
+def straight_over_wheel_specs(rng, ranks):
+    return _shuffled(rng, [(r, None) for r in [12] + ranks[:5] + [rng.choice(ranks)]])
+
+def counterfeited_two_pair_specs(rng, ranks):
+    high, a, b = sorted(_distinct(rng, ranks[2:], 3), reverse=True)
+    single = _distinct(rng, ranks, 1, (high, a, b))[0]
+    return [(a, None), (b, None)] + _shuffled(rng, [(high, None), (high, None), (a, None), (b, None), (single, None)])
+
+def trips_two_pair_specs(rng, ranks):
+    t, p, q = _distinct(rng, ranks, 3)
+    return _shuffled(rng, [(r, None) for r in [t, t, t, p, p, q, q]])
+
+def two_trips_specs(rng, ranks):
+    t, u, s = _distinct(rng, ranks, 3)
+    return _shuffled(rng, [(r, None) for r in [t, t, t, u, u, u, s]])
+
+def quads_kicker_specs(rng, ranks):
+    q, t, s = _distinct(rng, ranks, 3)
+    rest = [t, t, t] if rng.random() < 0.5 else [t, t, s]
+    return _shuffled(rng, [(r, None) for r in [q] * 4 + rest])
+
+def big_flush_specs(rng, ranks):
+    suit = rng.randrange(4)
+    size = rng.choice((6, 7))
+    specs = [(r, suit) for r in _distinct(rng, ranks, size)]
+    return _shuffled(rng, specs + [(rng.choice(ranks), None)] * (7 - size))
+
+def straight_flush_over_flush_specs(rng, ranks):
+    suit = rng.randrange(4)
+    low = rng.randrange(len(ranks) - 6)
+    window = ranks[low:low + 5]
+    higher = rng.choice(ranks[low + 6:])
+    return _shuffled(rng, [(r, suit) for r in window + [higher]] + [(rng.choice(ranks), None)])
+
+def flush_and_straight_specs(rng, ranks):
+    suit = rng.randrange(4)
+    low = rng.randrange(len(ranks) - 4)
+    window = ranks[low:low + 5]
+    others = [s for s in range(4) if s != suit]
+    suited = set(rng.sample(range(5), 3))
+    specs = [(r, suit if i in suited else rng.choice(others)) for i, r in enumerate(window)]
+    return _shuffled(rng, specs + [(r, suit) for r in _distinct(rng, ranks, 2, window)])
+
+def board_plays_specs(rng, ranks):
+    board = _shuffled(rng, [(r, None) for r in ranks[-5:]])
+    return [(r, None) for r in _distinct(rng, ranks[:-5], 2)] + board
+
+EDGE_CASES = {
+    WHEEL: wheel_specs,
+    STRAIGHT_OVER_WHEEL: straight_over_wheel_specs,
+    COUNTERFEITED_TWO_PAIR: counterfeited_two_pair_specs,
+    TRIPS_TWO_PAIR: trips_two_pair_specs,
+    TWO_TRIPS: two_trips_specs,
+    QUADS_KICKER: quads_kicker_specs,
+    BIG_FLUSH: big_flush_specs,
+    STRAIGHT_FLUSH_OVER_FLUSH: straight_flush_over_flush_specs,
+    FLUSH_AND_STRAIGHT: flush_and_straight_specs,
+    BOARD_PLAYS: board_plays_specs,
+}
+
+# Cards for (rank, suit or None) specs from the cards not yet used, a random free suit for None
+def place_specs(rng, specs, used):
+    cards = []
+    for rank, suit in specs:
+        if suit is None:
+            suit = rng.choice([s for s in range(4) if rank * 4 + s not in used])
+        card = rank * 4 + suit
+        if card in used:
+            return None
+        used.add(card)
+        cards.append(card)
+    return cards
+
+# One showdown: (variant index, board, holes by seat with None for empty seats, tag)
+def generate_showdown(rng):
+    variant = "shortdeck" if rng.random() < GOLDEN_SHORTDECK_SHARE else "standard"
+    ranks = [RANK_INDEX[r] for r in variant_ranks(variant)]
+    deck = [r * 4 + s for r in ranks for s in range(4)]
+    seats = rng.randint(2, GOLDEN_SEATS)
+    tag = 0
+    hero = board = None
+    used = set()
+    if rng.random() < GOLDEN_EDGE_SHARE:
+        tag = rng.choice(list(EDGE_CASES))
+        cards = place_specs(rng, EDGE_CASES[tag](rng, ranks), used)
+        while cards is None:  # a spec asked for a card already placed
+            used = set()
+            cards = place_specs(rng, EDGE_CASES[tag](rng, ranks), used)
+        hero, board = cards[:2], cards[2:]
+    rest = [c for c in deck if c not in used]
+    rng.shuffle(rest)
+    if board is None:
+        board = rest[:5]
+        rest = rest[5:]
+    holes = [rest[2 * i:2 * i + 2] for i in range(seats)]
+    if hero is not None:
+        holes[rng.randrange(seats)] = hero
+    holes += [None] * (GOLDEN_SEATS - seats)
+    return VARIANT_NAMES.index(variant), board, holes, tag
+
+# The rules the expected values follow, per variant: the categories from worst to best
+# (0 high card ... 9 royal flush) and the ranks a straight runs through, ace low first
+GOLDEN_RULES = {
+    "standard": ([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [12, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]),
+    "shortdeck": ([0, 1, 2, 3, 4, 6, 5, 7, 8, 9], [12, 4, 5, 6, 7, 8, 9, 10, 11, 12]),
+}
+
+# Highest straight among a set of ranks: (its top rank, its five ranks), or None
+def golden_straight(ranks, run):
+    for top in range(len(run) - 1, 3, -1):
+        window = run[top - 4:top + 1]
+        if all(r in ranks for r in window):
+            return run[top], window
+    return None
+
+# Best hand of 5-7 cards: (strength, the five cards sorted). Every category the cards
+# make is listed with its deciding ranks and cards, and the best one under the
+# variant's order wins. Strengths use the evaluators' encoding (category place << 20,
+# then the deciding ranks a nibble each) so they compare directly.
+def golden_hand(cards, variant="standard"):
+    order, run = GOLDEN_RULES[variant]
+    by_rank, by_suit = {}, {}
+    for card in sorted(cards, reverse=True):
+        by_rank.setdefault(card >> 2, []).append(card)
+        by_suit.setdefault(card & 3, []).append(card)
+    ranks = sorted(by_rank, reverse=True)
+    quads = [r for r in ranks if len(by_rank[r]) == 4]
+    trips = [r for r in ranks if len(by_rank[r]) == 3]
+    pairs = [r for r in ranks if len(by_rank[r]) == 2]
+
+    def kickers(used, k):
+        return [r for r in ranks if r not in used][:k]
+
+    made = []  # (category, deciding ranks, five cards)
+    for suited in by_suit.values():
+        if len(suited) >= 5:
+            straight = golden_straight({c >> 2 for c in suited}, run)
+            if straight:
+                high, window = straight
+                made.append((9 if high == 12 else 8, [high], [c for c in suited if c >> 2 in window]))
+            made.append((5, [c >> 2 for c in suited[:5]], suited[:5]))
+    straight = golden_straight(set(ranks), run)
+    if straight:
+        made.append((4, [straight[0]], [by_rank[r][0] for r in straight[1]]))
+    if quads:
+        kicker = kickers(quads[:1], 1)
+        made.append((7, quads[:1] + kicker, by_rank[quads[0]] + [by_rank[r][0] for r in kicker]))
+    if trips and len(trips) + len(pairs) >= 2:
+        pair = max(trips[1:] + pairs)
+        made.append((6, [trips[0], pair], by_rank[trips[0]] + by_rank[pair][:2]))
+    if trips:
+        kicker = kickers(trips[:1], 2)
+        made.append((3, trips[:1] + kicker, by_rank[trips[0]] + [by_rank[r][0] for r in kicker]))
+    if len(pairs) >= 2:
+        kicker = kickers(pairs[:2], 1)
+        made.append((2, pairs[:2] + kicker, by_rank[pairs[0]] + by_rank[pairs[1]] + [by_rank[r][0] for r in kicker]))
+    if pairs:
+        kicker = kickers(pairs[:1], 3)
+        made.append((1, pairs[:1] + kicker, by_rank[pairs[0]] + [by_rank[r][0] for r in kicker]))
+    made.append((0, ranks[:5], [by_rank[r][0] for r in ranks[:5]]))
+
+    best = None
+    for category, deciding, five in made:
+        if len(five) != 5:  # too few cards left for the kickers
+            continue
+        strength = order.index(category) << 20
+        for i, r in enumerate(deciding):
+            strength |= r << (16 - 4 * i)
+        if best is None or strength > best[0]:
+            best = (strength, sorted(five))
+    return best
+
+# Worker task for the builder: expected strengths and best fives of showdowns [start, stop)
+def fill_expected(spec, start, stop):
+    with attached_arrays(spec) as arrays:
+        for i in range(start, stop):
+            variant = VARIANT_NAMES[arrays["variants"][i]]
+            board = arrays["boards"][i].tolist()
+            for seat, hole in enumerate(arrays["holes"][i].tolist()):
+                if hole[0] != NO_CARD:
+                    strength, five = golden_hand(hole + board, variant)
+                    arrays["strengths"][i, seat] = strength
+                    arrays["best_five"][i, seat] = five
+    return stop - start
+
+# Bit per seat holding the best strength of its row; empty seats are -1
+def winner_bits(strengths):
+    best = strengths.max(axis=1, keepdims=True)
+    return ((strengths == best) << np.arange(strengths.shape[1])).sum(axis=1)
+
+def build_corpus(count=GOLDEN_SHOWDOWNS, seed=0, workers=None, progress=None):
+    rng = random.Random(seed)
+    showdowns = [generate_showdown(rng) for _ in range(count)]
+    with SharedArrays() as shared:
+        shared.share("variants", np.array([s[0] for s in showdowns], dtype=np.uint8))
+        shared.share("boards", np.array([s[1] for s in showdowns], dtype=np.uint8))
+        shared.share("holes", np.array([[hole or [NO_CARD, NO_CARD] for hole in s[2]] for s in showdowns], dtype=np.uint8))
+        strengths = shared.create("strengths", (count, GOLDEN_SEATS), np.int32)
+        strengths[...] = -1
+        best = shared.create("best_five", (count, GOLDEN_SEATS, 5), np.uint8)
+        best[...] = NO_CARD
+        tasks = [(start, min(start + GOLDEN_TASK_SHOWDOWNS, count)) for start in range(0, count, GOLDEN_TASK_SHOWDOWNS)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            run_tasks(pool, fill_expected, shared.spec(), tasks, progress)
+        corpus = {name: np.array(shared[name]) for name in ("variants", "boards", "holes", "strengths", "best_five")}
+        del strengths, best
+    corpus["winners"] = winner_bits(corpus["strengths"]).astype(np.uint8)
+    corpus["tags"] = np.array([s[3] for s in showdowns], dtype=np.uint16)
+    return corpus
+
+def write_corpus(path, corpus, seed):
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, version=np.array([GOLDEN_VERSION, seed]), expected_source=np.array(GOLDEN_SOURCE),
+                        variant_names=np.array(VARIANT_NAMES), **corpus)
+    os.replace(tmp_path, path)
+
+def load_corpus(path=GOLDEN_PATH):
+    with np.load(path) as data:
+        if int(data["version"][0]) != GOLDEN_VERSION:
+            raise ValueError(f"{path} is corpus version {int(data['version'][0])}, expected {GOLDEN_VERSION}")
+        if list(data["variant_names"]) != VARIANT_NAMES:
+            raise ValueError(f"{path} was built for variants {list(data['variant_names'])}")
+        return {name: data[name] for name in data.files}
+
+# Every seated hand of the corpus: showdown row, seat, (M, 7) cards, variant index, expected strength and best five
+def seated_hands(corpus):
+    rows, seats = np.nonzero(corpus["holes"][:, :, 0] != NO_CARD)
+    hands = np.hstack([corpus["holes"][rows, seats], corpus["boards"][rows]]).astype(np.int64)
+    return {
+        "rows": rows,
+        "seats": seats,
+        "hands": hands,
+        "variants": corpus["variants"][rows],
+        "expected": corpus["strengths"][rows, seats].astype(np.int64),
+        "best_five": corpus["best_five"][rows, seats].astype(np.int64),
+    }
+
+# Strengths of (M, k) hands with one backend, each hand under its own variant, in chunks
+def backend_strengths(evaluate, hands, variants):
+    out = np.zeros(len(hands), dtype=np.int64)
+    for index, variant in enumerate(VARIANT_NAMES):
+        where = np.flatnonzero(variants == index)
+        for start in range(0, len(where), CHECK_CHUNK):
+            chunk = where[start:start + CHECK_CHUNK]
+            out[chunk] = evaluate(hands[chunk], variant)
+    return out
+
+# Strength of the best five-card subset of each 7-card hand, scored by the backend
+def backend_subset_strengths(evaluate, hands, variants):
+    fives = hands[:, FIVE_OF_SEVEN].reshape(-1, 5)
+    return backend_strengths(evaluate, fives, np.repeat(variants, len(FIVE_OF_SEVEN))).reshape(-1, len(FIVE_OF_SEVEN)).max(axis=1)
+
+# Check one backend against the corpus. Four checks, each hand scored in batches:
+#   strengths  the 7-card strength of every seat
+#   best_five  the strength of every stored best five (the 5-card path)
+#   subsets    the best of the 21 five-card subsets, as best_five() picks it
+#   winners    the winning seats of every showdown
+# Returns mismatching hand (or showdown) indices per check and hands scored per minute.
+def check_backend(name, corpus, seated=None, subsets=True):
+    seated = seated or seated_hands(corpus)
+    evaluate = EVALUATOR_BACKENDS[name]
+    started = time.perf_counter()
+    strengths = backend_strengths(evaluate, seated["hands"], seated["variants"])
+    fives = backend_strengths(evaluate, seated["best_five"], seated["variants"])
+    mismatches = {
+        "strengths": np.flatnonzero(strengths != seated["expected"]),
+        "best_five": np.flatnonzero(fives != seated["expected"]),
+    }
+    scored = 2 * len(strengths)
+    if subsets:
+        subset_best = backend_subset_strengths(evaluate, seated["hands"], seated["variants"])
+        mismatches["subsets"] = np.flatnonzero(subset_best != seated["expected"])
+        scored += len(FIVE_OF_SEVEN) * len(strengths)
+    by_seat = np.full(corpus["strengths"].shape, -1, dtype=np.int64)
+    by_seat[seated["rows"], seated["seats"]] = strengths
+    mismatches["winners"] = np.flatnonzero(winner_bits(by_seat) != corpus["winners"])
+    elapsed = time.perf_counter() - started
+    return {"mismatches": mismatches, "hands": scored, "seconds": elapsed, "hands_per_minute": scored / elapsed * 60}
+
+# best_five() as the apps call it, on a sample: strength as expected, five of the hand's own cards
+def check_best_five_calls(corpus, seated, sample, seed=0):
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(seated["hands"]), size=min(sample, len(seated["hands"])), replace=False)
+    bad = []
+    for i in picks.tolist():
+        cards = seated["hands"][i].tolist()
+        variant = VARIANT_NAMES[seated["variants"][i]]
+        strength, five = best_five(cards, variant)
+        if strength != seated["expected"][i] or not set(five) <= set(cards) or golden_hand(five, variant)[0] != strength:
+            bad.append(i)
+    return np.array(bad, dtype=np.int64), len(picks)
+
+# Mismatch counts by edge case, e.g. {"Wheel": 3, "Random": 1}
+def mismatches_by_tag(tags):
+    counts = {}
+    for tag in tags.tolist():
+        label = TAG_NAMES.get(tag, "Random")
+        counts[label] = counts.get(label, 0) + 1
+    return counts
+
+def describe_hand(cards):
+    return " ".join(f"{rank}{suit[0]}" for rank, suit in (int_to_card(c) for c in cards))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the golden showdown corpus or check evaluator backends against it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="generate the corpus with the golden rules")
+    build.add_argument("--output", default=GOLDEN_PATH)
+    build.add_argument("--showdowns", type=int, default=GOLDEN_SHOWDOWNS)
+    build.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    build.add_argument("--seed", type=int, default=0)
+    check = commands.add_parser("check", help="check evaluator backends against the corpus")
+    check.add_argument("--corpus", default=GOLDEN_PATH)
+    check.add_argument("--backends", nargs="+", default=list(EVALUATOR_BACKENDS), choices=list(EVALUATOR_BACKENDS))
+    check.add_argument("--limit", type=int, default=None, help="check only the first N showdowns")
+    check.add_argument("--no-subsets", action="store_true", help="skip the 21-subset best-five check")
+    check.add_argument("--sample", type=int, default=1000, help="hands to run through best_five() one at a time")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.perf_counter()
+        done = [0]
+
+        def report(showdowns_done):
+            done[0] += showdowns_done
+            if done[0] % 10000 < showdowns_done:
+                print(f"{done[0]}/{args.showdowns} showdowns, {done[0] / (time.perf_counter() - started):.0f} showdowns/s")
+
+        corpus = build_corpus(args.showdowns, args.seed, args.workers, report)
+        write_corpus(args.output, corpus, args.seed)
+        edge = mismatches_by_tag(corpus["tags"])
+        print(f"Wrote {args.output}: {args.showdowns} showdowns, {int((corpus['holes'][:, :, 0] != NO_CARD).sum())} hands, "
+              f"{os.path.getsize(args.output) / 2**20:.1f} MB")
+        print("  " + ", ".join(f"{label} {n}" for label, n in sorted(edge.items())))
+        return
+
+    corpus = load_corpus(args.corpus)
+    if args.limit:
+        corpus = {name: values[:args.limit] if values.ndim and name not in ("version", "variant_names") else values
+                  for name, values in corpus.items()}
+    seated = seated_hands(corpus)
+    print(f"{len(corpus['boards'])} showdowns, {len(seated['hands'])} hands from {args.corpus}")
+    print(f"  expected values: {corpus['expected_source']}")
+    failed = False
+    for name in args.backends:
+        result = check_backend(name, corpus, seated, subsets=not args.no_subsets)
+        mismatches = result["mismatches"]
+        status = "ok" if not any(len(bad) for bad in mismatches.values()) else "MISMATCH"
+        failed = failed or status != "ok"
+        print(f"  {name:<10} {status:<8} {result['hands'] / 1e6:.1f}M hands in {result['seconds']:.1f}s "
+              f"({result['hands_per_minute'] / 1e6:.1f}M hands/min)")
+        for check_name, bad in mismatches.items():
+            if len(bad):
+                rows = bad if check_name == "winners" else seated["rows"][bad]
+                print(f"    {check_name}: {len(bad)} wrong; by case {mismatches_by_tag(corpus['tags'][rows])}")
+                for i in bad[:MISMATCH_EXAMPLES].tolist():
+                    if check_name == "winners":
+                        print(f"      showdown {i}: board {describe_hand(corpus['boards'][i])}")
+                    else:
+                        variant = VARIANT_NAMES[seated["variants"][i]]
+                        print(f"      {describe_hand(seated['hands'][i])} ({variant}): expected "
+                              f"{describe_strength(seated['expected'][i], variant)}")
+    if args.sample:
+        bad, checked = check_best_five_calls(corpus, seated, args.sample)
+        failed = failed or len(bad) > 0
+        print(f"  best_five() {'ok' if not len(bad) else f'{len(bad)} wrong'} on {checked} sampled hands")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
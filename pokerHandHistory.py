@@ -0,0 +1,217 @@
+import argparse
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pokerBackends import evaluate_hands, describe_selection
+from pokerDraws import DRAW_NAMES, classify_draws_batch
+from pokerEvaluator import evaluate_omaha_batch, GAME_HOLE_CARDS, GAME_VARIANTS
+from pokerExport import ColumnWriter
+
+# Parser for PokerStars-style text hand histories.
+# The file is memory-mapped and scanned for hand headers, so only one hand at a time
+# is decoded into a Python string. Byte ranges can be parsed in separate processes;
+# a range owns every hand whose header starts inside it.
+HAND_MARKER = b"PokerStars Hand #"
+PARSE_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Hands are stored column-wise with int cards (rank * 4 + suit) and -1 for no card
+MAX_SEATS = 10
+MAX_HOLE_CARDS = 4
+GAME_CODES = {"holdem": 0, "omaha": 1, "shortdeck": 2}
+GAME_NAMES = {code: game for game, code in GAME_CODES.items()}
+UNSUPPORTED_GAME = -1
+
+# Outcome of checking the recorded winners against the evaluator
+UNCHECKED = 0
+WINNERS_MATCH = 1
+WINNERS_MISMATCH = 2
+
+# Hand history cards are written like "Ah", "Td", "9c"
+HH_RANKS = "23456789TJQKA"
+HH_SUITS = "hdcs"  # Same order as SUITS: Hearts, Diamonds, Clubs, Spades
+
+HEADER_RE = re.compile(r"^PokerStars Hand #(\d+):(.*)$", re.M)
+SEAT_RE = re.compile(r"^Seat (\d+): (.+?) \(\S+ in chips", re.M)
+DEALT_RE = re.compile(r"^Dealt to (.+?) \[([^\]]+)\]", re.M)
+SHOWN_RE = re.compile(r"^Seat (\d+): .*? (?:showed|mucked) \[([^\]]+)\]", re.M)
+COLLECTED_RE = re.compile(r"^(.+?) collected \S+ from (main pot|side pot(?:-\d+)?|pot)", re.M)
+BOARD_RE = re.compile(r"^Board \[([^\]]+)\]", re.M)
+
+# Convert "Ah Kd" into int cards
+def parse_cards(text):
+    return [HH_RANKS.index(card[0]) * 4 + HH_SUITS.index(card[1]) for card in text.split()]
+
+# Game code from the text after the hand number, e.g. " Hold'em No Limit ($0.01/$0.02 USD) - ..."
+def parse_game(header):
+    if "Hi/Lo" in header:
+        return UNSUPPORTED_GAME
+    if "6+ Hold'em" in header:
+        return GAME_CODES["shortdeck"]
+    if "Hold'em" in header:
+        return GAME_CODES["holdem"]
+    if "Omaha" in header:
+        return GAME_CODES["omaha"]
+    return UNSUPPORTED_GAME
+
+# Empty column arrays for n hands
+def empty_hands(n):
+    return {
+        "hand_id": np.zeros(n, dtype=np.int64),
+        "game": np.full(n, UNSUPPORTED_GAME, dtype=np.int8),
+        "board": np.full((n, 5), -1, dtype=np.int8),
+        "holes": np.full((n, MAX_SEATS, MAX_HOLE_CARDS), -1, dtype=np.int8),
+        "shown": np.zeros((n, MAX_SEATS), dtype=bool),
+        "winners": np.zeros((n, MAX_SEATS), dtype=bool),
+        "strength": np.full((n, MAX_SEATS), -1, dtype=np.int64),
+        "flop_draws": np.zeros((n, MAX_SEATS), dtype=np.uint8),
+        "status": np.zeros(n, dtype=np.int8),
+    }
+
+# Fill row i of the columns from one hand's text. Winners are the players who
+# collected the main pot (or the only pot); side pots are not checked.
+def parse_hand(text, hands, i):
+    header = HEADER_RE.search(text)
+    if header is None:
+        return
+    hands["hand_id"][i] = int(header.group(1))
+    hands["game"][i] = parse_game(header.group(2))
+
+    seats = {name: int(seat) - 1 for seat, name in SEAT_RE.findall(text)}
+    for name, cards in DEALT_RE.findall(text):
+        if name in seats:
+            hole = parse_cards(cards)
+            hands["holes"][i, seats[name], :len(hole)] = hole
+    for seat, cards in SHOWN_RE.findall(text):
+        hole = parse_cards(cards)
+        hands["holes"][i, int(seat) - 1, :len(hole)] = hole
+        hands["shown"][i, int(seat) - 1] = True
+
+    # Run-it-twice hands have several boards and pots; leave them unchecked
+    boards = BOARD_RE.findall(text)
+    if len(boards) == 1:
+        board = parse_cards(boards[0])
+        hands["board"][i, :len(board)] = board
+    else:
+        hands["game"][i] = UNSUPPORTED_GAME
+
+    collected = COLLECTED_RE.findall(text)
+    main_pot = "main pot" if any(pot == "main pot" for _, pot in collected) else "pot"
+    for name, pot in collected:
+        if pot == main_pot and name in seats:
+            hands["winners"][i, seats[name]] = True
+
+# Byte offset of the first hand header at or after start
+def next_hand_start(mm, start):
+    position = mm.find(HAND_MARKER, start)
+    return len(mm) if position < 0 else position
+
+# Parse every hand whose header starts in [start, end) of the file
+def parse_range(path, start, end):
+    starts = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return empty_hands(0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = next_hand_start(mm, start)
+            while position < end and position < len(mm):
+                starts.append(position)
+                position = next_hand_start(mm, position + len(HAND_MARKER))
+            bounds = starts + [position]
+            hands = empty_hands(len(starts))
+            for i in range(len(starts)):
+                parse_hand(mm[bounds[i]:bounds[i + 1]].decode("utf-8", errors="replace"), hands, i)
+    verify_winners(hands)
+    label_flop_draws(hands)
+    return hands
+
+# Compare recorded main-pot winners with the best hands among the cards shown at showdown
+def verify_winners(hands):
+    checkable = (hands["board"][:, 4] >= 0) & (hands["shown"].sum(axis=1) >= 2) & hands["winners"].any(axis=1)
+    for game, code in GAME_CODES.items():
+        rows = np.flatnonzero(checkable & (hands["game"] == code))
+        if len(rows) == 0:
+            continue
+        hole_count = GAME_HOLE_CARDS[game]
+        strengths = np.full((len(rows), MAX_SEATS), -1, dtype=np.int64)
+        hand_rows, seats = np.nonzero(hands["shown"][rows])
+        holes = hands["holes"][rows[hand_rows], seats, :hole_count].astype(np.int64)
+        boards = hands["board"][rows[hand_rows]].astype(np.int64)
+        if game == "omaha":
+            strengths[hand_rows, seats] = evaluate_omaha_batch(holes, boards, GAME_VARIANTS[game])
+        else:
+            strengths[hand_rows, seats] = evaluate_hands(np.hstack([holes, boards]), GAME_VARIANTS[game])
+        hands["strength"][rows] = strengths
+        predicted = strengths == strengths.max(axis=1, keepdims=True)
+        matches = (predicted == hands["winners"][rows]).all(axis=1)
+        hands["status"][rows] = np.where(matches, WINNERS_MATCH, WINNERS_MISMATCH)
+    return hands
+
+# Draw flags (see pokerDraws) of every known Hold'em and short deck hand on the flop
+def label_flop_draws(hands):
+    for game in ("holdem", "shortdeck"):
+        hand_rows, seats = np.nonzero((hands["game"] == GAME_CODES[game])[:, None]
+                                      & (hands["board"][:, 2] >= 0)[:, None] & (hands["holes"][:, :, 0] >= 0))
+        holes = hands["holes"][hand_rows, seats, :2].astype(np.int64)
+        flops = hands["board"][hand_rows, :3].astype(np.int64)
+        hands["flop_draws"][hand_rows, seats] = classify_draws_batch(holes, flops, GAME_VARIANTS[game])
+    return hands
+
+# Join column dicts from several ranges
+def concat_hands(parts):
+    return {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+
+# Parse a file in byte ranges across worker processes, yielding each range's hands in file order
+def iter_parse_file(path, workers=None, chunk_bytes=PARSE_CHUNK_BYTES):
+    size = os.path.getsize(path)
+    ranges = [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+    if workers == 1 or len(ranges) == 1:
+        for start, end in ranges:
+            yield parse_range(path, start, end)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(parse_range, [path] * len(ranges), *zip(*ranges))
+
+# Parse a whole file into one set of columns
+def parse_file(path, workers=None, chunk_bytes=PARSE_CHUNK_BYTES):
+    return concat_hands(list(iter_parse_file(path, workers, chunk_bytes)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a hand history file and check the recorded showdown winners.")
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-mb", type=int, default=PARSE_CHUNK_BYTES // (1024 * 1024), help="bytes per parse range, in MB")
+    parser.add_argument("--export", help="directory to write the parsed columns to (see pokerExport)")
+    args = parser.parse_args()
+
+    # Chosen before the workers start, so they inherit the calibration
+    print(f"Evaluator backends: {'; '.join(describe_selection())}")
+    started = time.perf_counter()
+    writer = ColumnWriter(args.export) if args.export else None
+    hand_ids, statuses = [], []
+    draw_counts = dict.fromkeys(DRAW_NAMES, 0)
+    for part in iter_parse_file(args.path, args.workers, args.chunk_mb * 1024 * 1024):
+        if writer:
+            writer.append(**part)
+        hand_ids.append(part["hand_id"])
+        statuses.append(part["status"])
+        for flag in draw_counts:
+            draw_counts[flag] += int((part["flop_draws"] & flag != 0).sum())
+    if writer:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    status = np.concatenate(statuses)
+    print(f"{len(status)} hands in {elapsed:.2f}s ({len(status) / max(elapsed, 1e-9):,.0f} hands/s)")
+    print(f"{(status == WINNERS_MATCH).sum()} showdowns match, {(status == WINNERS_MISMATCH).sum()} mismatch, "
+          f"{(status == UNCHECKED).sum()} not checked")
+    for hand_id in np.concatenate(hand_ids)[status == WINNERS_MISMATCH][:20]:
+        print(f"  mismatch: hand #{hand_id}")
+    print("Flop draws among known hands: " + ", ".join(f"{DRAW_NAMES[flag].lower()} {count}" for flag, count in draw_counts.items()))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from collections import Counter
-import itertools
-import random
+from pokerCache import card_state_key, session_memo, shared_memo, canonical_card, restore_card
+from pokerRender import render_card, card_fragment, inject_css, rerun_fragment
+from pokerBackends import best_five
+from pokerEvaluator import cards_to_ints, int_to_card, strength_category, category_rank, describe_strength, variant_ranks, variant_deck
+from pokerEquity import hand_strength_potential, effective_hand_strength, board_index, rank_against_board
+from pokerSimulator import starting_hand_index, starting_hand_label
+from pokerPreflop import preflop_equity_grid
+from pokerFlopDb import flop_equity
+from pokerDraws import classify_draws, draw_names
 
 # Set page title and configuration
 
@@ -31,173 +37,53 @@ HAND_RANKINGS = {
     0: "High Card"
 }
 
-# Define hand rankings for sorting
-HAND_RANKING_VALUES = {v: k for k, v in HAND_RANKINGS.items()}
+# Games offered by the analyzer and the rule variant each one plays
+GAMES = {"Texas Hold'em": "standard", "Short Deck (6+)": "shortdeck"}
+VARIANT_GAMES = {"standard": "holdem", "shortdeck": "shortdeck"}
 
-# Function to calculate hand values (unchanged)
-def evaluate_hand(cards):
-    # [Keeping the original evaluate_hand function as it is]
+# Opponent counts shown in the effective hand strength table
+MAX_OPPONENTS = 9
+
+# Seconds between preflop chart refreshes while cells are computed in the background
+PREFLOP_REFRESH_SECONDS = 1.0
+
+# Function to calculate hand values with the evaluator backend chosen for the workload (see pokerBackends)
+def evaluate_hand(cards, variant="standard"):
     if len(cards) < 5:
         return 0, "Not enough cards", []
-    
-    ranks = [c[0] for c in cards]
-    suits = [c[1] for c in cards]
-    rank_values = [RANK_VALUES[r] for r in ranks]
-    rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
-    
-    # Check for flush
-    is_flush = max(suit_counts.values()) >= 5
-    flush_suit = max(suit_counts.items(), key=lambda x: x[1])[0] if is_flush else None
-    
-    # Check for straight
-    sorted_values = sorted(set(rank_values))
-    is_straight = False
-    straight_high = None
-    
-    # Handle Ace low straight
-    if set([0, 1, 2, 3, 12]).issubset(set(rank_values)):
-        is_straight = True
-        straight_high = 3  # 5 high
-    
-    # Check normal straights
-    for i in range(len(sorted_values) - 4):
-        if sorted_values[i:i+5] == list(range(sorted_values[i], sorted_values[i] + 5)):
-            is_straight = True
-            straight_high = sorted_values[i+4]
-    
-    # Get best 5 card combination
-    best_hand = []
-    
-    # Royal Flush
-    if is_flush and is_straight and 12 in rank_values and straight_high == 12:
-        return 9, "Royal Flush", [c for c in cards if c[1] == flush_suit and RANK_VALUES[c[0]] >= 8][:5]
-    
-    # Straight Flush
-    if is_flush and is_straight:
-        flush_cards = [c for c in cards if c[1] == flush_suit]
-        flush_values = [RANK_VALUES[c[0]] for c in flush_cards]
-        # Check for A-5 straight flush
-        if set([0, 1, 2, 3, 12]).issubset(set(flush_values)):
-            return 8, "Straight Flush (5 high)", sorted([c for c in flush_cards if RANK_VALUES[c[0]] in [0, 1, 2, 3, 12]], 
-                                                       key=lambda x: (RANK_VALUES[x[0]] if RANK_VALUES[x[0]] != 12 else -1))
-        
-        # Check normal straight flushes
-        straight_flush_cards = []
-        for i in range(len(sorted(flush_values)) - 4):
-            if sorted(flush_values)[i:i+5] == list(range(sorted(flush_values)[i], sorted(flush_values)[i] + 5)):
-                straight_flush_cards = [c for c in flush_cards if RANK_VALUES[c[0]] in range(sorted(flush_values)[i], sorted(flush_values)[i] + 5)]
-                return 8, f"Straight Flush ({RANKS[sorted(flush_values)[i+4]]} high)", straight_flush_cards
+    strength, best_five_cards = best_five(cards_to_ints(cards), variant)
+    return strength_category(strength, variant), describe_strength(strength, variant), [int_to_card(c) for c in best_five_cards]
 
-    # Four of a Kind
-    if 4 in rank_counts.values():
-        quads_rank = [r for r, count in rank_counts.items() if count == 4][0]
-        quads = [c for c in cards if c[0] == quads_rank]
-        kickers = [c for c in cards if c[0] != quads_rank]
-        kickers.sort(key=lambda x: RANK_VALUES[x[0]], reverse=True)
-        return 7, f"Four of a Kind ({quads_rank}s)", quads + [kickers[0]]
-    
-    # Full House
-    if 3 in rank_counts.values() and 2 in rank_counts.values():
-        trips_rank = [r for r, count in rank_counts.items() if count == 3][0]
-        pair_ranks = [r for r, count in rank_counts.items() if count == 2]
-        trips = [c for c in cards if c[0] == trips_rank]
-        pairs = [c for c in cards if c[0] == pair_ranks[0]]
-        return 6, f"Full House ({trips_rank}s over {pair_ranks[0]}s)", trips + pairs[:2]
-    
-    # Check for trips with two pairs
-    if 3 in rank_counts.values() and len([r for r, count in rank_counts.items() if count == 2]) >= 2:
-        trips_rank = [r for r, count in rank_counts.items() if count == 3][0]
-        pair_ranks = [r for r, count in rank_counts.items() if count == 2]
-        pair_ranks.sort(key=lambda x: RANK_VALUES[x], reverse=True)
-        trips = [c for c in cards if c[0] == trips_rank]
-        best_pair = [c for c in cards if c[0] == pair_ranks[0]]
-        return 6, f"Full House ({trips_rank}s over {pair_ranks[0]}s)", trips + best_pair[:2]
-    
-    # Flush
-    if is_flush:
-        flush_cards = [c for c in cards if c[1] == flush_suit]
-        flush_cards.sort(key=lambda x: RANK_VALUES[x[0]], reverse=True)
-        return 5, f"Flush ({flush_cards[0][0]} high)", flush_cards[:5]
-    
-    # Straight
-    if is_straight:
-        if set([0, 1, 2, 3, 12]).issubset(set(rank_values)):
-            # A-5 straight
-            return 4, "Straight (5 high)", sorted([c for c in cards if RANK_VALUES[c[0]] in [0, 1, 2, 3, 12]], 
-                                                key=lambda x: (RANK_VALUES[x[0]] if RANK_VALUES[x[0]] != 12 else -1))
-        else:
-            # Normal straight
-            high_rank = RANKS[straight_high]
-            straight_cards = []
-            needed_values = list(range(straight_high - 4, straight_high + 1))
-            for val in needed_values:
-                for card in cards:
-                    if RANK_VALUES[card[0]] == val and card not in straight_cards:
-                        straight_cards.append(card)
-                        break
-            return 4, f"Straight ({high_rank} high)", straight_cards
-    
-    # Three of a Kind
-    if 3 in rank_counts.values():
-        trips_rank = [r for r, count in rank_counts.items() if count == 3][0]
-        trips = [c for c in cards if c[0] == trips_rank]
-        kickers = [c for c in cards if c[0] != trips_rank]
-        kickers.sort(key=lambda x: RANK_VALUES[x[0]], reverse=True)
-        return 3, f"Three of a Kind ({trips_rank}s)", trips + kickers[:2]
-    
-    # Two Pair
-    if len([r for r, count in rank_counts.items() if count >= 2]) >= 2:
-        pair_ranks = [r for r, count in rank_counts.items() if count >= 2]
-        pair_ranks.sort(key=lambda x: RANK_VALUES[x], reverse=True)
-        first_pair = [c for c in cards if c[0] == pair_ranks[0]]
-        second_pair = [c for c in cards if c[0] == pair_ranks[1]]
-        kickers = [c for c in cards if c[0] not in [pair_ranks[0], pair_ranks[1]]]
-        kickers.sort(key=lambda x: RANK_VALUES[x[0]], reverse=True)
-        return 2, f"Two Pair ({pair_ranks[0]}s and {pair_ranks[1]}s)", first_pair[:2] + second_pair[:2] + [kickers[0]]
-    
-    # One Pair
-    if 2 in rank_counts.values():
-        pair_rank = [r for r, count in rank_counts.items() if count == 2][0]
-        pair = [c for c in cards if c[0] == pair_rank]
-        kickers = [c for c in cards if c[0] != pair_rank]
-        kickers.sort(key=lambda x: RANK_VALUES[x[0]], reverse=True)
-        return 1, f"One Pair ({pair_rank}s)", pair + kickers[:3]
-    
-    # High Card
-    cards_sorted = sorted(cards, key=lambda x: RANK_VALUES[x[0]], reverse=True)
-    return 0, f"High Card ({cards_sorted[0][0]})", cards_sorted[:5]
-
-# Function to find helpful cards (unchanged)
-def find_helpful_cards(hole_cards, community_cards):
-    # [Keeping the original find_helpful_cards function as it is]
+# Function to find helpful cards
+def find_helpful_cards(hole_cards, community_cards, variant="standard"):
     combined_cards = hole_cards + community_cards
     
     # Current hand value
-    current_value, current_name, _ = evaluate_hand(combined_cards)
+    current_value, current_name, _ = evaluate_hand(combined_cards, variant)
     
     # Remaining cards in the deck
-    remaining_cards = [card for card in DECK if card not in combined_cards]
+    deck = DECK if variant == "standard" else [int_to_card(c) for c in variant_deck(variant)]
+    remaining_cards = [card for card in deck if card not in combined_cards]
     
-    # Dictionary to store helpful cards by improvement
+    # Dictionary to store helpful cards by improvement, keyed by (category, hand name)
     helpful_cards = {}
     
     # Check each possible next card
     for next_card in remaining_cards:
         new_community = community_cards + [next_card]
         new_hand = hole_cards + new_community
-        new_value, new_name, _ = evaluate_hand(new_hand)
+        new_value, new_name, _ = evaluate_hand(new_hand, variant)
         
-        # If the hand improves
-        if new_value > current_value:
-            if new_name not in helpful_cards:
-                helpful_cards[new_name] = []
-            helpful_cards[new_name].append(next_card)
+        # If the hand improves (categories compare by the variant's ranking)
+        if category_rank(new_value, variant) > category_rank(current_value, variant):
+            if (new_value, new_name) not in helpful_cards:
+                helpful_cards[(new_value, new_name)] = []
+            helpful_cards[(new_value, new_name)].append(next_card)
     
     return helpful_cards, current_value, current_name
 
 # Improved card selection function
-def card_selector(key_prefix, selected_cards=[]):
+def card_selector(key_prefix, selected_cards=[], ranks=RANKS):
     # Create a visual card selection grid
     st.write("Select a card:")
     
@@ -208,62 +94,131 @@ def card_selector(key_prefix, selected_cards=[]):
     
     for i, suit in enumerate(SUITS):
         with suit_tabs[i]:
-            cols = st.columns(7)  # 13 ranks, but we'll use 2 rows to make it more compact
-            
-            # First row (2-8)
-            for j, rank in enumerate(RANKS[:7]):
-                card = (rank, suit)
-                disabled = card in selected_cards
-                
-                # Use a colored button with rank display
-                if cols[j].button(
-                    f"{rank}", 
-                    key=f"{key_prefix}_{suit}_{rank}",
-                    disabled=disabled,
-                    use_container_width=True,
-                    type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
-                ):
-                    selected_card = card
-            
-            # Second row (9-A)
-            cols2 = st.columns(7)
-            col_offset = 0
-            for j, rank in enumerate(RANKS[7:], 7):
-                card = (rank, suit)
-                disabled = card in selected_cards
-                
-                if cols2[j-7].button(
-                    f"{rank}", 
-                    key=f"{key_prefix}_{suit}_{rank}",
-                    disabled=disabled,
-                    use_container_width=True,
-                    type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
-                ):
-                    selected_card = card
+            # Rows of 7 ranks to keep the grid compact (2-8 and 9-A for a full deck)
+            for row_start in range(0, len(ranks), 7):
+                cols = st.columns(7)
+                for j, rank in enumerate(ranks[row_start:row_start + 7]):
+                    card = (rank, suit)
+                    disabled = card in selected_cards
+                    
+                    # Use a colored button with rank display
+                    if cols[j].button(
+                        f"{rank}", 
+                        key=f"{key_prefix}_{suit}_{rank}",
+                        disabled=disabled,
+                        use_container_width=True,
+                        type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
+                    ):
+                        selected_card = card
     
     return selected_card
 
-# Function to render a card with responsive design
-def render_card(rank, suit, width=80, height=120, font_size_rank=20, font_size_suit=36, margin_top=15):
-    card_color = SUIT_COLORS[suit]
+# Function to build the HTML for a list of cards in the analysis section
+def render_analysis_cards(cards, mobile_view):
+    if mobile_view:
+        return "".join(f'<div class="card-wrapper">{card_fragment(card, "mobile")}</div>' for card in cards)
+    return "".join(card_fragment(card) for card in cards)
+
+# Function to rank helpful card groups and build their card HTML
+def build_helpful_hand_data(helpful_cards, remaining_cards_count, mobile_view, variant="standard"):
+    hand_data = []
+    for (category, hand_name), cards in helpful_cards.items():
+        # Calculate ranking value
+        hand_rank = category_rank(category, variant)
+        
+        # Calculate probability
+        probability = (len(cards) / remaining_cards_count) * 100
+        
+        # Group cards by rank (highest first) with suits sorted for consistency
+        display_cards = sorted(cards, key=lambda card: (-RANK_VALUES[card[0]], card[1]))
+        
+        hand_data.append({
+            'hand_name': hand_name,
+            'cards': cards,
+            'rank': hand_rank,
+            'probability': probability,
+            'card_count': len(cards),
+            'html': render_analysis_cards(display_cards, mobile_view)
+        })
+    return hand_data
+
+# Hand strength, potential and EHS against 1-9 random opponents, shared across sessions by suit pattern
+def get_hand_strength(player_cards, community_cards, variant="standard"):
+    game = VARIANT_GAMES[variant]
+    potential, _ = shared_memo(f"hand_strength_{game}", [cards_to_ints(player_cards)], cards_to_ints(community_cards),
+                               lambda holes, board: hand_strength_potential(holes[0], board, game))
+    ehs_data = []
+    for num_opponents in range(1, MAX_OPPONENTS + 1):
+        ehs_data.append({
+            "Opponents": num_opponents,
+            "Hand Strength": f"{potential['hs'] ** num_opponents * 100:.1f}%",
+            "Effective Hand Strength": f"{effective_hand_strength(potential, num_opponents) * 100:.1f}%",
+        })
+    return potential, pd.DataFrame(ehs_data)
+
+# Opponent holdings that beat, tie or lose to the player's hand. The sorted strength index
+# is cached per board (by suit pattern), so changing hole cards only costs a binary search.
+def get_what_beats_me(player_cards, community_cards, variant="standard"):
+    game = VARIANT_GAMES[variant]
+    board = cards_to_ints(community_cards)
+    index, perm = shared_memo(f"board_index_{game}", [], board, lambda holes, canonical_board: board_index(canonical_board, game))
+    ranking = rank_against_board(index, [canonical_card(c, perm) for c in cards_to_ints(player_cards)],
+                                 [canonical_card(c, perm) for c in board], game)
     
-    # Make cards responsive using percentage and viewport units with min/max constraints
-    return f"""
-    <div style="width:{width}px;height:{height}px;border:1px solid black;border-radius:10px;padding:5px;text-align:center;background:white;display:inline-block;margin:5px;
-                min-width:40px;max-width:100%;box-sizing:border-box;">
-        <div style="font-size:{font_size_rank}px;color:{card_color};">{rank}{SUIT_SYMBOLS[suit]}</div>
-        <div style="font-size:{font_size_suit}px;margin-top:{margin_top}px;color:{card_color};">{SUIT_SYMBOLS[suit]}</div>
-    </div>
-    """
+    # Group the beating holdings by hand category, best category first
+    beating_groups = {}
+    for combo, strength in zip(ranking["beating_combos"], ranking["beating_strengths"]):
+        hand_type = HAND_RANKINGS[strength_category(strength, variant)]
+        cards = [int_to_card(restore_card(int(c), perm)) for c in combo]
+        beating_groups.setdefault(hand_type, []).append(" ".join(f"{rank}{SUIT_SYMBOLS[suit]}" for rank, suit in cards))
+    return ranking["beats_me"], ranking["ties"], ranking["i_beat"], beating_groups
+
+# Function to render the 13x13 preflop grid: pairs on the diagonal, suited hands above it.
+# Cells are colored by equity relative to a fair share of the pot; the player's hand is outlined.
+def render_preflop_grid(equity, num_opponents, ranks, highlight=None):
+    rank_indexes = [RANK_VALUES[rank] for rank in reversed(ranks)]
+    html = '<table style="border-collapse:collapse;text-align:center;font-size:12px;margin-bottom:10px;">'
+    for row in rank_indexes:
+        html += '<tr>'
+        for col in rank_indexes:
+            index = max(row, col) * 13 + min(row, col) if col <= row else min(row, col) * 13 + max(row, col)
+            label = starting_hand_label(index)
+            border = "3px solid #4169e1" if index == highlight else "1px solid #ddd"
+            if index not in equity:
+                # Still being computed in the background
+                html += f'<td style="padding:3px 5px;border:{border};background:#eee;color:#aaa;">{label}<br>…</td>'
+            else:
+                relative = min(equity[index] * (num_opponents + 1) / 2, 1)
+                red = int(230 - 150 * relative)
+                green = int(90 + 140 * relative)
+                html += (f'<td style="padding:3px 5px;border:{border};background:rgb({red},{green},110);color:white;">'
+                         f'{label}<br>{equity[index]*100:.0f}%</td>')
+        html += '</tr>'
+    html += '</table>'
+    return html
 
-# Function to display a card placeholder with "+" for adding a card
-def render_card_placeholder(width=80, height=120, font_size=36):
-    return f"""
-    <div style="width:{width}px;height:{height}px;border:1px dashed #ccc;border-radius:10px;padding:5px;text-align:center;background:#f8f8f8;display:inline-block;margin:5px;
-                min-width:40px;max-width:100%;box-sizing:border-box;cursor:pointer;">
-        <div style="font-size:{font_size}px;color:#aaa;line-height:{height}px;">+</div>
-    </div>
-    """
+# Grid index of the player's starting hand, or None without two hole cards
+def player_starting_hand(player_cards):
+    if len(player_cards) != 2:
+        return None
+    first, second = cards_to_ints(player_cards)
+    return int(starting_hand_index(np.int64(first), np.int64(second)))
+
+# Preflop chart body. While cells are pending it runs as a fragment that refreshes itself;
+# once everything is known it reruns the app so the refresh timer is dropped.
+def preflop_panel(player_cards, variant, refreshing=False):
+    game = VARIANT_GAMES[variant]
+    num_opponents = st.session_state.preflop_opponents
+    highlight = player_starting_hand(player_cards)
+    
+    equity, pending = preflop_equity_grid(num_opponents, game, first=highlight)
+    st.markdown(render_preflop_grid(equity, num_opponents, variant_ranks(variant), highlight), unsafe_allow_html=True)
+    if highlight in equity:
+        st.write(f"**{starting_hand_label(highlight)}:** {equity[highlight]*100:.1f}% equity against {num_opponents} random {'opponent' if num_opponents == 1 else 'opponents'}")
+    if pending:
+        st.caption(f"Computing {pending} more starting hands in the background...")
+    elif refreshing:
+        st.rerun()
 
 # Detect if we're on a mobile device
 def is_mobile():
@@ -274,137 +229,32 @@ def is_mobile():
     except:
         # Default to desktop if we can't detect
         return False
-def run():
-    # Add custom CSS for responsiveness
-    st.markdown("""
-    <style>
-        /* Responsive containers */
-        .responsive-container {
-            display: flex;
-            flex-wrap: wrap;
-            justify-content: flex-start;
-            align-items: flex-start;
-        }
-        
-        .card-container {
-            display: flex;
-            flex-wrap: wrap;
-            justify-content: center;
-        }
-        
-        /* Card selection grid */
-        .card-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(60px, 1fr));
-            gap: 5px;
-        }
-        
-        .card-button {
-            width: 100%;
-            aspect-ratio: 2/3;
-            padding: 0;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            align-items: center;
-        }
-        
-        /* Ensure select boxes don't overflow on mobile */
-        .stSelectbox {
-            max-width: 100%;
-            overflow: hidden;
-        }
-        
-        /* Mobile-specific styles */
-        @media (max-width: 768px) {
-            .mobile-full-width {
-                width: 100% !important;
-                flex-basis: 100% !important;
-                max-width: 100% !important;
-            }
-            
-            .mobile-centered {
-                text-align: center;
-            }
-            
-            .mobile-smaller-text {
-                font-size: 0.9rem !important;
-            }
-            
-            /* Make cards wrap appropriately on mobile */
-            .card-wrapper {
-                display: inline-block;
-                width: 45%;
-                margin: 2%;
-            }
-        }
-        
-        /* Custom styling for the tabs */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            height: 40px;
-            white-space: pre-wrap;
-            background-color: #f0f2f6;
-            border-radius: 4px;
-            padding: 8px 16px;
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background-color: #e3e7ed;
-            font-weight: bold;
-        }
-        
-        /* Card placeholder hover effect */
-        .card-placeholder:hover {
-            background-color: #f0f0f0;
-            border-color: #999;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # Streamlit app layout
-    st.title("Single Player Poker Hand Analyzer")
-
-    # Sidebar for configuration
-    st.sidebar.header("Game Settings")
-    num_community = st.sidebar.slider("Number of Community Cards", 0, 5, 3)
-
-    # Flag for mobile detection
-    mobile_view = is_mobile()
-
-    # Initialize session state to track selected cards
-    if 'community_cards' not in st.session_state:
-        st.session_state.community_cards = []
-    if 'player_cards' not in st.session_state:
-        st.session_state.player_cards = []
-    if 'editing_card' not in st.session_state:
-        st.session_state.editing_card = None
-
-    # Function to add a card to a specific location
-    def add_card_at_index(card_type, index, card):
-        if card_type == "community":
-            # Ensure the list is long enough
-            while len(st.session_state.community_cards) <= index:
-                st.session_state.community_cards.append(None)
-            st.session_state.community_cards[index] = card
-        else:  # player
-            # Ensure the list is long enough
-            while len(st.session_state.player_cards) <= index:
-                st.session_state.player_cards.append(None)
-            st.session_state.player_cards[index] = card
+# Function to add a card to a specific location
+def add_card_at_index(card_type, index, card):
+    if card_type == "community":
+        # Ensure the list is long enough
+        while len(st.session_state.community_cards) <= index:
+            st.session_state.community_cards.append(None)
+        st.session_state.community_cards[index] = card
+    else:  # player
+        # Ensure the list is long enough
+        while len(st.session_state.player_cards) <= index:
+            st.session_state.player_cards.append(None)
+        st.session_state.player_cards[index] = card
 
-    # Function to remove a card
-    def remove_card(card_type, index):
-        if card_type == "community":
-            if index < len(st.session_state.community_cards):
-                st.session_state.community_cards[index] = None
-        else:  # player
-            if index < len(st.session_state.player_cards):
-                st.session_state.player_cards[index] = None
+# Function to remove a card
+def remove_card(card_type, index):
+    if card_type == "community":
+        if index < len(st.session_state.community_cards):
+            st.session_state.community_cards[index] = None
+    else:  # player
+        if index < len(st.session_state.player_cards):
+            st.session_state.player_cards[index] = None
 
+# Card table: community and hole card slots, swapped for the card picker while editing.
+# Runs as a fragment so opening the picker or cancelling only redraws the table.
+@st.fragment
+def card_table(num_community, variant="standard"):
     # Community Cards - improved visual layout
     # st.header("Community Cards")
 
@@ -414,16 +264,16 @@ def run():
         already_selected = st.session_state.community_cards + st.session_state.player_cards
         already_selected = [card for card in already_selected if card is not None]
         
-        selected_card = card_selector(f"edit_{card_type}_{index}", already_selected)
+        selected_card = card_selector(f"edit_{card_type}_{index}", already_selected, ranks=variant_ranks(variant))
         
         if selected_card:
             add_card_at_index(card_type, index, selected_card)
             st.session_state.editing_card = None
-            st.rerun()  # Refresh the page
+            st.rerun()  # Cards changed, so refresh the analysis too
         
         if st.button("Cancel"):
             st.session_state.editing_card = None
-            st.rerun()
+            rerun_fragment()
     else:
         # Visual card display for community cards
         st.subheader("Community Cards")
@@ -441,79 +291,20 @@ def run():
                         rank, suit = st.session_state.community_cards[i]
                         st.markdown(render_card(rank, suit), unsafe_allow_html=True)
                         
-                        # Better button styling with CSS
-                        st.markdown("""
-                        <style>
-                        .button-row {
-                            display: flex;
-                            gap: 8px;
-                            margin-top: 5px;
-                        }
-                        .edit-btn, .remove-btn {
-                            flex: 1;
-                            text-align: center;
-                            padding: 3px 0;
-                            border-radius: 4px;
-                            font-size: 0.8em;
-                            cursor: pointer;
-                            transition: background-color 0.3s;
-                        }
-                        .edit-btn {
-                            background-color: #f0f2f6;
-                            border: 1px solid #ddd;
-                            color: #262730;
-                        }
-                        .remove-btn {
-                            background-color: #ff4b4b;
-                            border: 1px solid #ff4b4b;
-                            color: white;
-                        }
-                        .edit-btn:hover {
-                            background-color: #e6e9ef;
-                        }
-                        .remove-btn:hover {
-                            background-color: #ff3333;
-                        }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
-                        # Create a container for the buttons
-                        button_container = st.container()
-                        
                         # Use columns with better spacing
                         col1, col2 = st.columns([1, 1])
                         with col1:
                             if st.button("✏️ Edit", key=f"edit_comm_{i}", use_container_width=True):
                                 st.session_state.editing_card = ("community", i)
-                                st.rerun()
+                                rerun_fragment()
                         with col2:
                             if st.button("❌", key=f"remove_comm_{i}", use_container_width=True):
                                 remove_card("community", i)
                                 st.rerun()
                     else:
-                        # Display a placeholder "+" card with improved styling
-                        st.markdown("""
-                        <style>
-                        .add-card-btn {
-                            background-color: #f0f2f6;
-                            border: 1px dashed #ddd;
-                            border-radius: 8px;
-                            color: #262730;
-                            padding: 20px 0;
-                            text-align: center;
-                            cursor: pointer;
-                            margin-top: 10px;
-                            transition: background-color 0.3s;
-                        }
-                        .add-card-btn:hover {
-                            background-color: #e6e9ef;
-                        }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
                         if st.button("➕ Add Card", key=f"add_comm_{i}", use_container_width=True):
                             st.session_state.editing_card = ("community", i)
-                            st.rerun()
+                            rerun_fragment()
                 else:
                     st.markdown("##")
                     st.markdown("*No card*")
@@ -533,227 +324,190 @@ def run():
                     rank, suit = st.session_state.player_cards[i]
                     st.markdown(render_card(rank, suit), unsafe_allow_html=True)
                     
-                    # Better button styling with CSS
-                    st.markdown("""
-                    <style>
-                    .button-row {
-                        display: flex;
-                        gap: 8px;
-                        margin-top: 5px;
-                    }
-                    .edit-btn, .remove-btn {
-                        flex: 1;
-                        text-align: center;
-                        padding: 3px 0;
-                        border-radius: 4px;
-                        font-size: 0.8em;
-                        cursor: pointer;
-                        transition: background-color 0.3s;
-                    }
-                    .edit-btn {
-                        background-color: #f0f2f6;
-                        border: 1px solid #ddd;
-                        color: #262730;
-                    }
-                    .remove-btn {
-                        background-color: #ff4b4b;
-                        border: 1px solid #ff4b4b;
-                        color: white;
-                    }
-                    .edit-btn:hover {
-                        background-color: #e6e9ef;
-                    }
-                    .remove-btn:hover {
-                        background-color: #ff3333;
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # Create a container for the buttons
-                    button_container = st.container()
-                    
                     # Use columns with better spacing
                     col1, col2 = st.columns([1, 1])
                     with col1:
                         if st.button("✏️ Edit", key=f"edit_player_{i}", use_container_width=True):
                             st.session_state.editing_card = ("player", i)
-                            st.rerun()
+                            rerun_fragment()
                     with col2:
                         if st.button("❌", key=f"remove_player_{i}", use_container_width=True):
                             remove_card("player", i)
                             st.rerun()
                 else:
-                    # Display a placeholder "+" card with improved styling
-                    st.markdown("""
-                    <style>
-                    .add-card-btn {
-                        background-color: #f0f2f6;
-                        border: 1px dashed #ddd;
-                        border-radius: 8px;
-                        color: #262730;
-                        padding: 20px 0;
-                        text-align: center;
-                        cursor: pointer;
-                        margin-top: 10px;
-                        transition: background-color 0.3s;
-                    }
-                    .add-card-btn:hover {
-                        background-color: #e6e9ef;
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
                     if st.button("➕ Add Card", key=f"add_player_{i}", use_container_width=True):
                         st.session_state.editing_card = ("player", i)
-                        st.rerun()
+                        rerun_fragment()
+
+# Analysis panel: runs as a fragment so changing the sort order doesn't rerun the app
+@st.fragment
+def analysis_panel(num_community, mobile_view, variant="standard"):
+    # Clean up community cards list to remove None values
+    community_cards = [card for card in st.session_state.community_cards if card is not None]
+    player_cards = [card for card in st.session_state.player_cards if card is not None]
+    
+    all_cards = community_cards + player_cards
+    deck_size = len(variant_deck(variant))
+    
+    # Check for duplicate cards
+    if len(all_cards) != len(set(all_cards)):
+        st.error("Duplicate cards detected! Please choose different cards.")
+    elif all_cards:  # Only analyze if we have cards
+        # Analyze hand
+        st.header("Hand Analysis")
         
-        # Clean up community cards list to remove None values
-        community_cards = [card for card in st.session_state.community_cards if card is not None]
-        player_cards = [card for card in st.session_state.player_cards if card is not None]
+        # Current hand and helpful cards are memoized on the card state
+        analysis_key = card_state_key("Player Best Hand", player_cards, community_cards, 1, num_community, mobile_view, variant)
+        hand_value, hand_name, best_cards = session_memo("hand", analysis_key, lambda: evaluate_hand(player_cards + community_cards, variant))
+        st.subheader(f"Current Hand: {hand_name}")
         
-        all_cards = community_cards + player_cards
+        # Show best 5 cards if we have at least 5 cards
+        if best_cards:
+            st.markdown("**Best Five Cards:**")
+            
+            # Create a responsive container for cards
+            st.markdown('<div class="card-container">', unsafe_allow_html=True)
+            best_card_html = session_memo("best_card_html", analysis_key, lambda: render_analysis_cards(best_cards, mobile_view))
+            st.markdown(best_card_html, unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
         
-        # Check for duplicate cards
-        if len(all_cards) != len(set(all_cards)):
-            st.error("Duplicate cards detected! Please choose different cards.")
-        elif all_cards:  # Only analyze if we have cards
-            # Analyze hand
-            st.header("Hand Analysis")
+        # Strength against every possible opponent hand once the flop is out
+        if len(player_cards) == 2 and len(community_cards) >= 3:
+            st.header("Hand Strength")
             
-            # Current hand
-            hand_value, hand_name, best_cards = evaluate_hand(player_cards + community_cards)
-            st.subheader(f"Current Hand: {hand_name}")
+            potential, ehs_df = session_memo("hand_strength", analysis_key, lambda: get_hand_strength(player_cards, community_cards, variant))
+            total = potential["ahead"] + potential["tied"] + potential["behind"]
+            hs_col, ppot_col, npot_col = st.columns(3)
+            hs_col.metric("Hand Strength", f"{potential['hs'] * 100:.1f}%", help=f"Ahead of {potential['ahead']}, tied with {potential['tied']} and behind {potential['behind']} of {total} opponent hands")
+            ppot_col.metric("Positive Potential", f"{potential['ppot'] * 100:.1f}%", help="Chance of ending ahead by the river when behind or tied now")
+            npot_col.metric("Negative Potential", f"{potential['npot'] * 100:.1f}%", help="Chance of falling behind by the river when ahead or tied now")
             
-            # Show best 5 cards if we have at least 5 cards
-            if best_cards:
-                st.markdown("**Best Five Cards:**")
-                
-                # Create a responsive container for cards
-                st.markdown('<div class="card-container">', unsafe_allow_html=True)
-                best_card_html = ""
-                for card in best_cards:
-                    rank, suit = card
-                    card_width = 60 if mobile_view else 80
-                    card_height = 90 if mobile_view else 120
-                    font_size_rank = 16 if mobile_view else 20
-                    font_size_suit = 24 if mobile_view else 36
-                    margin_top = 10 if mobile_view else 15
-                    
-                    if mobile_view:
-                        best_card_html += f'<div class="card-wrapper">{render_card(rank, suit, width=card_width, height=card_height, font_size_rank=font_size_rank, font_size_suit=font_size_suit, margin_top=margin_top)}</div>'
-                    else:
-                        best_card_html += render_card(rank, suit, width=card_width, height=card_height, font_size_rank=font_size_rank, font_size_suit=font_size_suit, margin_top=margin_top)
-                        
-                st.markdown(best_card_html, unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown("**Effective Hand Strength by number of opponents:**")
+            st.dataframe(ehs_df, hide_index=True, use_container_width=True)
             
-            # Find and display helpful cards
-            if num_community < 5:
-                st.header("Potential Helpful Cards")
-                
-                helpful_cards, current_value, current_name = find_helpful_cards(player_cards, community_cards)
+            # Average for this starting hand on this flop, read from the flop database if it has been built
+            if variant == "standard" and len(community_cards) == 3:
+                texture_equity = flop_equity(cards_to_ints(player_cards), cards_to_ints(community_cards))
+                if texture_equity is not None:
+                    st.caption(f"Flop database: {starting_hand_label(player_starting_hand(player_cards))} averages "
+                               f"{texture_equity*100:.1f}% equity against a random hand on this flop.")
+            
+            st.header("What Beats Me")
+            
+            beats_me, ties, i_beat, beating_groups = session_memo("what_beats_me", analysis_key, lambda: get_what_beats_me(player_cards, community_cards, variant))
+            beats_col, ties_col, lose_col = st.columns(3)
+            beats_col.metric("Hands That Beat You", beats_me)
+            ties_col.metric("Hands That Tie", ties)
+            lose_col.metric("Hands You Beat", i_beat)
+            
+            for hand_type, combos in beating_groups.items():
+                with st.expander(f"{hand_type} - {len(combos)} combos"):
+                    st.write(", ".join(combos))
+        
+        # Find and display helpful cards
+        if num_community < 5:
+            st.header("Potential Helpful Cards")
+            
+            # Draws the hole cards make with the board (flop and turn only)
+            if len(player_cards) == 2 and 3 <= len(community_cards) <= 4:
+                draws = session_memo("draws", analysis_key, lambda: draw_names(classify_draws(cards_to_ints(player_cards), cards_to_ints(community_cards), variant)))
+                st.markdown(f"**Draws:** {', '.join(draws) if draws else 'None'}")
+            
+            helpful_cards, current_value, current_name = session_memo("helpful", analysis_key, lambda: find_helpful_cards(player_cards, community_cards, variant))
+            
+            # Sorting options
+            sort_options = ["Hand Ranking (Best to Worst)", "Probability (Highest to Lowest)"]
+            sort_method = st.radio("Sort potential hands by:", sort_options)
+            
+            if helpful_cards:
+                remaining_cards_count = deck_size - len(all_cards)
+                hand_data = session_memo("hand_data", analysis_key, lambda: build_helpful_hand_data(helpful_cards, remaining_cards_count, mobile_view, variant))
                 
-                # Sorting options
-                sort_options = ["Hand Ranking (Best to Worst)", "Probability (Highest to Lowest)"]
-                sort_method = st.radio("Sort potential hands by:", sort_options)
+                # Sort based on user choice
+                if sort_method == "Hand Ranking (Best to Worst)":
+                    sorted_hands = sorted(hand_data, key=lambda x: (x['rank'], x['probability']), reverse=True)
+                else:  # Probability
+                    sorted_hands = sorted(hand_data, key=lambda x: x['probability'], reverse=True)
                 
-                if helpful_cards:
-                    # Create a list to hold hand data for sorting
-                    hand_data = []
-                    remaining_cards_count = 52 - len(all_cards)
-                    
-                    for hand_name, cards in helpful_cards.items():
-                        # Calculate ranking value
-                        hand_type = hand_name.split(" (")[0]  # Extract hand type without high card info
-                        hand_rank = HAND_RANKING_VALUES.get(hand_type, 0)
-                        if not hand_rank and "Straight Flush" in hand_type:
-                            hand_rank = 8
-                        elif not hand_rank and "Flush" in hand_type:
-                            hand_rank = 5
-                        
-                        # Calculate probability
-                        probability = (len(cards) / remaining_cards_count) * 100
-                        
-                        # Add to data list
-                        hand_data.append({
-                            'hand_name': hand_name,
-                            'cards': cards,
-                            'rank': hand_rank,
-                            'probability': probability,
-                            'card_count': len(cards)
-                        })
+                # Display sorted hands
+                for hand_info in sorted_hands:
+                    hand_name = hand_info['hand_name']
+                    cards = hand_info['cards']
+                    probability = hand_info['probability']
                     
-                    # Sort based on user choice
-                    if sort_method == "Hand Ranking (Best to Worst)":
-                        sorted_hands = sorted(hand_data, key=lambda x: (x['rank'], x['probability']), reverse=True)
-                    else:  # Probability
-                        sorted_hands = sorted(hand_data, key=lambda x: x['probability'], reverse=True)
-                    
-                    # Display sorted hands
-                    for hand_info in sorted_hands:
-                        hand_name = hand_info['hand_name']
-                        cards = hand_info['cards']
-                        probability = hand_info['probability']
+                    with st.expander(f"{hand_name} - {len(cards)} possible cards ({probability:.2f}%)"):
+                        # Create a responsive container for cards
+                        st.markdown('<div class="card-container">', unsafe_allow_html=True)
+                        st.markdown(hand_info['html'], unsafe_allow_html=True)
+                        st.markdown('</div>', unsafe_allow_html=True)
                         
-                        with st.expander(f"{hand_name} - {len(cards)} possible cards ({probability:.2f}%)"):
-                            # Create a responsive container for cards
-                            st.markdown('<div class="card-container">', unsafe_allow_html=True)
-                            cards_html = ""
-                            
-                            # Group cards by rank for cleaner display
-                            cards_by_rank = {}
-                            for card in cards:
-                                rank, suit = card
-                                if rank not in cards_by_rank:
-                                    cards_by_rank[rank] = []
-                                cards_by_rank[rank].append(suit)
-                            
-                            # Sort ranks by value
-                            sorted_ranks = sorted(cards_by_rank.keys(), key=lambda r: RANK_VALUES[r], reverse=True)
-                            
-                            for rank in sorted_ranks:
-                                suits = cards_by_rank[rank]
-                                # Sort suits for consistency
-                                suits.sort()
-                                for suit in suits:
-                                    card_width = 60 if mobile_view else 80
-                                    card_height = 90 if mobile_view else 120
-                                    font_size_rank = 16 if mobile_view else 20
-                                    font_size_suit = 24 if mobile_view else 36
-                                    margin_top = 10 if mobile_view else 15
-                                    
-                                    if mobile_view:
-                                        cards_html += f'<div class="card-wrapper">{render_card(rank, suit, width=card_width, height=card_height, font_size_rank=font_size_rank, font_size_suit=font_size_suit, margin_top=margin_top)}</div>'
-                                    else:
-                                        cards_html += render_card(rank, suit, width=card_width, height=card_height, font_size_rank=font_size_rank, font_size_suit=font_size_suit, margin_top=margin_top)
-                            
-                            st.markdown(cards_html, unsafe_allow_html=True)
-                            st.markdown('</div>', unsafe_allow_html=True)
-                            
-                            # Show probability details
-                            st.markdown(f"**Probability:** {probability:.2f}% ({len(cards)} out of {remaining_cards_count} remaining cards)")
-                else:
-                    st.write("No cards in the deck will improve your current hand.")
+                        # Show probability details
+                        st.markdown(f"**Probability:** {probability:.2f}% ({len(cards)} out of {remaining_cards_count} remaining cards)")
+            else:
+                st.write("No cards in the deck will improve your current hand.")
+        
+        # Calculate outs and odds
+        if num_community < 5:
+            st.header("Outs and Odds")
             
-            # Calculate outs and odds
-            if num_community < 5:
-                st.header("Outs and Odds")
-                
-                total_outs = sum(len(cards) for cards in helpful_cards.values())
-                remaining_cards = 52 - len(all_cards)
-                
-                # Calculate probability based on remaining community cards
-                cards_to_come = 5 - num_community
-                
-                if cards_to_come == 1:
-                    probability = total_outs / remaining_cards
-                    st.write(f"**Total Outs:** {total_outs}")
-                    st.write(f"**Odds of Improving:** {probability*100:.2f}% (roughly {int(1/probability - 1) if probability > 0 else 'N/A'}-to-1)")
-                elif cards_to_come == 2:
-                    # Probability of hitting on either card
-                    probability = 1 - ((remaining_cards - total_outs) / remaining_cards) * ((remaining_cards - total_outs - 1) / (remaining_cards - 1))
-                    st.write(f"**Total Outs:** {total_outs}")
-                    st.write(f"**Odds of Improving:** {probability*100:.2f}% with 2 cards to come")
+            total_outs = sum(len(cards) for cards in helpful_cards.values())
+            remaining_cards = deck_size - len(all_cards)
+            
+            # Calculate probability based on remaining community cards
+            cards_to_come = 5 - num_community
+            
+            if cards_to_come == 1:
+                probability = total_outs / remaining_cards
+                st.write(f"**Total Outs:** {total_outs}")
+                st.write(f"**Odds of Improving:** {probability*100:.2f}% (roughly {int(1/probability - 1) if probability > 0 else 'N/A'}-to-1)")
+            elif cards_to_come == 2:
+                # Probability of hitting on either card
+                probability = 1 - ((remaining_cards - total_outs) / remaining_cards) * ((remaining_cards - total_outs - 1) / (remaining_cards - 1))
+                st.write(f"**Total Outs:** {total_outs}")
+                st.write(f"**Odds of Improving:** {probability*100:.2f}% with 2 cards to come")
+
+def run():
+    # Add custom CSS for responsiveness (once per page)
+    inject_css()
+
+    # Streamlit app layout
+    st.title("Single Player Poker Hand Analyzer")
+
+    # Sidebar for configuration
+    st.sidebar.header("Game Settings")
+    game_name = st.sidebar.selectbox("Game", list(GAMES), key="single_player_game")
+    variant = GAMES[game_name]
+    num_community = st.sidebar.slider("Number of Community Cards", 0, 5, 3)
+
+    # Flag for mobile detection
+    mobile_view = is_mobile()
+
+    # Initialize session state to track selected cards
+    if 'community_cards' not in st.session_state:
+        st.session_state.community_cards = []
+    if 'player_cards' not in st.session_state:
+        st.session_state.player_cards = []
+    if 'editing_card' not in st.session_state:
+        st.session_state.editing_card = None
+
+    # Switching to a smaller deck drops cards that aren't in it
+    deck = [int_to_card(c) for c in variant_deck(variant)]
+    st.session_state.community_cards = [card if card in deck else None for card in st.session_state.community_cards]
+    st.session_state.player_cards = [card if card in deck else None for card in st.session_state.player_cards]
+
+    card_table(num_community, variant)
+    analysis_panel(num_community, mobile_view, variant)
+
+    # Preflop equity chart for every starting hand, filled in as background workers finish
+    st.header("Preflop Equity Chart")
+    if st.toggle("Show preflop equity chart", key="show_preflop_chart"):
+        st.slider("Random opponents", 1, MAX_OPPONENTS, 1, key="preflop_opponents")
+        player_cards = [card for card in st.session_state.player_cards if card is not None]
+        _, pending = preflop_equity_grid(st.session_state.preflop_opponents, VARIANT_GAMES[variant], first=player_starting_hand(player_cards))
+        if pending:
+            st.fragment(preflop_panel, run_every=PREFLOP_REFRESH_SECONDS)(player_cards, variant, refreshing=True)
+        else:
+            preflop_panel(player_cards, variant)
 
     # Add hand rankings reference
     # with st.expander("Poker Hand Rankings Reference"):
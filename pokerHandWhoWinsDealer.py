@@ -1,7 +1,12 @@
 import streamlit as st
-import random
 from itertools import combinations
 import pandas as pd
+from functools import partial
+from pokerBackends import best_five, evaluate_hands
+from pokerEvaluator import cards_to_ints, int_to_card, strength_category, variant_ranks, variant_deck, GAME_HOLE_CARDS, GAME_VARIANTS
+from pokerEquity import find_outs, next_card_equity, exact_equity, all_in_ev, multi_board_equity
+from pokerRender import render_card, render_card_row, rerun_fragment
+from pokerCache import card_state_key, session_memo, shared_memo, restore_card
 
 # Define card constants
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -31,21 +36,53 @@ HAND_RANKS = {
     0: "High Card"
 }
 
+# Seats at the table. Hold'em could in theory seat 23 (2 * 23 + 5 = 51 cards)
+MAX_PLAYERS = 10
+
+# Chips each new player has in the pot until changed in the sidebar
+DEFAULT_CONTRIBUTION = 100
+
+# How many times the remaining board can be run after an all-in
+RUN_IT_OPTIONS = {1: "Once", 2: "Twice", 3: "Three Times"}
+
+# Selectable games and their engine names
+GAMES = {
+    "Texas Hold'em": "holdem",
+    "Pot-Limit Omaha": "omaha",
+    "Short Deck (6+)": "shortdeck"
+}
+
 # Initialize session state variables
 if 'num_players' not in st.session_state:
     st.session_state.num_players = 2
+if 'game' not in st.session_state:
+    st.session_state.game = "Texas Hold'em"
 if 'community_cards' not in st.session_state:
     st.session_state.community_cards = [None] * 5
 if 'player_cards' not in st.session_state:
-    st.session_state.player_cards = [None] * 10  # Max 5 players with 2 cards each
+    st.session_state.player_cards = [None] * (GAME_HOLE_CARDS[GAMES[st.session_state.game]] * st.session_state.num_players)  # Resized with the player count
 if 'editing_card' not in st.session_state:
     st.session_state.editing_card = None
 if 'results' not in st.session_state:
     st.session_state.results = None
+if 'outs' not in st.session_state:
+    st.session_state.outs = None
+if 'results_key' not in st.session_state:
+    st.session_state.results_key = None
+if 'results_community' not in st.session_state:
+    st.session_state.results_community = []
+if 'pots' not in st.session_state:
+    st.session_state.pots = None
+if 'contributions' not in st.session_state:
+    st.session_state.contributions = [DEFAULT_CONTRIBUTION] * st.session_state.num_players
 # Add player names to session state
 if 'player_names' not in st.session_state:
     st.session_state.player_names = ["Player 1", "Player 2"]
 
+# Number of hole cards each player holds in the selected game
+def hole_card_count():
+    return GAME_HOLE_CARDS[GAMES[st.session_state.game]]
+
 # Function to add a card to a specific location
 def add_card_at_index(card_type, index, card):
     if card_type == "community":
@@ -68,42 +105,33 @@ def remove_card(card_type, index):
         if index < len(st.session_state.player_cards):
             st.session_state.player_cards[index] = None
 
-# Function to render a card with responsive design
-def render_card(rank, suit, width=80, height=120, font_size_rank=20, font_size_suit=36, margin_top=15):
-    card_color = SUIT_COLORS[suit]
-    
-    # Make cards responsive using percentage and viewport units with min/max constraints
-    return f"""
-    <div style="width:{width}px;height:{height}px;border:1px solid black;border-radius:10px;padding:5px;text-align:center;background:white;display:inline-block;margin:5px;
-                min-width:40px;max-width:100%;box-sizing:border-box;">
-        <div style="font-size:{font_size_rank}px;color:{card_color};">{rank}{SUIT_SYMBOLS[suit]}</div>
-        <div style="font-size:{font_size_suit}px;margin-top:{margin_top}px;color:{card_color};">{SUIT_SYMBOLS[suit]}</div>
-    </div>
-    """
-
-# Function to display a card placeholder with "+" for adding a card
-def render_card_placeholder(width=80, height=120, font_size=36):
-    return f"""
-    <div style="width:{width}px;height:{height}px;border:1px dashed #ccc;border-radius:10px;padding:5px;text-align:center;background:#f8f8f8;display:inline-block;margin:5px;
-                min-width:40px;max-width:100%;box-sizing:border-box;cursor:pointer;">
-        <div style="font-size:{font_size}px;color:#aaa;line-height:{height}px;">+</div>
-    </div>
-    """
-
-# Function to render multiple cards in a row
-def render_card_row(cards, width=60, height=90):
-    html = '<div style="display:flex;flex-wrap:wrap;gap:5px;">'
-    for card in cards:
-        if card is not None:
-            rank, suit = card
-            html += render_card(rank, suit, width, height, 16, 28, 10)
-    html += '</div>'
+# Function to render a rank-by-suit heatmap of equity after each possible next card,
+# with a row for each rank in the game's deck
+def render_equity_heatmap(equity_by_card, ranks=RANKS):
+    html = '<table style="border-collapse:collapse;text-align:center;margin-bottom:10px;">'
+    html += '<tr><th style="padding:4px 8px;"></th>'
+    for suit in SUITS:
+        html += f'<th style="padding:4px 8px;color:{SUIT_COLORS[suit]};">{SUIT_SYMBOLS[suit]}</th>'
+    html += '</tr>'
+    for rank in reversed(ranks):
+        html += f'<tr><th style="padding:4px 8px;">{rank}</th>'
+        for suit in SUITS:
+            equity = equity_by_card.get((rank, suit))
+            if equity is None:
+                # Card is already on the table
+                html += '<td style="padding:4px 8px;border:1px solid #ddd;background:#eee;color:#aaa;">-</td>'
+            else:
+                red = int(230 - 150 * equity)
+                green = int(90 + 140 * equity)
+                html += f'<td style="padding:4px 8px;border:1px solid #ddd;background:rgb({red},{green},110);color:white;">{equity*100:.0f}%</td>'
+        html += '</tr>'
+    html += '</table>'
     return html
 
 # Improved card selection function
-def card_selector(key_prefix, selected_cards=[]):
+def card_selector(key_prefix, selected_cards=[], prompt="Select a card:", ranks=RANKS):
     # Create a visual card selection grid
-    st.write("Select a card:")
+    st.write(prompt)
     
     # Create tabs for suits
     suit_tabs = st.tabs(["♥️ Hearts", "♦️ Diamonds", "♣️ Clubs", "♠️ Spades"])
@@ -112,37 +140,22 @@ def card_selector(key_prefix, selected_cards=[]):
     
     for i, suit in enumerate(SUITS):
         with suit_tabs[i]:
-            cols = st.columns(7)  # 13 ranks, but we'll use 2 rows to make it more compact
-            
-            # First row (2-8)
-            for j, rank in enumerate(RANKS[:7]):
-                card = (rank, suit)
-                disabled = card in selected_cards
-                
-                # Use a colored button with rank display
-                if cols[j].button(
-                    f"{rank}", 
-                    key=f"{key_prefix}_{suit}_{rank}",
-                    disabled=disabled,
-                    use_container_width=True,
-                    type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
-                ):
-                    selected_card = card
-            
-            # Second row (9-A)
-            cols2 = st.columns(7)
-            for j, rank in enumerate(RANKS[7:], 7):
-                card = (rank, suit)
-                disabled = card in selected_cards
-                
-                if cols2[j-7].button(
-                    f"{rank}", 
-                    key=f"{key_prefix}_{suit}_{rank}",
-                    disabled=disabled,
-                    use_container_width=True,
-                    type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
-                ):
-                    selected_card = card
+            # Rows of 7 ranks to keep the grid compact (2-8 and 9-A for a full deck)
+            for row_start in range(0, len(ranks), 7):
+                cols = st.columns(7)
+                for j, rank in enumerate(ranks[row_start:row_start + 7]):
+                    card = (rank, suit)
+                    disabled = card in selected_cards
+                    
+                    # Use a colored button with rank display
+                    if cols[j].button(
+                        f"{rank}", 
+                        key=f"{key_prefix}_{suit}_{rank}",
+                        disabled=disabled,
+                        use_container_width=True,
+                        type="primary" if suit in ["Hearts", "Diamonds"] else "secondary"
+                    ):
+                        selected_card = card
     
     return selected_card
 
@@ -153,128 +166,34 @@ def get_card_value(card):
     rank, _ = card
     return RANKS.index(rank)
 
-# Poker hand evaluation functions
-def evaluate_hand(hole_cards, community_cards):
+# Poker hand evaluation functions, using the evaluator backend chosen for the workload (see pokerBackends)
+# and the rule variant's tables (see pokerEvaluator.VARIANTS).
+# Returns (strength, category, best five) from one search of the 21 five-card combinations.
+def evaluate_hand(hole_cards, community_cards, variant="standard"):
     if None in hole_cards or None in community_cards:
-        return -1, []
-    
-    all_cards = hole_cards + community_cards
-    all_combos = list(combinations(all_cards, 5))
-    best_hand_value = -1
-    best_hand = []
-    
-    for combo in all_combos:
-        hand_value, tie_breakers = evaluate_five_card_hand(combo)
-        if hand_value > best_hand_value or (hand_value == best_hand_value and tie_breakers > best_tie_breakers):
-            best_hand_value = hand_value
-            best_hand = combo
-            best_tie_breakers = tie_breakers
+        return -1, -1, []
     
-    return best_hand_value, best_hand
+    strength, best_hand = best_five(cards_to_ints(hole_cards + community_cards), variant)
+    return strength, strength_category(strength, variant), [int_to_card(c) for c in best_hand]
 
-def evaluate_five_card_hand(hand):
-    # Convert hand format for evaluation
-    cards = [(card[0], card[1]) for card in hand]
-    ranks = [card[0] for card in cards]
-    suits = [card[1] for card in cards]
-    
-    # Count rank frequencies
-    rank_counts = {}
-    for rank in ranks:
-        if rank in rank_counts:
-            rank_counts[rank] += 1
-        else:
-            rank_counts[rank] = 1
-    
-    # Check for flush
-    is_flush = len(set(suits)) == 1
-    
-    # Check for straight
-    rank_values = [RANKS.index(rank) for rank in ranks]
-    rank_values.sort()
-    
-    is_straight = False
-    if len(set(rank_values)) == 5:  # All ranks are different
-        if max(rank_values) - min(rank_values) == 4:
-            is_straight = True
-        # Special case: A-5 straight
-        if set(rank_values) == set([0, 1, 2, 3, 12]):
-            is_straight = True
-            # Adjust for A-5 straight (A is low)
-            rank_values = [0, 1, 2, 3, 4]
-    
-    # Determine hand type
-    hand_value = 0
-    hand_type = ""
-    
-    # Royal Flush
-    if is_flush and is_straight and 12 in rank_values and 11 in rank_values:
-        hand_value = 9
-    # Straight Flush
-    elif is_flush and is_straight:
-        hand_value = 8
-    # Four of a Kind
-    elif 4 in rank_counts.values():
-        hand_value = 7
-    # Full House
-    elif 3 in rank_counts.values() and 2 in rank_counts.values():
-        hand_value = 6
-    # Flush
-    elif is_flush:
-        hand_value = 5
-    # Straight
-    elif is_straight:
-        hand_value = 4
-    # Three of a Kind
-    elif 3 in rank_counts.values():
-        hand_value = 3
-    # Two Pair
-    elif list(rank_counts.values()).count(2) == 2:
-        hand_value = 2
-    # Pair
-    elif 2 in rank_counts.values():
-        hand_value = 1
-    # High Card
-    else:
-        hand_value = 0
-    
-    # For tie-breaking, create a list of values in descending order of importance
-    tie_breakers = []
-    
-    # Four of a Kind
-    if hand_value == 7:
-        for rank, count in rank_counts.items():
-            if count == 4:
-                tie_breakers.append(RANKS.index(rank))
-    # Full House
-    elif hand_value == 6:
-        for rank, count in rank_counts.items():
-            if count == 3:
-                tie_breakers.append(RANKS.index(rank))
-        for rank, count in rank_counts.items():
-            if count == 2:
-                tie_breakers.append(RANKS.index(rank))
-    # Three of a Kind
-    elif hand_value == 3:
-        for rank, count in rank_counts.items():
-            if count == 3:
-                tie_breakers.append(RANKS.index(rank))
-    # Two Pair or One Pair
-    elif hand_value == 2 or hand_value == 1:
-        pairs = []
-        for rank, count in rank_counts.items():
-            if count == 2:
-                pairs.append(RANKS.index(rank))
-        pairs.sort(reverse=True)
-        tie_breakers.extend(pairs)
-    
-    # Add remaining cards as tie breakers
-    sorted_values = sorted([RANKS.index(r) for r in ranks], reverse=True)
-    for val in sorted_values:
-        if val not in tie_breakers:
-            tie_breakers.append(val)
+# Omaha hand evaluation: exactly two hole cards and exactly three community cards.
+# Returns (strength, category, best five), all from one search of the 60 combinations.
+def evaluate_omaha_hand(hole_cards, community_cards):
+    if None in hole_cards or None in community_cards:
+        return -1, -1, []
     
-    return hand_value, tie_breakers
+    combos = [pair + triple for pair in combinations(hole_cards, 2) for triple in combinations(community_cards, 3)]
+    strengths = evaluate_hands([cards_to_ints(combo) for combo in combos])
+    best = int(strengths.argmax())
+    return int(strengths[best]), strength_category(int(strengths[best])), list(combos[best])
+
+# Function to get the top card of a straight; in an ace-low straight (A-2-3-4-5,
+# or A-6-7-8-9 in short deck) the ace plays low
+def get_straight_high_card(straight):
+    ranks = [card[0] for card in straight]
+    if 'A' in ranks and 'K' not in ranks:
+        straight = [card for card in straight if card[0] != 'A']
+    return max(straight, key=lambda x: RANKS.index(x[0]))
 
 # Function to get a description of the best hand
 def get_hand_description(hand_value, best_hand):
@@ -296,7 +215,7 @@ def get_hand_description(hand_value, best_hand):
         suit = best_hand[0][1]
         return f"Royal Flush of {suit}"
     elif hand_value == 8:  # Straight Flush
-        highest_card = max(best_hand, key=lambda x: RANKS.index(x[0]))
+        highest_card = get_straight_high_card(best_hand)
         suit = highest_card[1]
         return f"{rank_names[highest_card[0]]} High Straight Flush of {suit}"
     elif hand_value == 7:  # Four of a Kind
@@ -312,7 +231,7 @@ def get_hand_description(hand_value, best_hand):
         suit = highest_card[1]
         return f"{rank_names[highest_card[0]]} High Flush of {suit}"
     elif hand_value == 4:  # Straight
-        highest_card = max(best_hand, key=lambda x: RANKS.index(x[0]))
+        highest_card = get_straight_high_card(best_hand)
         return f"{rank_names[highest_card[0]]} High Straight"
     elif hand_value == 3:  # Three of a Kind
         three_rank = [r for r, c in rank_counts.items() if c == 3][0]
@@ -331,6 +250,8 @@ def get_hand_description(hand_value, best_hand):
 # Function to evaluate and get winner
 def determine_winner():
     num_players = st.session_state.num_players
+    game = GAMES[st.session_state.game]
+    hole_count = hole_card_count()
     community = [c for c in st.session_state.community_cards if c is not None]
     
     # Validate we have enough community cards
@@ -341,15 +262,10 @@ def determine_winner():
     
     # Get each player's hole cards
     for i in range(num_players):
-        card1_idx = i * 2
-        card2_idx = i * 2 + 1
+        hole_cards = st.session_state.player_cards[i * hole_count:(i + 1) * hole_count]
         
-        if card1_idx < len(st.session_state.player_cards) and card2_idx < len(st.session_state.player_cards):
-            card1 = st.session_state.player_cards[card1_idx]
-            card2 = st.session_state.player_cards[card2_idx]
-            
-            if card1 is not None and card2 is not None:
-                player_hands.append((i+1, [card1, card2]))
+        if len(hole_cards) == hole_count and None not in hole_cards:
+            player_hands.append((i+1, hole_cards))
     
     # Validate we have enough player hands
     if len(player_hands) < 2:
@@ -357,11 +273,13 @@ def determine_winner():
     
     results = []
     for player_num, hole_cards in player_hands:
-        hand_value, best_hand = evaluate_hand(hole_cards, community)
+        if game == "omaha":
+            strength, hand_value, best_hand = evaluate_omaha_hand(hole_cards, community)
+        else:
+            strength, hand_value, best_hand = evaluate_hand(hole_cards, community, GAME_VARIANTS[game])
         if hand_value >= 0:
             hand_type = HAND_RANKS[hand_value]
             hand_desc = get_hand_description(hand_value, best_hand)
-            tie_breakers = evaluate_five_card_hand(best_hand)[1]
             
             # Get player name from session state (or use default if not found)
             player_name = st.session_state.player_names[player_num-1] if player_num-1 < len(st.session_state.player_names) else f"Player {player_num}"
@@ -374,71 +292,217 @@ def determine_winner():
                 "hand_type": hand_type,
                 "hand_desc": hand_desc,
                 "hand_value": hand_value,
-                "tie_breakers": tie_breakers
+                "strength": strength
             })
     
-    # Sort by hand value (descending) and tie breakers
-    results.sort(key=lambda x: (x["hand_value"], x["tie_breakers"]), reverse=True)
+    # Sort by hand strength (descending)
+    results.sort(key=lambda x: x["strength"], reverse=True)
+    
+    # Exact equity over the remaining runouts (the pot share at showdown on the river)
+    holes = [cards_to_ints(result["hole_cards"]) for result in results]
+    equity, _ = shared_memo(f"equity_{game}", holes, cards_to_ints(community), partial(exact_equity, game=game))
+    for result, player_equity in zip(results, equity):
+        result["equity"] = float(player_equity)
     
     return results
 
-def run():
-    # Main app layout
-    st.title("Poker Hand Evaluator")
+# Function to find each player's outs against the other players' hands
+def determine_outs(results):
+    community = [c for c in st.session_state.community_cards if c is not None]
+    if not isinstance(results, list) or len(community) >= 5:
+        return None
+    
+    game = GAMES[st.session_state.game]
+    holes = [cards_to_ints(result["hole_cards"]) for result in results]
+    outs, perm = shared_memo(f"outs_{game}", holes, cards_to_ints(community), partial(find_outs, game=game))
+    
+    player_outs = []
+    for i, result in enumerate(results):
+        player_outs.append({
+            "player_name": result["player_name"],
+            "leading": bool(outs["was_winning"][i]),
+            "clean": [int_to_card(restore_card(c, perm)) for c in outs["clean"][i]],
+            "tainted": [int_to_card(restore_card(c, perm)) for c in outs["tainted"][i]],
+            "runout_wins": int(outs["runout_turnaround"][i].sum()) if outs["runouts"] is not None else None,
+            "runout_total": len(outs["runouts"]) if outs["runouts"] is not None else None,
+            "remaining": len(outs["remaining"])
+        })
+    return player_outs
 
-    # Player selection
-    st.sidebar.header("Game Settings")
+# Function to determine main and side pots and each player's expected chips from them
+def determine_pots(results):
+    community = [c for c in st.session_state.community_cards if c is not None]
+    if not isinstance(results, list):
+        return None
+    
+    # Players without a complete hand are treated as folded; their chips stay in the pots
+    contributions = st.session_state.contributions
+    live_seats = [result["player"] - 1 for result in results]
+    live_contributions = [contributions[seat] for seat in live_seats]
+    folded = [contributions[seat] for seat in range(st.session_state.num_players) if seat not in live_seats]
+    if sum(live_contributions) == 0:
+        return None
+    
+    # Odd chips go to the winners in seat order
+    odd_chip_order = sorted(range(len(results)), key=lambda i: live_seats[i])
+    
+    game = GAMES[st.session_state.game]
+    holes = [cards_to_ints(result["hole_cards"]) for result in results]
+    kind = ("pot_ev", game, tuple(live_contributions), tuple(folded), tuple(odd_chip_order))
+    (pots, pot_ev), _ = shared_memo(kind, holes, cards_to_ints(community),
+                                    partial(all_in_ev, contributions=live_contributions, folded=folded,
+                                            odd_chip_order=odd_chip_order, game=game))
+    
+    pot_list = []
+    for i, (amount, eligible) in enumerate(pots):
+        name = "Main Pot" if i == 0 else f"Side Pot {i}"
+        if len(eligible) == 1:
+            name = f"{name} (uncalled)"
+        pot_list.append({
+            "name": name,
+            "amount": amount,
+            "eligible": [results[p]["player_name"] for p in eligible],
+            "expected": [float(chips) for chips in pot_ev[i]]
+        })
+    
+    player_list = []
+    for p, result in enumerate(results):
+        expected = float(pot_ev[:, p].sum())
+        player_list.append({
+            "player_name": result["player_name"],
+            "contribution": live_contributions[p],
+            "expected": expected,
+            "net": expected - live_contributions[p]
+        })
+    return {"pots": pot_list, "players": player_list, "river": len(community) == 5}
 
-    col1, col2, col3 = st.columns([2, 1, 1])
-    with col1:
-        num_players = st.sidebar.slider("Number of Players", min_value=2, max_value=5, value=st.session_state.num_players)
-        if num_players != st.session_state.num_players:
-            # Adjust player names list if the number of players changes
-            if num_players > st.session_state.num_players:
-                # Add default names for new players
-                for i in range(st.session_state.num_players, num_players):
-                    st.session_state.player_names.append(f"Player {i+1}")
-            else:
-                # Truncate the list if reducing players
-                st.session_state.player_names = st.session_state.player_names[:num_players]
-                
-            st.session_state.num_players = num_players
-            st.session_state.results = None
+# Players holding the best hand; more than one means the pot is split
+def get_winners(results):
+    return [result for result in results if result["strength"] == results[0]["strength"]]
 
-    # Add player name inputs in the sidebar
-    # st.sidebar.header("Player Names")
-    # for i in range(st.session_state.num_players):
-    #     # Initialize with default name if needed
-    #     if i >= len(st.session_state.player_names):
-    #         st.session_state.player_names.append(f"Player {i+1}")
-            
-    #     player_name = st.sidebar.text_input(
-    #         f"Player {i+1} Name",
-    #         value=st.session_state.player_names[i],
-    #         key=f"player_name_{i}"
-    #     )
-    #     # Update the name in session state
-    #     st.session_state.player_names[i] = player_name
+# Function to build the results table, winner first
+def build_results_table(results):
+    winners = get_winners(results)
+    data = []
+    for result in results:
+        player_name = result["player_name"]
+        
+        # Mark the winners
+        is_winner = result in winners
+        player_label = f"{player_name} {'👑' if is_winner else ''}"
+        
+        data.append({
+            "Player": player_label,
+            "Hand Type": result["hand_type"],
+            "Description": result["hand_desc"],
+            "Rank": len(HAND_RANKS) - result["hand_value"],  # Convert to 1-10 scale where 1 is best
+            "Equity": f"{result['equity']*100:.1f}%",
+        })
+    return pd.DataFrame(data)
 
-    with col3:
-        if st.button("Evaluate Winner", type="primary", use_container_width=True):
-            st.session_state.results = determine_winner()
+# Function to build a styled card display for each player's best hand
+def build_best_hands_html(results):
+    best_hands_html = []
+    for result in results:
+        best_hands_html.append(f"""
+                    <div style="margin-bottom:15px;padding:10px;border:1px solid #ddd;border-radius:5px;">
+                        <h4 style="margin:0 0 10px 0;">{result["player_name"]} - {result["hand_type"]}</h4>
+                        {render_card_row(result["best_hand"])}
+                    </div>
+                    """)
+    return best_hands_html
+
+# Function to build the outs summary table
+def build_outs_table(player_outs_list):
+    outs_data = []
+    for player_outs in player_outs_list:
+        row = {
+            "Player": player_outs["player_name"],
+            "Status": "Leading" if player_outs["leading"] else "Behind",
+            "Clean Outs": len(player_outs["clean"]),
+            "Tainted Outs": len(player_outs["tainted"]),
+        }
+        if player_outs["runout_total"]:
+            row["Turn/River Comebacks"] = f"{player_outs['runout_wins']} / {player_outs['runout_total']}"
+        outs_data.append(row)
+    return pd.DataFrame(outs_data)
+
+# Function to build the pot breakdown and per-player chip tables
+def build_pot_tables(pots):
+    pot_data = []
+    for pot in pots["pots"]:
+        pot_data.append({
+            "Pot": pot["name"],
+            "Chips": pot["amount"],
+            "Eligible": ", ".join(pot["eligible"]),
+        })
+    
+    return_label = "Chips Won" if pots["river"] else "Expected Chips"
+    player_data = []
+    for player in pots["players"]:
+        player_data.append({
+            "Player": player["player_name"],
+            "Chips In": player["contribution"],
+            return_label: round(player["expected"], 2),
+            "Net": round(player["net"], 2),
+        })
+    return pd.DataFrame(pot_data), pd.DataFrame(player_data)
 
+# Function to build the run-it-N-times table: equity on each board, combined share and scoop chance
+def build_multi_board_table(results, multi_board):
+    data = []
+    for p, result in enumerate(results):
+        row = {"Player": result["player_name"]}
+        for b, board_equity in enumerate(multi_board["board_equity"]):
+            row[f"Board {b + 1}"] = f"{board_equity[p]*100:.1f}%"
+        row["Pot Share"] = f"{multi_board['share'][p]*100:.1f}%"
+        if multi_board["error"] is not None:
+            row["Pot Share"] += f" ± {multi_board['error'][p]*100:.1f}%"
+        row["Wins Every Board"] = f"{multi_board['scoop'][p]*100:.1f}%"
+        data.append(row)
+    return pd.DataFrame(data)
+
+# Function to get each player's equity after every possible next card, cached per board
+def cached_next_card_equity(holes, board, game="holdem"):
+    (remaining, equity), perm = shared_memo(f"next_card_equity_{game}", holes, board, partial(next_card_equity, game=game))
+    return [int_to_card(restore_card(c, perm)) for c in remaining], equity
+
+# Card table: community and player slots, swapped for the card picker while editing.
+# Runs as a fragment so opening the picker or picking a card only redraws the table.
+@st.fragment
+def card_table():
     # If we're currently editing a card
     if st.session_state.editing_card:
         card_type, index = st.session_state.editing_card
         already_selected = [card for card in st.session_state.community_cards + st.session_state.player_cards if card is not None]
         
-        selected_card = card_selector(f"edit_{card_type}_{index}", already_selected)
+        hole_count = hole_card_count()
+        if card_type == "player":
+            player_num = index // hole_count
+            player_name = st.session_state.player_names[player_num] if player_num < len(st.session_state.player_names) else f"Player {player_num+1}"
+            prompt = f"Select hole card {index % hole_count + 1} of {hole_count} for {player_name}:"
+        else:
+            prompt = f"Select community card {index + 1}:"
+        ranks = variant_ranks(GAME_VARIANTS[GAMES[st.session_state.game]])
+        selected_card = card_selector(f"edit_{card_type}_{index}", already_selected, prompt, ranks)
         
         if selected_card:
             add_card_at_index(card_type, index, selected_card)
             st.session_state.editing_card = None
-            st.rerun()  # Refresh the page
+            
+            # Move straight on to the next empty hole card of the same player
+            if card_type == "player":
+                hand_start = index - index % hole_count
+                for next_index in range(hand_start, hand_start + hole_count):
+                    # The list can be short after switching over from the other tool
+                    if next_index >= len(st.session_state.player_cards) or st.session_state.player_cards[next_index] is None:
+                        st.session_state.editing_card = ("player", next_index)
+                        break
+            rerun_fragment()  # Redraw only the table
         
         if st.button("Cancel"):
             st.session_state.editing_card = None
-            st.rerun()
+            rerun_fragment()
 
     else:
         # Display community cards
@@ -456,15 +520,15 @@ def run():
                     with col1:
                         if st.button("✏️ Edit", key=f"edit_comm_{i}", use_container_width=True):
                             st.session_state.editing_card = ("community", i)
-                            st.rerun()
+                            rerun_fragment()
                     with col2:
                         if st.button("❌", key=f"remove_comm_{i}", use_container_width=True):
                             remove_card("community", i)
-                            st.rerun()
+                            rerun_fragment()
                 else:
                     if st.button("➕ Add Card", key=f"add_comm_{i}", use_container_width=True):
                         st.session_state.editing_card = ("community", i)
-                        st.rerun()
+                        rerun_fragment()
         
         # Display player cards with names
         for player in range(1, st.session_state.num_players + 1):
@@ -474,8 +538,8 @@ def run():
             st.subheader(f"{player_name}")
             player_cols = st.columns(5)
             
-            for j in range(2):
-                card_index = (player - 1) * 2 + j
+            for j in range(hole_card_count()):
+                card_index = (player - 1) * hole_card_count() + j
                 with player_cols[j]:
                     if card_index < len(st.session_state.player_cards) and st.session_state.player_cards[card_index]:
                         rank, suit = st.session_state.player_cards[card_index]
@@ -486,86 +550,216 @@ def run():
                         with col1:
                             if st.button("✏️ Edit", key=f"edit_player_{card_index}", use_container_width=True):
                                 st.session_state.editing_card = ("player", card_index)
-                                st.rerun()
+                                rerun_fragment()
                         with col2:
                             if st.button("❌", key=f"remove_player_{card_index}", use_container_width=True):
                                 remove_card("player", card_index)
-                                st.rerun()
+                                rerun_fragment()
                     else:
                         if st.button("➕ Add Card", key=f"add_player_{card_index}", use_container_width=True):
                             st.session_state.editing_card = ("player", card_index)
-                            st.rerun()
+                            rerun_fragment()
+
+# Results panel: only changes when "Evaluate Winner" is clicked, which reruns the app
+@st.fragment
+def results_panel():
+    # Display results
+    if isinstance(st.session_state.results, str):
+        st.warning(st.session_state.results)
+    elif isinstance(st.session_state.results, list) and len(st.session_state.results) > 0:
+        st.subheader("Results")
         
-        # Display results
-        if isinstance(st.session_state.results, str):
-            st.warning(st.session_state.results)
-        elif isinstance(st.session_state.results, list) and len(st.session_state.results) > 0:
-            st.subheader("Results")
+        # Display winner first
+        winners = get_winners(st.session_state.results)
+        winner = winners[0]
+        if len(winners) > 1:
+            announcement = "🤝 Split Pot: " + ", ".join(result["player_name"] for result in winners)
+        else:
+            announcement = f"🏆 Winner: {winner['player_name']}"
+        
+        # Create a styled container for the winner announcement
+        st.markdown(
+            f"""
+            <div style="padding:15px;background-color:#f0f8ff;border-radius:5px;margin-bottom:20px;border-left:5px solid #4169e1;">
+                <h3 style="margin:0;color:#4169e1;">{announcement}</h3>
+                <p style="margin:5px 0 0 0;font-size:18px;"><strong>{winner['hand_type']}:</strong> {winner['hand_desc']}</p>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+        
+        # Display the results table
+        results_key = st.session_state.results_key
+        df = session_memo("results_table", results_key, lambda: build_results_table(st.session_state.results))
+        st.dataframe(df.style.set_properties(**{'text-align': 'left'}), hide_index=True, use_container_width=True)
+        
+        # Show main and side pots with each player's chips back
+        if st.session_state.pots:
+            st.subheader("Pots")
+            if not st.session_state.pots["river"]:
+                st.caption("Expected chips over every remaining runout, with all players all-in.")
             
-            # Display winner first
-            winner = st.session_state.results[0]
+            pot_df, chips_df = session_memo("pot_tables", results_key, lambda: build_pot_tables(st.session_state.pots))
+            st.dataframe(pot_df, hide_index=True, use_container_width=True)
+            st.dataframe(chips_df, hide_index=True, use_container_width=True)
+        
+        # Show each player's best hand with card visuals
+        st.subheader("Best Hands")
+        
+        for best_hand_html in session_memo("best_hands_html", results_key, lambda: build_best_hands_html(st.session_state.results)):
+            st.markdown(best_hand_html, unsafe_allow_html=True)
             
-            # Create a styled container for the winner announcement
-            st.markdown(
-                f"""
-                <div style="padding:15px;background-color:#f0f8ff;border-radius:5px;margin-bottom:20px;border-left:5px solid #4169e1;">
-                    <h3 style="margin:0;color:#4169e1;">🏆 Winner: {winner['player_name']}</h3>
-                    <p style="margin:5px 0 0 0;font-size:18px;"><strong>{winner['hand_type']}:</strong> {winner['hand_desc']}</p>
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
+        # Show the community cards that were used
+        community = st.session_state.results_community
+        st.markdown(
+            f"""
+            <div style="margin-top:20px;padding:10px;border:1px solid #ddd;border-radius:5px;background-color:#f5f5f5;">
+                <h4 style="margin:0 0 10px 0;">Community Cards</h4>
+                {render_card_row(community)}
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+        
+        # Show opponent-aware outs while cards are still to come
+        if st.session_state.outs:
+            st.subheader("Outs")
             
-            # Create DataFrames for the results table (more intuitive visualization)
-            data = []
-            for result in st.session_state.results:
-                player_num = result["player"]
-                player_name = result["player_name"]
-                hand_type = result["hand_type"]
-                hand_desc = result["hand_desc"]
-                
-                # Mark the winner
-                is_winner = result == winner
-                player_label = f"{player_name} {'👑' if is_winner else ''}"
+            outs_df = session_memo("outs_table", results_key, lambda: build_outs_table(st.session_state.outs))
+            st.dataframe(outs_df, hide_index=True, use_container_width=True)
+            
+            for player_outs in st.session_state.outs:
+                if player_outs["clean"] or player_outs["tainted"]:
+                    probability = len(player_outs["clean"]) / player_outs["remaining"] * 100
+                    with st.expander(f"{player_outs['player_name']} - {len(player_outs['clean'])} clean outs ({probability:.2f}%)"):
+                        if player_outs["clean"]:
+                            st.markdown("**Clean outs** (make this player the outright winner):")
+                            st.markdown(render_card_row(player_outs["clean"]), unsafe_allow_html=True)
+                        if player_outs["tainted"]:
+                            st.markdown("**Tainted outs** (improve the hand but an opponent still wins or chops):")
+                            st.markdown(render_card_row(player_outs["tainted"]), unsafe_allow_html=True)
+        
+        # Show each player's equity after every possible next card
+        if 3 <= len(community) < 5:
+            st.subheader("Equity by Next Card")
+            
+            holes = [cards_to_ints(result["hole_cards"]) for result in st.session_state.results]
+            next_cards, equity = cached_next_card_equity(holes, cards_to_ints(community), GAMES[st.session_state.game])
+            
+            heatmap_tabs = st.tabs([result["player_name"] for result in st.session_state.results])
+            for i, result in enumerate(st.session_state.results):
+                with heatmap_tabs[i]:
+                    equity_by_card = {card: float(equity[i][j]) for j, card in enumerate(next_cards)}
+                    ranks = variant_ranks(GAME_VARIANTS[GAMES[st.session_state.game]])
+                    st.markdown(render_equity_heatmap(equity_by_card, ranks), unsafe_allow_html=True)
+        
+        # Run the remaining board several times from the same deck
+        if len(community) < 5:
+            st.subheader("Run It Multiple Times")
+            
+            num_boards = st.radio("Run it", list(RUN_IT_OPTIONS), format_func=RUN_IT_OPTIONS.get, horizontal=True, key="run_it_times")
+            game = GAMES[st.session_state.game]
+            holes = [cards_to_ints(result["hole_cards"]) for result in st.session_state.results]
+            cards_left = len(variant_deck(GAME_VARIANTS[game])) - sum(len(hole) for hole in holes) - len(community)
+            
+            if num_boards > 1 and cards_left < (5 - len(community)) * num_boards:
+                st.warning(f"Not enough cards left to run the board {RUN_IT_OPTIONS[num_boards].lower()}.")
+            elif num_boards > 1:
+                multi_board, _ = shared_memo(("multi_board", game, num_boards), holes, cards_to_ints(community),
+                                             partial(multi_board_equity, num_boards=num_boards, game=game))
+                if multi_board["exact"]:
+                    st.caption(f"Exact over all {multi_board['deals']:,} ways to deal {num_boards} boards.")
+                else:
+                    st.caption(f"Estimated from {multi_board['deals']:,} random deals; ± is a 95% error bound.")
                 
-                data.append({
-                    "Player": player_label,
-                    "Hand Type": hand_type,
-                    "Description": hand_desc,
-                    "Rank": len(HAND_RANKS) - result["hand_value"],  # Convert to 1-10 scale where 1 is best
-                })
+                multi_df = session_memo(f"multi_board_table_{num_boards}", results_key, lambda: build_multi_board_table(st.session_state.results, multi_board))
+                st.dataframe(multi_df, hide_index=True, use_container_width=True)
+
+def run():
+    # Main app layout
+    st.title("Poker Hand Evaluator")
+
+    # Player selection
+    st.sidebar.header("Game Settings")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        game = st.sidebar.selectbox("Game", list(GAMES), index=list(GAMES).index(st.session_state.game))
+        if game != st.session_state.game:
+            # Hands change size, so start the players over with empty hands
+            st.session_state.game = game
+            st.session_state.player_cards = [None] * (hole_card_count() * st.session_state.num_players)
             
-            # Display the results table
-            df = pd.DataFrame(data)
-            st.dataframe(df.style.set_properties(**{'text-align': 'left'}), hide_index=True, use_container_width=True)
+            # Drop community cards that aren't in this game's deck
+            deck = [int_to_card(c) for c in variant_deck(GAME_VARIANTS[GAMES[game]])]
+            st.session_state.community_cards = [card if card in deck else None for card in st.session_state.community_cards]
+            st.session_state.editing_card = None
+            st.session_state.results = None
+            st.session_state.outs = None
+            st.session_state.pots = None
+        
+        num_players = st.sidebar.slider("Number of Players", min_value=2, max_value=MAX_PLAYERS, value=st.session_state.num_players)
+        if num_players != st.session_state.num_players:
+            # Adjust player names list if the number of players changes
+            if num_players > st.session_state.num_players:
+                # Add default names for new players
+                for i in range(st.session_state.num_players, num_players):
+                    st.session_state.player_names.append(f"Player {i+1}")
+            else:
+                # Truncate the list if reducing players
+                st.session_state.player_names = st.session_state.player_names[:num_players]
             
-            # Show each player's best hand with card visuals
-            st.subheader("Best Hands")
+            # Hole card slots for each player, dropping the cards of removed players
+            hole_count = hole_card_count()
+            player_cards = st.session_state.player_cards[:hole_count * num_players]
+            st.session_state.player_cards = player_cards + [None] * (hole_count * num_players - len(player_cards))
             
-            for result in st.session_state.results:
-                player_name = result["player_name"]
-                best_hand = result["best_hand"]
-                hand_type = result["hand_type"]
+            # Chips in the pot for each player, new players start with the default
+            contributions = st.session_state.contributions[:num_players]
+            st.session_state.contributions = contributions + [DEFAULT_CONTRIBUTION] * (num_players - len(contributions))
                 
-                # Create a styled card display for each player's best hand
-                st.markdown(
-                    f"""
-                    <div style="margin-bottom:15px;padding:10px;border:1px solid #ddd;border-radius:5px;">
-                        <h4 style="margin:0 0 10px 0;">{player_name} - {hand_type}</h4>
-                        {render_card_row(best_hand)}
-                    </div>
-                    """,
-                    unsafe_allow_html=True
+            st.session_state.num_players = num_players
+            st.session_state.results = None
+            st.session_state.outs = None
+            st.session_state.pots = None
+        
+        # Total chips each player has put in the pot, which decides the side pots
+        with st.sidebar.expander("Chips in Pot"):
+            for i in range(st.session_state.num_players):
+                st.session_state.contributions[i] = st.number_input(
+                    st.session_state.player_names[i],
+                    min_value=0,
+                    value=st.session_state.contributions[i],
+                    step=10,
+                    key=f"contribution_{i}"
                 )
-                
-            # Show the community cards that were used
-            community = [c for c in st.session_state.community_cards if c is not None]
-            st.markdown(
-                f"""
-                <div style="margin-top:20px;padding:10px;border:1px solid #ddd;border-radius:5px;background-color:#f5f5f5;">
-                    <h4 style="margin:0 0 10px 0;">Community Cards</h4>
-                    {render_card_row(community)}
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
\ No newline at end of file
+
+    # Add player name inputs in the sidebar
+    # st.sidebar.header("Player Names")
+    # for i in range(st.session_state.num_players):
+    #     # Initialize with default name if needed
+    #     if i >= len(st.session_state.player_names):
+    #         st.session_state.player_names.append(f"Player {i+1}")
+            
+    #     player_name = st.sidebar.text_input(
+    #         f"Player {i+1} Name",
+    #         value=st.session_state.player_names[i],
+    #         key=f"player_name_{i}"
+    #     )
+    #     # Update the name in session state
+    #     st.session_state.player_names[i] = player_name
+
+    with col3:
+        if st.button("Evaluate Winner", type="primary", use_container_width=True):
+            # Reuse earlier results when the cards haven't changed
+            results_key = card_state_key("Poker Hands - Who Wins", st.session_state.player_cards, st.session_state.community_cards,
+                                         st.session_state.num_players, tuple(st.session_state.player_names), st.session_state.game,
+                                         tuple(st.session_state.contributions))
+            st.session_state.results = session_memo("results", results_key, determine_winner)
+            st.session_state.outs = session_memo("outs", results_key, lambda: determine_outs(st.session_state.results))
+            st.session_state.pots = session_memo("pots", results_key, lambda: determine_pots(st.session_state.results))
+            st.session_state.results_key = results_key
+            st.session_state.results_community = [c for c in st.session_state.community_cards if c is not None]
+
+    card_table()
+    results_panel()
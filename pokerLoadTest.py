@@ -0,0 +1,189 @@
+import argparse
+import os
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager, get_context
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Load test for pokerChooseApp.py: N simulated users run scripted sessions at the
+# same time, each through its own headless AppTest. AppTest keeps process-wide
+# Streamlit state for the length of each run, so only one can run per process: every
+# user gets a spawned process of their own, and the users compete for CPU like
+# sessions on a server (though they don't share its in-process caches). Every rerun
+# is timed. The report gives rerun latency percentiles overall and per step, CPU
+# used, and memory per session.
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pokerChooseApp.py")
+RERUN_TIMEOUT = 120
+PERCENTILES = (50, 95, 99)
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+
+# A step is (name, action); the action is applied to the AppTest before its timed rerun
+def click_key(key):
+    return lambda at: at.button(key=key).click()
+
+def click_label(label):
+    return lambda at: next(button for button in at.button if button.label == label).click()
+
+def pick_card(card_type, index, card):
+    return ("pick card", click_key(f"edit_{card_type}_{index}_{card[1]}_{card[0]}"))
+
+# One user's session in the dealer tool: deal a flop and two hands, evaluate, edit a
+# board card, evaluate, add the turn, evaluate, then refresh.
+def dealer_session(rng, num_players=2):
+    deck = [(rank, suit) for rank in RANKS for suit in SUITS]
+    rng.shuffle(deck)
+    cards = iter(deck)
+    steps = [
+        ("open app", None),
+        ("choose tool", lambda at: at.selectbox[0].select("Poker Hands - Who Wins")),
+    ]
+    for i in range(3):
+        steps += [("add card", click_key(f"add_comm_{i}")), pick_card("community", i, next(cards))]
+    for player in range(num_players):
+        # Picking a hole card moves straight on to the player's next empty one
+        steps.append(("add card", click_key(f"add_player_{player * 2}")))
+        steps += [pick_card("player", player * 2 + h, next(cards)) for h in range(2)]
+    evaluate = ("evaluate winner", click_label("Evaluate Winner"))
+    edited = rng.randrange(3)
+    steps += [
+        evaluate,
+        ("edit card", click_key(f"edit_comm_{edited}")),
+        pick_card("community", edited, next(cards)),
+        evaluate,
+        ("add card", click_key("add_comm_3")),
+        pick_card("community", 3, next(cards)),
+        evaluate,
+        ("refresh", click_label("Refresh")),
+    ]
+    return steps
+
+# Bytes of a session's state, measured as pickled size like the shared cache does
+def session_state_bytes(at):
+    total = 0
+    for value in at.session_state.to_dict().values():
+        try:
+            total += len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    return total
+
+# Peak resident memory of this process in bytes, or None where it can't be read
+def peak_rss():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Timed sessions of one user: a list of (step, seconds) per rerun and the errors
+def run_sessions(user, sessions, rng):
+    timings, errors, state_bytes = [], [], 0
+    for _ in range(sessions):
+        at = AppTest.from_file(APP_PATH, default_timeout=RERUN_TIMEOUT)
+        for name, action in dealer_session(rng):
+            try:
+                if action:
+                    action(at)
+                started = time.perf_counter()
+                at.run()
+                timings.append((name, time.perf_counter() - started))
+            except Exception as error:
+                errors.append(f"user {user}, {name}: {error!r}")
+                break
+            errors += [f"user {user}, {name}: {exception.value}" for exception in at.exception]
+            if name != "refresh":
+                state_bytes = max(state_bytes, session_state_bytes(at))
+    return timings, errors, state_bytes
+
+# One user's process: an untimed session first, so imports and table builds aren't
+# counted, then wait for every other user and run the timed sessions
+def run_user(user, sessions, seed, start_barrier):
+    rng = random.Random(seed * 100003 + user)
+    run_sessions(user, 1, rng)
+    rss_before = peak_rss()
+    start_barrier.wait()
+    started, cpu_before = time.time(), time.process_time()
+    timings, errors, state_bytes = run_sessions(user, sessions, rng)
+    rss_after = peak_rss()
+    return {
+        "timings": timings,
+        "errors": errors,
+        "state_bytes": state_bytes,
+        "started": started,
+        "finished": time.time(),
+        "cpu_seconds": time.process_time() - cpu_before,
+        "rss_growth": rss_after - rss_before if rss_before is not None else None,
+    }
+
+# Run `users` concurrent users for `sessions` sessions each and summarise
+def load_test(users, sessions=1, seed=0):
+    with Manager() as manager, ProcessPoolExecutor(max_workers=users, mp_context=get_context("spawn")) as pool:
+        barrier = manager.Barrier(users)
+        results = list(pool.map(run_user, range(users), [sessions] * users, [seed] * users, [barrier] * users))
+    wall = max(r["finished"] for r in results) - min(r["started"] for r in results)
+    cpu = sum(r["cpu_seconds"] for r in results)
+
+    timings = [timing for r in results for timing in r["timings"]]
+    by_step = {}
+    for name, seconds in timings:
+        by_step.setdefault(name, []).append(seconds)
+    latencies = np.array([seconds for _, seconds in timings])
+    rss_growth = [r["rss_growth"] for r in results]
+    return {
+        "users": users,
+        "sessions": users * sessions,
+        "reruns": len(timings),
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "cpu_cores": cpu / wall if wall else 0.0,
+        "latency": {p: float(np.percentile(latencies, p)) for p in PERCENTILES} if len(latencies) else {},
+        "step_latency": {name: {p: float(np.percentile(values, p)) for p in PERCENTILES} for name, values in by_step.items()},
+        "step_reruns": {name: len(values) for name, values in by_step.items()},
+        "rss_growth_per_session": np.mean(rss_growth) / sessions if None not in rss_growth else None,
+        "session_state_bytes": [r["state_bytes"] for r in results],
+        "errors": [error for r in results for error in r["errors"]],
+    }
+
+def format_ms(seconds):
+    return f"{seconds * 1000:8.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test pokerChooseApp.py with concurrent scripted sessions.")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4], help="concurrent users; several values run one test each")
+    parser.add_argument("--sessions", type=int, default=1, help="sessions each user runs one after another")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for users in args.users:
+        report = load_test(users, args.sessions, args.seed)
+        header = "  ".join(f"p{p:<6}" for p in PERCENTILES)
+        print(f"\n{users} concurrent users, {report['sessions']} sessions, {report['reruns']} reruns in {report['wall_seconds']:.1f}s")
+        print(f"  CPU: {report['cpu_seconds']:.1f}s ({report['cpu_cores']:.2f} cores busy, "
+              f"{report['cpu_seconds'] / max(report['reruns'], 1) * 1000:.1f} ms per rerun)")
+        if report["rss_growth_per_session"] is not None:
+            print(f"  Peak memory growth: {report['rss_growth_per_session'] / 2**20:.1f} MB per session")
+        print(f"  Session state: {max(report['session_state_bytes']) / 1024:.1f} KB largest, "
+              f"{np.mean(report['session_state_bytes']) / 1024:.1f} KB mean")
+        if report["latency"]:
+            print(f"  Rerun latency (ms)   {header}")
+            print(f"  {'all reruns':<18}" + "".join(format_ms(report["latency"][p]) for p in PERCENTILES))
+            for name, latency in report["step_latency"].items():
+                print(f"  {name:<18}" + "".join(format_ms(latency[p]) for p in PERCENTILES) + f"  ({report['step_reruns'][name]} reruns)")
+        else:
+            print("  No rerun finished")
+        if report["errors"]:
+            print(f"  {len(report['errors'])} errors")
+        for error in report["errors"][:10]:
+            print(f"  error: {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+
+import numpy as np
+
+from pokerCache import SHARED_CACHE
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Memory accounting for long-lived sessions.
+# A session is measured key by key (the deep size of each session_state value). The
+# process is split into lookup tables (container globals of the poker modules), the
+# shared cache, function caches and, while tracemalloc is tracing, allocations by
+# source line. While a session's memory panel is switched on, each of its reruns
+# records the session's sizes; the process sample is shared by every session and
+# refreshed at most every PROCESS_SAMPLE_SECONDS. A key, table or allocation site
+# that grew on each of the last GROWTH_RERUNS records is flagged as growing.
+MEMORY_TRACE = os.environ.get("POKER_MEMORY_TRACE", "0") == "1"  # trace allocations from startup
+MEMORY_TRACE_FRAMES = 1
+GROWTH_RERUNS = 5
+SESSION_GROWTH_MIN_BYTES = 1024  # smaller growth over the window isn't flagged
+PROCESS_GROWTH_MIN_BYTES = 64 * 1024
+PROCESS_SAMPLE_SECONDS = 5.0  # shared by every session, so cost doesn't scale with sessions
+SITE_MIN_BYTES = 4096  # allocation sites below this aren't kept between samples
+TABLE_MIN_BYTES = 16 * 1024
+HISTORY_KEY = "memory_history"
+MEMORY_TOGGLE_KEY = "memory_panel"
+
+TABLE_TYPES = (dict, list, tuple, set, frozenset, np.ndarray)
+SKIPPED_TYPES = (types.ModuleType, type, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+_process_history = deque(maxlen=GROWTH_RERUNS + 1)
+_process_lock = threading.Lock()
+
+if MEMORY_TRACE:
+    tracemalloc.start(MEMORY_TRACE_FRAMES)
+
+# Start tracing allocations; only memory allocated from now on is attributed
+def start_tracing():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(MEMORY_TRACE_FRAMES)
+
+# Bytes held by an object and everything it references, each object counted once per
+# `seen`. Arrays count their own buffer; views and memory maps only their header.
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    pending = [obj]
+    total = 0
+    while pending:
+        o = pending.pop()
+        if id(o) in seen or isinstance(o, SKIPPED_TYPES):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            pending.extend(o.keys())
+            pending.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            pending.extend(o)
+        elif isinstance(o, np.ndarray):
+            continue
+        elif hasattr(o, "__dict__"):
+            pending.append(vars(o))
+        elif hasattr(type(o), "__slots__"):
+            pending.extend(getattr(o, slot) for slot in type(o).__slots__ if hasattr(o, slot))
+    return total
+
+# Bytes held by each session_state key, largest first
+def session_memory(state):
+    sizes = {key: deep_size(state[key]) for key in list(state.keys()) if key != HISTORY_KEY}
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+# Globals of the loaded poker modules, once each: (object, "module.NAME", modules holding it)
+def module_globals():
+    found = {}
+    for module_name, module in sorted(sys.modules.items()):
+        if not module_name.startswith("poker") or module is None:
+            continue
+        for name, value in vars(module).items():
+            if name.startswith("_"):
+                continue
+            if id(value) not in found:
+                found[id(value)] = (value, name, [])
+            found[id(value)][2].append(module_name)
+    return [(value, f"{'/'.join(modules)}.{name}", modules) for value, name, modules in found.values()]
+
+# Container globals of the poker modules of at least TABLE_MIN_BYTES: {label: bytes}
+def lookup_tables():
+    seen = set()
+    tables = {}
+    for value, label, _ in module_globals():
+        if isinstance(value, TABLE_TYPES):
+            size = deep_size(value, seen)
+            if size >= TABLE_MIN_BYTES:
+                tables[label] = size
+    return dict(sorted(tables.items(), key=lambda item: -item[1]))
+
+# lru_cache'd functions of the poker modules: {label: (entries, max entries)}
+def function_caches():
+    return {label: (value.cache_info().currsize, value.cache_info().maxsize)
+            for value, label, _ in module_globals() if hasattr(value, "cache_info")}
+
+# Bytes allocated by each source line, from a tracemalloc snapshot, or {} when not tracing
+def allocation_sites():
+    if not tracemalloc.is_tracing():
+        return {}
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    return {f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}": stat.size
+            for stat in snapshot.statistics("lineno") if stat.size >= SITE_MIN_BYTES}
+
+# Bytes allocated from each source file, largest first
+def allocation_files(sites):
+    files = {}
+    for site, size in sites.items():
+        filename = site.rsplit(":", 1)[0]
+        files[filename] = files.get(filename, 0) + size
+    return dict(sorted(files.items(), key=lambda item: -item[1]))
+
+# Peak resident memory of the process in bytes, or None where it can't be read
+def peak_rss():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Names whose size grew on each of the last GROWTH_RERUNS steps of a history of
+# {name: bytes} records, by at least min_bytes in all: {name: (first, last)}
+def growing(history, min_bytes):
+    if len(history) <= GROWTH_RERUNS:
+        return {}
+    window = list(history)[-GROWTH_RERUNS - 1:]
+    flagged = {}
+    for name, last in window[-1].items():
+        sizes = [record.get(name, 0) for record in window]
+        if all(b > a for a, b in zip(sizes, sizes[1:])) and last - sizes[0] >= min_bytes:
+            flagged[name] = (sizes[0], last)
+    return flagged
+
+# Process-wide memory, resampled at most every PROCESS_SAMPLE_SECONDS. A rerun that
+# finds another thread sampling gets the previous sample instead of waiting.
+def process_memory(force=False):
+    if _process_lock.acquire(blocking=not _process_history):
+        try:
+            if force or not _process_history or time.time() - _process_history[-1]["time"] >= PROCESS_SAMPLE_SECONDS:
+                sites = allocation_sites()
+                _process_history.append({
+                    "time": time.time(),
+                    "peak_rss": peak_rss(),
+                    "traced": tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None,
+                    "tables": lookup_tables(),
+                    "function_caches": function_caches(),
+                    "shared_cache": SHARED_CACHE.stats(),
+                    "sites": sites,
+                    "files": allocation_files(sites),
+                })
+        finally:
+            _process_lock.release()
+    return _process_history[-1]
+
+# Tables and allocation sites that grew across the last process samples
+def process_growth():
+    history = list(_process_history)
+    return {
+        **growing([sample["tables"] for sample in history], PROCESS_GROWTH_MIN_BYTES),
+        **growing([sample["sites"] for sample in history], PROCESS_GROWTH_MIN_BYTES),
+    }
+
+# Record this rerun's session sizes in the session's history and sample the process.
+# Returns the session sizes and the session keys that keep growing.
+def record_rerun(state):
+    sizes = session_memory(state)
+    history = state[HISTORY_KEY] if HISTORY_KEY in state else []
+    history = (history + [sizes])[-GROWTH_RERUNS - 1:]
+    state[HISTORY_KEY] = history
+    process_memory()
+    return sizes, growing(history, SESSION_GROWTH_MIN_BYTES)
+
+# Everything the memory panel shows, for this session and the process
+def memory_report(state):
+    sizes, session_flags = record_rerun(state)
+    return {
+        "session": sizes,
+        "session_bytes": sum(sizes.values()),
+        "session_growth": session_flags,
+        "process": process_memory(),
+        "process_growth": process_growth(),
+    }
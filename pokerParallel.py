@@ -0,0 +1,145 @@
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+# Process pool and shared-memory buffers for parallel jobs.
+# Large inputs and outputs (board lists, strength tables, result accumulators) live
+# in shared memory segments that workers map as NumPy arrays and read or write in
+# place, so only a small spec is pickled per task. The parent owns every segment and
+# unlinks it when the job finishes, fails or is interrupted (e.g. a Streamlit rerun or
+# a closed session stopping the script), when the owner is garbage collected, or at exit.
+PARALLEL_WORKERS = os.cpu_count()
+
+# Jobs a page waits on (e.g. the flop strength matrix) run on the interactive pool; jobs
+# whose results are polled as they arrive (e.g. the preflop grid) run on the background
+# pool, at a lower OS priority, so its queue never holds up a page.
+INTERACTIVE_POOL = "interactive"
+BACKGROUND_POOL = "background"
+POOL_WORKERS = {INTERACTIVE_POOL: PARALLEL_WORKERS, BACKGROUND_POOL: max(PARALLEL_WORKERS - 1, 1)}
+POOL_NICENESS = {INTERACTIVE_POOL: 0, BACKGROUND_POOL: 10}
+
+_executors = {}
+_lock = threading.Lock()
+
+# Worker initializer: lower this process's priority where the OS supports it
+def _lower_priority(increment):
+    if increment and hasattr(os, "nice"):
+        os.nice(increment)
+
+# Worker pool by name, spawned rather than forked since the Streamlit server is multi-threaded
+def get_executor(pool=INTERACTIVE_POOL):
+    with _lock:
+        if pool not in _executors:
+            _executors[pool] = ProcessPoolExecutor(max_workers=POOL_WORKERS[pool], mp_context=get_context("spawn"),
+                                                   initializer=_lower_priority, initargs=(POOL_NICENESS[pool],))
+        return _executors[pool]
+
+# Stop a pool and cancel its queued tasks; the next get_executor starts a new one
+def shutdown_executor(pool=INTERACTIVE_POOL, wait=True):
+    with _lock:
+        executor = _executors.pop(pool, None)
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+# Close and unlink segments. A segment still viewed by an array can't be closed yet,
+# but once unlinked its memory is freed as soon as the last view goes away.
+def release_segments(segments):
+    while segments:
+        segment = segments.pop()
+        try:
+            segment.close()
+        except BufferError:
+            pass
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+# Named NumPy arrays in shared memory, owned by the process that creates them
+class SharedArrays:
+    def __init__(self):
+        self.segments = []
+        self.arrays = {}
+        self.layout = {}  # name -> (segment name, shape, dtype)
+        self._finalizer = weakref.finalize(self, release_segments, self.segments)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    # New zero-filled array
+    def create(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        shape = tuple(int(n) for n in shape)
+        segment = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self.segments.append(segment)
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        self.layout[name] = (segment.name, shape, dtype.str)
+        return self.arrays[name]
+
+    # Copy of an existing array
+    def share(self, name, values):
+        values = np.asarray(values)
+        array = self.create(name, values.shape, values.dtype)
+        array[...] = values
+        return array
+
+    # Picklable description of the arrays, for attached_arrays in a worker
+    def spec(self):
+        return dict(self.layout)
+
+    def nbytes(self):
+        return sum(segment.size for segment in self.segments)
+
+    # Free every segment; arrays taken from this object must not be used afterwards
+    def release(self):
+        self.arrays.clear()
+        self._finalizer()
+
+# The arrays of a spec mapped into this process without copying, for the duration of a task.
+# Segments are closed afterwards, so views must not outlive the block.
+@contextmanager
+def attached_arrays(spec):
+    segments = []
+    arrays = {}
+    try:
+        for name, (segment_name, shape, dtype) in spec.items():
+            segments.append(shared_memory.SharedMemory(name=segment_name))
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=segments[-1].buf)
+        yield arrays
+    finally:
+        arrays.clear()
+        for segment in segments:
+            try:
+                segment.close()
+            except BufferError:
+                pass
+
+# Run fn(spec, *task) for every task on the executor and wait for all of them, calling
+# progress(result) as each finishes. If one fails or the caller is interrupted, tasks
+# that haven't started are cancelled.
+def run_tasks(executor, fn, spec, tasks, progress=None):
+    futures = [executor.submit(fn, spec, *task) for task in tasks]
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            if progress:
+                progress(result)
+    finally:
+        for future in futures:
+            future.cancel()
+
+# [start, stop) row ranges splitting rows into about `parts` tasks, each a multiple of `step` rows
+def row_blocks(rows, parts, step=1):
+    size = max(-(-rows // (parts * step)) * step, step)
+    return [(start, min(start + size, rows)) for start in range(0, rows, size)]
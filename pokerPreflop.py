@@ -0,0 +1,54 @@
+import threading
+from functools import partial
+
+from pokerCache import SHARED_CACHE
+from pokerEquity import starting_hand_equity
+from pokerParallel import BACKGROUND_POOL, get_executor
+from pokerSimulator import starting_hand_cards, starting_hands
+
+# Preflop equity of every starting hand against 1-9 random opponents.
+# Cells live in the shared cache once known. Missing cells are computed in the
+# background process pool, and callers poll for whatever is done so far.
+_pending = set()
+_lock = threading.Lock()
+
+def preflop_key(index, num_opponents, game):
+    return ("preflop_equity", game, index, num_opponents)
+
+# Done-callback of a cell's future: cache the result, or just forget the cell if it was
+# cancelled (e.g. the pool shutting down) or failed, so the next rerun queues it again
+def _store(key, future):
+    try:
+        if not future.cancelled() and future.exception() is None:
+            SHARED_CACHE.put(key, future.result())
+    finally:
+        with _lock:
+            _pending.discard(key)
+
+# Known equities {grid index: equity} and how many cells are still computing.
+# Missing cells are queued, `first` (e.g. the player's own hand) ahead of the rest.
+def preflop_equity_grid(num_opponents, game="holdem", first=None):
+    indexes = starting_hands(game)
+    if first in indexes:
+        indexes.remove(first)
+        indexes.insert(0, first)
+
+    equity = {}
+    missing = []
+    for index in indexes:
+        key = preflop_key(index, num_opponents, game)
+        value = SHARED_CACHE.peek(key)
+        if value is not None:
+            equity[index] = value
+        else:
+            missing.append((index, key))
+
+    with _lock:
+        to_submit = [(index, key) for index, key in missing if key not in _pending]
+        _pending.update(key for _, key in to_submit)
+    if to_submit:
+        executor = get_executor(BACKGROUND_POOL)
+        for index, key in to_submit:
+            future = executor.submit(starting_hand_equity, starting_hand_cards(index), num_opponents, game=game, seed=index)
+            future.add_done_callback(partial(_store, key))
+    return equity, len(missing)
@@ -0,0 +1,216 @@
+import streamlit as st
+from functools import lru_cache
+from streamlit.errors import StreamlitAPIException
+
+from pokerEvaluator import RANKS, SUITS
+
+# Card HTML shared by both tools. Every card is pre-rendered once per size preset,
+# so reruns assemble pages from cached fragments instead of rebuilding strings.
+SUIT_SYMBOLS = {'Hearts': '♥️', 'Diamonds': '♦️', 'Clubs': '♣️', 'Spades': '♠️'}
+SUIT_COLORS = {'Hearts': 'red', 'Diamonds': 'red', 'Clubs': 'black', 'Spades': 'black'}
+
+# (width, height, font_size_rank, font_size_suit, margin_top)
+CARD_SIZES = {
+    "large": (80, 120, 20, 36, 15),
+    "row": (60, 90, 16, 28, 10),
+    "mobile": (60, 90, 16, 24, 10),
+}
+SIZE_PRESETS = {size: preset for preset, size in CARD_SIZES.items()}
+
+# Function to build the HTML for one card
+def build_card_html(rank, suit, width, height, font_size_rank, font_size_suit, margin_top):
+    card_color = SUIT_COLORS[suit]
+    return (
+        f'<div style="width:{width}px;height:{height}px;border:1px solid black;border-radius:10px;padding:5px;text-align:center;background:white;display:inline-block;margin:5px;'
+        f'min-width:40px;max-width:100%;box-sizing:border-box;">'
+        f'<div style="font-size:{font_size_rank}px;color:{card_color};">{rank}{SUIT_SYMBOLS[suit]}</div>'
+        f'<div style="font-size:{font_size_suit}px;margin-top:{margin_top}px;color:{card_color};">{SUIT_SYMBOLS[suit]}</div>'
+        f'</div>'
+    )
+
+CARD_FRAGMENTS = {
+    (rank, suit, preset): build_card_html(rank, suit, *size)
+    for preset, size in CARD_SIZES.items()
+    for rank in RANKS
+    for suit in SUITS
+}
+
+# Sizes outside the presets are built once and remembered
+@lru_cache(maxsize=256)
+def _custom_card_html(rank, suit, size):
+    return build_card_html(rank, suit, *size)
+
+# Function to render a card with responsive design
+def render_card(rank, suit, width=80, height=120, font_size_rank=20, font_size_suit=36, margin_top=15):
+    size = (width, height, font_size_rank, font_size_suit, margin_top)
+    preset = SIZE_PRESETS.get(size)
+    if preset is None:
+        return _custom_card_html(rank, suit, size)
+    return CARD_FRAGMENTS[(rank, suit, preset)]
+
+def card_fragment(card, preset="large"):
+    return CARD_FRAGMENTS[(card[0], card[1], preset)]
+
+# Function to display a card placeholder with "+" for adding a card
+@lru_cache(maxsize=16)
+def render_card_placeholder(width=80, height=120, font_size=36):
+    return (
+        f'<div style="width:{width}px;height:{height}px;border:1px dashed #ccc;border-radius:10px;padding:5px;text-align:center;background:#f8f8f8;display:inline-block;margin:5px;'
+        f'min-width:40px;max-width:100%;box-sizing:border-box;cursor:pointer;">'
+        f'<div style="font-size:{font_size}px;color:#aaa;line-height:{height}px;">+</div>'
+        f'</div>'
+    )
+
+# Function to render multiple cards in a row
+def render_card_row(cards, preset="row"):
+    fragments = "".join(CARD_FRAGMENTS[(card[0], card[1], preset)] for card in cards if card is not None)
+    return f'<div style="display:flex;flex-wrap:wrap;gap:5px;">{fragments}</div>'
+
+# Page CSS, injected once at the top of each run instead of once per card slot
+APP_CSS = """
+<style>
+    /* Responsive containers */
+    .responsive-container {
+        display: flex;
+        flex-wrap: wrap;
+        justify-content: flex-start;
+        align-items: flex-start;
+    }
+
+    .card-container {
+        display: flex;
+        flex-wrap: wrap;
+        justify-content: center;
+    }
+
+    /* Card selection grid */
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(60px, 1fr));
+        gap: 5px;
+    }
+
+    .card-button {
+        width: 100%;
+        aspect-ratio: 2/3;
+        padding: 0;
+        display: flex;
+        flex-direction: column;
+        justify-content: center;
+        align-items: center;
+    }
+
+    /* Ensure select boxes don't overflow on mobile */
+    .stSelectbox {
+        max-width: 100%;
+        overflow: hidden;
+    }
+
+    /* Mobile-specific styles */
+    @media (max-width: 768px) {
+        .mobile-full-width {
+            width: 100% !important;
+            flex-basis: 100% !important;
+            max-width: 100% !important;
+        }
+
+        .mobile-centered {
+            text-align: center;
+        }
+
+        .mobile-smaller-text {
+            font-size: 0.9rem !important;
+        }
+
+        /* Make cards wrap appropriately on mobile */
+        .card-wrapper {
+            display: inline-block;
+            width: 45%;
+            margin: 2%;
+        }
+    }
+
+    /* Custom styling for the tabs */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 8px;
+    }
+
+    .stTabs [data-baseweb="tab"] {
+        height: 40px;
+        white-space: pre-wrap;
+        background-color: #f0f2f6;
+        border-radius: 4px;
+        padding: 8px 16px;
+    }
+
+    .stTabs [aria-selected="true"] {
+        background-color: #e3e7ed;
+        font-weight: bold;
+    }
+
+    /* Card placeholder hover effect */
+    .card-placeholder:hover {
+        background-color: #f0f0f0;
+        border-color: #999;
+    }
+
+    /* Edit / remove buttons under a card */
+    .button-row {
+        display: flex;
+        gap: 8px;
+        margin-top: 5px;
+    }
+    .edit-btn, .remove-btn {
+        flex: 1;
+        text-align: center;
+        padding: 3px 0;
+        border-radius: 4px;
+        font-size: 0.8em;
+        cursor: pointer;
+        transition: background-color 0.3s;
+    }
+    .edit-btn {
+        background-color: #f0f2f6;
+        border: 1px solid #ddd;
+        color: #262730;
+    }
+    .remove-btn {
+        background-color: #ff4b4b;
+        border: 1px solid #ff4b4b;
+        color: white;
+    }
+    .edit-btn:hover {
+        background-color: #e6e9ef;
+    }
+    .remove-btn:hover {
+        background-color: #ff3333;
+    }
+
+    /* Placeholder "+" card */
+    .add-card-btn {
+        background-color: #f0f2f6;
+        border: 1px dashed #ddd;
+        border-radius: 8px;
+        color: #262730;
+        padding: 20px 0;
+        text-align: center;
+        cursor: pointer;
+        margin-top: 10px;
+        transition: background-color 0.3s;
+    }
+    .add-card-btn:hover {
+        background-color: #e6e9ef;
+    }
+</style>
+"""
+
+def inject_css():
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+
+# Rerun only the calling fragment. Outside a fragment rerun (e.g. a full-app run)
+# Streamlit refuses fragment scope, so fall back to rerunning the whole app.
+def rerun_fragment():
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -0,0 +1,184 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pokerEvaluator import CATEGORY_SHIFT, HAND_CATEGORIES, VARIANTS, GAME_VARIANTS, evaluate_batch, variant_deck
+
+# Random deal simulator for starting-hand statistics.
+# Full N-player games are dealt from shuffled decks in NumPy batches and evaluated
+# with the batched evaluator. Work is split into tasks with their own seeds, so
+# runs can use several processes and resume from a checkpoint with the same results.
+SIM_BATCH_GAMES = 20000
+SIM_TASK_BATCHES = 10
+SIM_CHECKPOINT_EVERY = 10  # tasks between checkpoint writes
+SIM_GAMES = ("holdem", "shortdeck")
+
+# The 169 starting hands on a 13x13 grid: pairs on the diagonal,
+# suited hands at (high, low) and offsuit hands at (low, high)
+STARTING_HANDS = 169
+STARTING_HAND_RANKS = "23456789TJQKA"
+
+# Grid index of each hole-card pair; first and second are int card arrays of the same shape
+def starting_hand_index(first, second):
+    first_rank, second_rank = first >> 2, second >> 2
+    high, low = np.maximum(first_rank, second_rank), np.minimum(first_rank, second_rank)
+    suited = (first & 3) == (second & 3)
+    return np.where(suited, high * 13 + low, low * 13 + high)
+
+# Representative hole cards of a grid index: hearts for suited hands, hearts and diamonds otherwise
+def starting_hand_cards(index):
+    row, col = divmod(index, 13)
+    if row > col:
+        return [row * 4, col * 4]
+    return [max(row, col) * 4, min(row, col) * 4 + 1]
+
+# Grid indexes of the starting hands a game can deal, e.g. 81 of them in short deck
+def starting_hands(game="holdem"):
+    ranks = {c >> 2 for c in variant_deck(GAME_VARIANTS[game])}
+    return [i for i in range(STARTING_HANDS) if i // 13 in ranks and i % 13 in ranks]
+
+# Short name of a grid index, e.g. "AKs", "T9o" or "77"
+def starting_hand_label(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return STARTING_HAND_RANKS[row] * 2
+    if row > col:
+        return f"{STARTING_HAND_RANKS[row]}{STARTING_HAND_RANKS[col]}s"
+    return f"{STARTING_HAND_RANKS[col]}{STARTING_HAND_RANKS[row]}o"
+
+# Empty statistics for one table size
+def empty_stats():
+    return {
+        "dealt": np.zeros(STARTING_HANDS, dtype=np.int64),
+        "wins": np.zeros(STARTING_HANDS, dtype=np.int64),
+        "ties": np.zeros(STARTING_HANDS, dtype=np.int64),
+        "categories": np.zeros(len(HAND_CATEGORIES), dtype=np.int64),
+        "winning_categories": np.zeros(len(HAND_CATEGORIES), dtype=np.int64),
+    }
+
+def add_stats(total, stats):
+    for name in total:
+        total[name] += stats[name]
+
+# Deal and evaluate games * num_players hands; returns the counts they add
+def simulate_batch(rng, num_players, games, game="holdem"):
+    variant = GAME_VARIANTS[game]
+    decks = np.tile(np.array(variant_deck(variant), dtype=np.int8), (games, 1))
+    dealt = rng.permuted(decks, axis=1)[:, :2 * num_players + 5].astype(np.int64)
+    holes = dealt[:, :2 * num_players].reshape(games, num_players, 2)
+    board = dealt[:, 2 * num_players:]
+
+    hands = np.concatenate([holes, np.broadcast_to(board[:, None], (games, num_players, 5))], axis=2)
+    strengths = evaluate_batch(hands.reshape(-1, 7), variant).reshape(games, num_players)
+    at_best = strengths == strengths.max(axis=1, keepdims=True)
+    sole = at_best & (at_best.sum(axis=1, keepdims=True) == 1)
+
+    hand_index = starting_hand_index(holes[:, :, 0], holes[:, :, 1]).ravel()
+    categories = np.array(VARIANTS[variant]["category_order"])[strengths >> CATEGORY_SHIFT]
+    return {
+        "dealt": np.bincount(hand_index, minlength=STARTING_HANDS),
+        "wins": np.bincount(hand_index, weights=sole.ravel(), minlength=STARTING_HANDS).astype(np.int64),
+        "ties": np.bincount(hand_index, weights=(at_best & ~sole).ravel(), minlength=STARTING_HANDS).astype(np.int64),
+        "categories": np.bincount(categories.ravel(), minlength=len(HAND_CATEGORIES)),
+        "winning_categories": np.bincount(categories[at_best], minlength=len(HAND_CATEGORIES)),
+    }
+
+# One unit of work: SIM_TASK_BATCHES batches from the task's own seed
+def simulate_task(seed, task, num_players, batch_games=SIM_BATCH_GAMES, game="holdem"):
+    rng = np.random.default_rng([seed, task])
+    stats = empty_stats()
+    for _ in range(SIM_TASK_BATCHES):
+        add_stats(stats, simulate_batch(rng, num_players, batch_games, game))
+    return stats
+
+# Write the run so far; the temp file is swapped in so a crash never leaves half a checkpoint
+def save_checkpoint(path, run, stats):
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, **run, **stats)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path, run):
+    with np.load(path) as data:
+        for name in ("seed", "num_players", "batch_games", "game"):
+            if data[name] != run[name]:
+                raise ValueError(f"Checkpoint {path} was made with {name}={data[name]}, not {run[name]}")
+        return int(data["tasks_done"]), {name: data[name].copy() for name in empty_stats()}
+
+# Simulate `games` games (rounded up to whole tasks), resuming from and saving to checkpoint.
+# progress(stats, tasks_done, total_tasks, games_per_second) is called as tasks finish.
+def simulate(num_players, games, workers=None, seed=0, checkpoint=None, game="holdem",
+             batch_games=SIM_BATCH_GAMES, progress=None):
+    if game not in SIM_GAMES:
+        raise ValueError(f"Simulation supports {', '.join(SIM_GAMES)}, not {game}")
+    if 2 * num_players + 5 > len(variant_deck(GAME_VARIANTS[game])):
+        raise ValueError(f"Not enough cards for {num_players} players")
+    games_per_task = batch_games * SIM_TASK_BATCHES
+    total_tasks = -(-games // games_per_task)
+    run = {"seed": seed, "num_players": num_players, "batch_games": batch_games, "game": game}
+
+    tasks_done, stats = 0, empty_stats()
+    if checkpoint and os.path.exists(checkpoint):
+        tasks_done, stats = load_checkpoint(checkpoint, run)
+
+    started = time.perf_counter()
+    first_task = tasks_done
+    tasks = range(tasks_done, total_tasks)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        if pool:
+            results = pool.map(simulate_task, [seed] * len(tasks), tasks, [num_players] * len(tasks),
+                               [batch_games] * len(tasks), [game] * len(tasks))
+        else:
+            results = (simulate_task(seed, task, num_players, batch_games, game) for task in tasks)
+        for task_stats in results:
+            add_stats(stats, task_stats)
+            tasks_done += 1
+            if checkpoint and (tasks_done % SIM_CHECKPOINT_EVERY == 0 or tasks_done == total_tasks):
+                save_checkpoint(checkpoint, {**run, "tasks_done": tasks_done}, stats)
+            if progress:
+                rate = (tasks_done - first_task) * games_per_task / (time.perf_counter() - started)
+                progress(stats, tasks_done, total_tasks, rate)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return stats
+
+# Starting hands as (label, dealt, win rate, tie rate), best win rate first
+def starting_hand_table(stats):
+    dealt = np.maximum(stats["dealt"], 1)
+    rows = [(starting_hand_label(i), int(stats["dealt"][i]), stats["wins"][i] / dealt[i], stats["ties"][i] / dealt[i])
+            for i in range(STARTING_HANDS) if stats["dealt"][i]]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Deal random games and collect starting-hand win rates.")
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--game", choices=SIM_GAMES, default="holdem")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", help="npz file to resume from and save progress to")
+    args = parser.parse_args()
+
+    def report(stats, tasks_done, total_tasks, games_per_second):
+        print(f"task {tasks_done}/{total_tasks}: {stats['dealt'].sum() // args.players:,} games, "
+              f"{games_per_second:,.0f} games/s ({games_per_second * args.players:,.0f} hands/s)")
+
+    stats = simulate(args.players, args.games, args.workers, args.seed, args.checkpoint, args.game, progress=report)
+
+    print(f"\nStarting hands at a {args.players}-player table (win / tie):")
+    table = starting_hand_table(stats)
+    for label, dealt, win_rate, tie_rate in table[:10] + table[-5:]:
+        print(f"  {label:>4}  {win_rate*100:5.1f}% / {tie_rate*100:4.1f}%  ({dealt:,} dealt)")
+
+    print("\nFinal hand categories (all hands / winning hands):")
+    total, winning = stats["categories"].sum(), stats["winning_categories"].sum()
+    for category in sorted(HAND_CATEGORIES, reverse=True):
+        print(f"  {HAND_CATEGORIES[category]:<16} {stats['categories'][category] / total * 100:6.2f}% / "
+              f"{stats['winning_categories'][category] / winning * 100:6.2f}%")
+
+if __name__ == "__main__":
+    main()
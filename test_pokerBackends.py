@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from pokerBackends import EVALUATOR_BACKENDS, reference_batch, random_hands, best_five
+from pokerEvaluator import VARIANTS
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_backends_agree_with_reference(variant, size):
+    hands = random_hands(np.random.default_rng(size), 400, size, variant)
+    expected = reference_batch(hands, variant)
+    for name, evaluate in EVALUATOR_BACKENDS.items():
+        assert evaluate(hands, variant).tolist() == expected.tolist(), name
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+def test_best_five_picks_five_of_the_hand(variant):
+    for hand in random_hands(np.random.default_rng(1), 200, 7, variant).tolist():
+        strength, five = best_five(hand, variant)
+        assert strength == reference_batch(np.array([hand]), variant)[0]
+        assert len(set(five)) == 5 and set(five) <= set(hand)
+        assert reference_batch(np.array([five]), variant)[0] == strength
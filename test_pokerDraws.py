@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pokerDraws import (
+    FLUSH_DRAW,
+    OPEN_ENDED_STRAIGHT_DRAW,
+    GUTSHOT_STRAIGHT_DRAW,
+    BACKDOOR_FLUSH_DRAW,
+    TWO_OVERCARDS,
+    ONE_OVERCARD,
+    COMBO_DRAW,
+    classify_draws,
+    classify_draws_batch,
+)
+from pokerEvaluator import VARIANTS, variant_deck
+
+@pytest.mark.parametrize("variant", list(VARIANTS))
+@pytest.mark.parametrize("board_size", [3, 4])
+def test_batch_matches_single_hands(variant, board_size):
+    rng = np.random.default_rng(board_size)
+    decks = np.tile(np.array(variant_deck(variant), dtype=np.int64), (3000, 1))
+    dealt = rng.permuted(decks, axis=1)[:, :2 + board_size]
+    holes, boards = dealt[:, :2], dealt[:, 2:]
+    expected = [classify_draws(hole, board, variant) for hole, board in zip(holes.tolist(), boards.tolist())]
+    assert classify_draws_batch(holes, boards, variant).tolist() == expected
+
+def test_known_draws(cards):
+    assert classify_draws(cards("8c 9d"), cards("6h 7s Kc")) & OPEN_ENDED_STRAIGHT_DRAW
+    assert classify_draws(cards("8c 9d"), cards("5h 7s Kc")) & GUTSHOT_STRAIGHT_DRAW
+    assert classify_draws(cards("Ah Kh"), cards("2h 7h Qc")) & (FLUSH_DRAW | TWO_OVERCARDS) == FLUSH_DRAW | TWO_OVERCARDS
+    assert classify_draws(cards("9h 8h"), cards("Th 7c 2h 3s")) & COMBO_DRAW
+    assert classify_draws(cards("Ah 5d"), cards("Kh 9h 2c")) & BACKDOOR_FLUSH_DRAW
+    # Overcards on a paired board, but not with a pocket pair or a hole card pairing the board
+    assert classify_draws(cards("Ac Kd"), cards("7h 7s 2c")) & TWO_OVERCARDS
+    assert classify_draws(cards("Ac 2d"), cards("7h 7s 2c")) & (TWO_OVERCARDS | ONE_OVERCARD) == 0
+    assert classify_draws(cards("Ac Ad"), cards("7h 7s 2c")) & (TWO_OVERCARDS | ONE_OVERCARD) == 0
+    # No draws before the flop or on the river
+    assert classify_draws(cards("8c 9d"), cards("6h 7s Kc 2d 2s")) == 0
+
+def test_short_deck_wheel_draw(cards):
+    # A-6-7-8-9 is a straight in short deck, so A-7 on 8-9-K only needs a 6 there
+    hole, board = cards("Ac 7d"), cards("8h 9s Kc")
+    assert classify_draws(hole, board, "shortdeck") & GUTSHOT_STRAIGHT_DRAW
+    assert not classify_draws(hole, board, "standard") & (GUTSHOT_STRAIGHT_DRAW | OPEN_ENDED_STRAIGHT_DRAW)
@@ -0,0 +1,100 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import pokerEquity
+from pokerBackends import reference_five
+from pokerEquity import exact_equity, build_pots, pot_payouts, all_in_ev, hand_strength_potential
+from pokerEvaluator import GAME_VARIANTS, variant_deck
+from pokerParallel import BACKGROUND_POOL, shutdown_executor
+from pokerPreflop import preflop_equity_grid
+
+# Strength of a player's best hand on a full board, every five-card choice scored by the reference rules
+def brute_force_strength(hole, board, game):
+    variant = GAME_VARIANTS[game]
+    if game == "omaha":
+        return max(reference_five(list(two) + list(three), variant)
+                   for two in combinations(hole, 2) for three in combinations(board, 3))
+    return max(reference_five(five, variant) for five in combinations(hole + board, 5))
+
+# Equity by dealing every runout one at a time, ties split evenly
+def brute_force_equity(holes, board, dead, game):
+    used = set(board) | set(dead) | {c for hole in holes for c in hole}
+    deck = [c for c in variant_deck(GAME_VARIANTS[game]) if c not in used]
+    shares = np.zeros(len(holes))
+    runouts = 0
+    for runout in combinations(deck, 5 - len(board)):
+        strengths = [brute_force_strength(hole, board + list(runout), game) for hole in holes]
+        winners = [p for p, s in enumerate(strengths) if s == max(strengths)]
+        for p in winners:
+            shares[p] += 1 / len(winners)
+        runouts += 1
+    return shares / runouts
+
+@pytest.mark.parametrize("holes, board, dead, game", [
+    (["Ah Kh", "7c 7d"], "Qh 7h 2s", "", "holdem"),
+    (["Ah Kh", "7c 7d", "Js Ts"], "Qh 9h 2s", "", "holdem"),
+    (["As 5s", "Kd Qc"], "Ks 8s 3d 4h", "", "holdem"),
+    (["Ac Kc", "Ad Kd"], "2h 7s 9c", "Qc", "holdem"),
+    (["Ah Kh", "9c 9d"], "Qh 7h 6s", "", "shortdeck"),
+    (["Ah Kh Qd Jd", "9c 9d 8s 7s"], "Th 8h 2c 3d", "", "omaha"),
+])
+def test_exact_equity_matches_full_enumeration(cards, holes, board, dead, game):
+    holes = [cards(hole) for hole in holes]
+    expected = brute_force_equity(holes, cards(board), cards(dead), game)
+    assert exact_equity(holes, cards(board), cards(dead), game) == pytest.approx(expected)
+
+# The worked example from Billings et al., "The challenge of poker"
+def test_hand_strength_potential_worked_example(cards):
+    potential = hand_strength_potential(cards("Ad Qc"), cards("3h 4c Jh"))
+    assert potential["ahead"] + potential["tied"] + potential["behind"] == 1081
+    assert potential["hs"] == pytest.approx(0.585, abs=0.0005)
+    assert potential["ppot"] == pytest.approx(0.208, abs=0.0005)
+    assert potential["npot"] == pytest.approx(0.274, abs=0.0005)
+
+def test_hand_strength_potential_on_the_river_has_no_potential(cards):
+    potential = hand_strength_potential(cards("Ad Qc"), cards("3h 4c Jh 8s 2d"))
+    assert potential["ppot"] == potential["npot"] == 0.0
+
+# The shared-memory matrix runs on its own pool, so a full preflop grid queued on the
+# background pool doesn't hold it up
+def test_flop_matrix_does_not_wait_for_preflop_jobs(cards, monkeypatch):
+    flop = tuple(sorted(cards("Qh 7h 2s")))
+    monkeypatch.setattr(pokerEquity, "PARALLEL_WORKERS", 1)
+    expected = pokerEquity.flop_strength_matrix.__wrapped__(flop)
+    monkeypatch.setattr(pokerEquity, "PARALLEL_WORKERS", 2)  # the pool path, even on one CPU
+    try:
+        _, missing = preflop_equity_grid(9)
+        assert missing == 169
+        matrix = pokerEquity.flop_strength_matrix.__wrapped__(flop)
+        _, still_missing = preflop_equity_grid(9)
+        assert still_missing > 0
+    finally:
+        shutdown_executor(BACKGROUND_POOL)
+    assert np.array_equal(matrix, expected)
+
+def test_build_pots_side_pots_and_dead_money():
+    # Player 1 is all in for 50; a folded player put in 30
+    assert build_pots([100, 50, 100], folded=[30]) == [(180, [0, 1, 2]), (100, [0, 2])]
+    # Folded chips above every live contribution go to the last pot
+    assert build_pots([100, 100], folded=[150]) == [(350, [0, 1])]
+    assert build_pots([0, 60], folded=[20]) == [(80, [1])]
+
+def test_pot_payouts_odd_chips():
+    tied = np.array([[5], [3], [5]])
+    assert pot_payouts(tied, 101, [0, 1, 2])[:, 0].tolist() == [51, 0, 50]
+    assert pot_payouts(tied, 101, [0, 1, 2], odd_chip_order=[2, 1, 0])[:, 0].tolist() == [50, 0, 51]
+    three_way = np.array([[4], [4], [4]])
+    assert pot_payouts(three_way, 100, [0, 1, 2], odd_chip_order=[1, 2, 0])[:, 0].tolist() == [33, 34, 33]
+
+def test_pot_payouts_only_pays_eligible_players():
+    strengths = np.array([[9, 1], [5, 5], [1, 9]])
+    assert pot_payouts(strengths, 60, [1, 2]).tolist() == [[0, 0], [60, 0], [0, 60]]
+
+def test_all_in_ev_side_pot_on_the_river(cards):
+    # The short stack wins the main pot, the best of the others the side pot
+    holes = [cards("Kh Kd"), cards("Ah As"), cards("Qh Qd")]
+    pots, ev = all_in_ev(holes, cards("2c 7s 9d 3h 5c"), [100, 40, 100])
+    assert pots == [(120, [0, 1, 2]), (120, [0, 2])]
+    assert ev.sum(axis=0).tolist() == [120, 120, 0]
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from pokerBackends import EVALUATOR_BACKENDS, reference_batch, random_hands
+from pokerEvaluator import VARIANTS
+from pokerGolden import golden_hand, build_corpus, check_backend
+
+# The reference against the golden rules, written out separately over all seven cards
+@pytest.mark.parametrize("variant", list(VARIANTS))
+def test_reference_agrees_with_golden_rules(variant):
+    hands = random_hands(np.random.default_rng(0), 2000, 7, variant)
+    expected = [golden_hand(hand, variant)[0] for hand in hands.tolist()]
+    assert reference_batch(hands, variant).tolist() == expected
+
+def test_golden_best_five_is_five_of_the_hand():
+    for hand in random_hands(np.random.default_rng(1), 500, 7).tolist():
+        strength, five = golden_hand(hand)
+        assert len(set(five)) == 5 and set(five) <= set(hand)
+        assert golden_hand(five)[0] == strength
+
+def test_every_backend_passes_a_small_corpus():
+    corpus = build_corpus(200, seed=1, workers=1)
+    for name in EVALUATOR_BACKENDS:
+        mismatches = check_backend(name, corpus)["mismatches"]
+        assert {check: len(bad) for check, bad in mismatches.items()} == {"strengths": 0, "best_five": 0, "subsets": 0, "winners": 0}, name
@@ -0,0 +1,92 @@
+from pokerHandHistory import (
+    GAME_CODES,
+    UNSUPPORTED_GAME,
+    UNCHECKED,
+    WINNERS_MATCH,
+    empty_hands,
+    parse_cards,
+    parse_hand,
+    parse_file,
+    verify_winners,
+)
+
+SIDE_POT_HAND = """PokerStars Hand #210987654321:  Hold'em No Limit ($0.01/$0.02 USD) - 2020/01/01 12:00:00 ET
+Table 'Alpha' 6-max Seat #1 is the button
+Seat 1: alice ($2.00 in chips)
+Seat 2: bob smith ($0.40 in chips)
+Seat 3: carol ($2.00 in chips)
+bob smith: posts small blind $0.01
+carol: posts big blind $0.02
+*** HOLE CARDS ***
+Dealt to alice [Kh Kd]
+alice: raises $0.98 to $1.00
+bob smith: calls $0.39 and is all-in
+carol: calls $0.98
+*** FLOP *** [2c 7s 9d]
+*** TURN *** [2c 7s 9d] [3h]
+*** RIVER *** [2c 7s 9d 3h] [5c]
+*** SHOW DOWN ***
+alice: shows [Kh Kd] (a pair of Kings)
+carol: shows [Qh Qd] (a pair of Queens)
+alice collected $1.20 from side pot
+bob smith: shows [Ah As] (a pair of Aces)
+bob smith collected $1.20 from main pot
+*** SUMMARY ***
+Total pot $2.40 Main pot $1.20. Side pot $1.20. | Rake $0
+Board [2c 7s 9d 3h 5c]
+Seat 1: alice (button) showed [Kh Kd] and won ($1.20) with a pair of Kings
+Seat 2: bob smith (small blind) showed [Ah As] and won ($1.20) with a pair of Aces
+Seat 3: carol (big blind) showed [Qh Qd] and lost with a pair of Queens
+"""
+
+FOLDED_HAND = """PokerStars Hand #210987654322:  Omaha Pot Limit ($0.01/$0.02 USD) - 2020/01/01 12:01:00 ET
+Table 'Alpha' 6-max Seat #2 is the button
+Seat 1: alice ($2.00 in chips)
+Seat 2: bob smith ($0.40 in chips)
+*** HOLE CARDS ***
+Dealt to alice [Ah Ad Kc Qs]
+alice: raises $0.05 to $0.07
+bob smith: folds
+alice collected $0.04 from pot
+*** SUMMARY ***
+Total pot $0.04 | Rake $0
+Seat 1: alice collected ($0.04)
+"""
+
+def test_parse_cards():
+    assert parse_cards("2h Td As") == [0, 8 * 4 + 1, 12 * 4 + 3]
+
+def test_parse_hand_showdown_with_side_pot():
+    hands = empty_hands(1)
+    parse_hand(SIDE_POT_HAND, hands, 0)
+    assert hands["hand_id"][0] == 210987654321
+    assert hands["game"][0] == GAME_CODES["holdem"]
+    assert hands["board"][0].tolist() == parse_cards("2c 7s 9d 3h 5c")
+    assert hands["holes"][0, 0, :2].tolist() == parse_cards("Kh Kd")
+    assert hands["holes"][0, 1, :2].tolist() == parse_cards("Ah As")
+    assert hands["holes"][0, 2, :2].tolist() == parse_cards("Qh Qd")
+    assert hands["shown"][0, :3].tolist() == [True, True, True]
+    # Only the main pot's winner counts
+    assert hands["winners"][0, :3].tolist() == [False, True, False]
+
+    verify_winners(hands)
+    assert hands["status"][0] == WINNERS_MATCH
+    assert hands["strength"][0, 1] > hands["strength"][0, 0] > hands["strength"][0, 2]
+
+def test_parse_hand_without_showdown():
+    hands = empty_hands(1)
+    parse_hand(FOLDED_HAND, hands, 0)
+    assert hands["game"][0] == UNSUPPORTED_GAME  # no board to check
+    assert hands["holes"][0, 0].tolist() == parse_cards("Ah Ad Kc Qs")
+    assert not hands["shown"][0].any()
+    assert hands["winners"][0, :2].tolist() == [True, False]
+
+def test_parse_file_in_several_ranges(tmp_path):
+    path = tmp_path / "hands.txt"
+    path.write_text((SIDE_POT_HAND + "\n\n") * 3 + FOLDED_HAND)
+    whole = parse_file(str(path), workers=1)
+    split = parse_file(str(path), workers=1, chunk_bytes=500)
+    assert whole["hand_id"].tolist() == [210987654321] * 3 + [210987654322]
+    assert whole["status"].tolist() == [WINNERS_MATCH] * 3 + [UNCHECKED]
+    for column in whole:
+        assert split[column].tolist() == whole[column].tolist(), column